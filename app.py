@@ -1,14 +1,35 @@
-from flask import Flask, session, send_from_directory, abort, render_template, redirect, url_for
+from flask import Flask, session, abort, render_template, redirect, url_for, jsonify, request
 from flask_cors import CORS
 from datetime import timedelta
-from blueprints import auth_bp, user_bp, admin_bp
-from config import SECRET_KEY, PROFILE_PIC_FOLDER,LOGO_FOLDER
+from blueprints import auth_bp, user_bp, admin_bp, tasks_bp
+from config import SECRET_KEY, sql_profiler
+from commands import register_commands
+from db_pool import PoolTimeout
+from credentials import HashingBusy
+from ratelimit import RateLimited
+from tasks import start_workers
+from images import original_name
+from file_serving import send_stored
+from storage import storage
+from sessions import create_session_interface
+import os
+
+def send_image(kind, filename):
+    """Serve an upload; a thumbnail that is not generated yet falls back to its original."""
+    filename = os.path.basename(filename)
+    if not storage.exists(f"{kind}/{filename}"):
+        original = original_name(filename)
+        if original:
+            # the real variant will appear under this URL, so don't let it stick
+            return send_stored(f"{kind}/{original}", versioned=False)
+    return send_stored(f"{kind}/{filename}")
 
 def create_app():
     app = Flask(__name__, template_folder="templates", static_folder="static")
 
     # ---------------- Session & Security ----------------
     app.secret_key = SECRET_KEY
+    app.session_interface = create_session_interface()
     app.config["SESSION_COOKIE_HTTPONLY"] = True
     app.config["SESSION_COOKIE_SECURE"] = False   # set True in production with HTTPS
     app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
@@ -22,6 +43,41 @@ def create_app():
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
     app.register_blueprint(admin_bp)
+    app.register_blueprint(tasks_bp)
+
+    # ---------------- SQL Profiling ----------------
+    if sql_profiler.enabled:
+        @app.before_request
+        def begin_sql_profile():
+            rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+            sql_profiler.begin(f"{request.method} {rule}")
+
+        @app.after_request
+        def sql_server_timing(response):
+            profile = sql_profiler.current()
+            if profile is not None:
+                profile.status = response.status_code
+                response.headers.add(
+                    "Server-Timing",
+                    f'db;dur={profile.query_time * 1000:.1f};desc="{len(profile.queries)} queries"',
+                )
+                response.headers.add("Server-Timing", f"db-checkout;dur={profile.checkout_time * 1000:.1f}")
+            return response
+
+        @app.teardown_request
+        def end_sql_profile(exc):
+            sql_profiler.end(500 if exc else None)
+
+    # ---------------- CLI Commands ----------------
+    register_commands(app)
+
+    # ---------------- Background Tasks ----------------
+    # Task workers run in serving processes only, started by the first
+    # request after the fork. CLI commands, seeders and imports of the app
+    # must not claim queued tasks they would abandon on exit.
+    @app.before_request
+    def ensure_task_workers():
+        start_workers()
 
     # ---------------- Public Routes ----------------
     @app.route("/")
@@ -70,19 +126,33 @@ def create_app():
     def uploaded_file(filename):
         if "user" not in session :
             abort(403)
-        return send_from_directory(PROFILE_PIC_FOLDER, filename)
+        return send_image("profile_pics", filename)
     
     @app.route("/uploads/logos/<filename>")
     def uploaded_logo(filename):
         if "user" not in session:
             abort(403)
-        return send_from_directory(LOGO_FOLDER, filename)
+        return send_image("logos", filename)
     
     # ---------------- Error Handlers ----------------
     @app.errorhandler(404)
     def not_found(e):
         return render_template("auth/login.html"), 404
 
+    @app.errorhandler(PoolTimeout)
+    @app.errorhandler(HashingBusy)
+    def pool_exhausted(e):
+        # shed load instead of queueing forever behind a saturated pool
+        response = jsonify({"success": False, "message": "Server busy, please retry"})
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
+    @app.errorhandler(RateLimited)
+    def rate_limited(e):
+        response = jsonify({"success": False, "message": e.message})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
+
     return app
 
 
@@ -0,0 +1,325 @@
+"""
+ASGI serving mode.
+
+    uvicorn asgi:app --workers 4 --port 8001
+
+The hot read paths are served natively on the event loop: the job list and
+job detail (aiomysql), the session probe, and upload / resume downloads
+(streamed in chunks off the loop). Every other route of auth_bp, user_bp
+and admin_bp, plus keyword searches, is answered by the unchanged Flask app,
+which asgiref runs on a thread pool. Responses are the same either way.
+
+Scope: only those reads are async. Every write still uses mysql-connector
+and blocking file I/O on that thread pool: login and register, applying
+with a resume upload, profile picture and logo uploads, job CRUD and bulk
+posting, applicant listings, exports and keyword search. This mode raises
+read concurrency; it does not make uploads or writes any cheaper.
+
+Requires the packages in requirements-asgi.txt. Sessions must be readable
+by every worker: use SESSION_BACKEND=shared with Redis (or "cookie") when
+running more than one. Uploads are streamed natively from local storage
+only; with STORAGE_BACKEND=s3 the file routes are answered by Flask.
+"""
+import os
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiomysql
+import anyio
+from asgiref.wsgi import WsgiToAsgi
+from starlette.applications import Starlette
+from starlette.responses import Response, FileResponse
+from starlette.routing import Route, Mount
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+from app import create_app
+from cache import cache, MISSING, job_key, job_list_key
+from config import (
+    CACHE_BACKEND,
+    SESSION_BACKEND,
+    DB_CONFIG,
+    DB_POOL_SIZE,
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+)
+from db_pool import PoolTimeout
+from facets import parse_filters, filters_key, filter_clause
+from employers import PROFILES_SQL, cached_profiles, remember_profiles, apply_profiles
+from file_serving import cache_headers, is_not_modified, is_versioned, sendfile_headers
+from images import original_name
+from pagination import page_args, keyset_clause, next_cursor
+from resume_upload import resume_key
+from storage import storage
+from tasks import start_workers
+
+flask_app = create_app()
+wsgi = WsgiToAsgi(flask_app)
+
+_pool = None
+
+
+# -------------------- DATABASE --------------------
+@asynccontextmanager
+async def db_cursor(dictionary=False):
+    """Async counterpart of config.db_cursor for read-only queries"""
+    try:
+        conn = await asyncio.wait_for(_pool.acquire(), DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PoolTimeout(f"no connection available within {DB_POOL_TIMEOUT}s")
+    try:
+        async with conn.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor) as cursor:
+            yield cursor
+    finally:
+        _pool.release(conn)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global _pool
+    _pool = await aiomysql.create_pool(
+        host=DB_CONFIG["host"],
+        user=DB_CONFIG["user"],
+        password=DB_CONFIG["password"],
+        db=DB_CONFIG["database"],
+        minsize=DB_POOL_SIZE,
+        maxsize=DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        autocommit=True,  # reads only; never pin a stale REPEATABLE READ snapshot
+    )
+    start_workers()
+    try:
+        yield
+    finally:
+        _pool.close()
+        await _pool.wait_closed()
+
+
+# -------------------- HELPERS --------------------
+def api_response(success, message, status_code=200, **kwargs):
+    data = {"success": success, "message": message}
+    if kwargs:
+        data.update(kwargs)
+    # Flask's provider, so dates and decimals serialize exactly as in the WSGI views
+    return Response(flask_app.json.dumps(data), status_code, media_type="application/json")
+
+
+async def blocking(io_bound, fn, *args):
+    """Run fn on the thread pool when it does network I/O (Redis), inline otherwise"""
+    if io_bound:
+        return await anyio.to_thread.run_sync(fn, *args)
+    return fn(*args)
+
+
+def _session_user(request):
+    session = flask_app.session_interface.open_session(flask_app, request)
+    return session.get("user") if session is not None else None
+
+
+async def session_user(request):
+    return await blocking(SESSION_BACKEND == "shared", _session_user, request)
+
+
+async def cache_get(key_fn, *args):
+    """cache.get(key_fn(*args)); building job keys reads the list generation from the cache too"""
+    def get():
+        key = key_fn(*args)
+        return key, cache.get(key)
+    return await blocking(CACHE_BACKEND == "shared", get)
+
+
+async def cache_set(key, value):
+    await blocking(CACHE_BACKEND == "shared", cache.set, key, value)
+
+
+class FlaskFallback:
+    """Response that lets the Flask app answer the request instead"""
+
+    async def __call__(self, scope, receive, send):
+        await wsgi(scope, receive, send)
+
+
+async def send_upload(request, folder, filename, versioned=None, as_attachment=False):
+    """Async counterpart of file_serving.send_upload"""
+    path = safe_join(folder, filename)
+    if path is None:
+        return Response(status_code=404)
+    try:
+        st = await anyio.to_thread.run_sync(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        return Response(status_code=404)
+    if versioned is None:
+        versioned = is_versioned(os.path.basename(path))
+
+    headers = cache_headers(st, versioned)
+    if is_not_modified(request.headers, st):
+        return Response(status_code=304, headers=headers)
+    handoff = sendfile_headers(path, as_attachment)
+    if handoff:
+        return Response(headers={**headers, **handoff})
+    return FileResponse(
+        path,
+        headers=headers,
+        stat_result=st,
+        filename=os.path.basename(path) if as_attachment else None,
+    )
+
+
+async def attach_employers(jobs, logo_size=128):
+    profiles, missing = cached_profiles(job["posted_by"] for job in jobs)
+    if missing:
+        async with db_cursor(dictionary=True) as cursor:
+            await cursor.execute(
+                PROFILES_SQL.format(placeholders=", ".join(["%s"] * len(missing))),
+                tuple(missing),
+            )
+            remember_profiles(await cursor.fetchall(), profiles)
+    return apply_profiles(jobs, profiles, logo_size)
+
+
+async def applied_job_ids(user_id, job_ids):
+    if not job_ids:
+        return set()
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    async with db_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT job_id FROM applications WHERE user_id=%s AND job_id IN ({placeholders})",
+            (user_id, *job_ids),
+        )
+        return {row[0] for row in await cursor.fetchall()}
+
+
+# -------------------- JOBS --------------------
+async def load_jobs(page, per_page, after=None, filters=None):
+    """Same rows as blueprints.user._load_jobs for a listing without a search"""
+    sql = """SELECT j.id, j.posted_by, j.title, j.location, j.job_type, j.created_at
+             FROM jobs j"""
+    where, params = filter_clause(filters or {})
+    conditions = [where] if where else []
+    offset = (page - 1) * per_page
+    if after:
+        clause, after_params = keyset_clause("j.created_at", "j.id", after)
+        conditions.append(clause)
+        params.extend(after_params)
+        offset = 0
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY j.created_at DESC, j.id DESC LIMIT %s OFFSET %s"
+    params.extend([per_page + 1, offset])
+    async with db_cursor(dictionary=True) as cursor:
+        await cursor.execute(sql, tuple(params))
+        return list(await cursor.fetchall())
+
+
+async def api_jobs(request):
+    user = await session_user(request)
+    if not user or user["role"] != "User":
+        return api_response(False, "Unauthorized", 403)
+    if request.query_params.get("q", "").strip():
+        return FlaskFallback()  # search backends are synchronous
+
+    page, after, error = page_args(request.query_params)
+    if error:
+        return api_response(False, error, 400)
+    filters, error = parse_filters(request.query_params)
+    if error:
+        return api_response(False, error, 400)
+    per_page = 6
+
+    key, jobs = await cache_get(job_list_key, page, per_page, "", after, filters_key(filters))
+    if jobs is MISSING:
+        jobs = await load_jobs(page, per_page, after, filters)
+        await cache_set(key, jobs)
+    await attach_employers(jobs)
+    applied = await applied_job_ids(user["id"], [job["id"] for job in jobs])
+    for job in jobs:
+        job["applied"] = job["id"] in applied
+
+    has_next = len(jobs) > per_page
+    jobs = jobs[:per_page]
+    return api_response(
+        True, "Jobs fetched", jobs=jobs, page=page, has_next=has_next,
+        next_cursor=next_cursor(jobs, has_next, "created_at"),
+    )
+
+
+async def api_job_detail(request):
+    user = await session_user(request)
+    if not user or user["role"] != "User":
+        return api_response(False, "Unauthorized", 403)
+    job_id = request.path_params["job_id"]
+
+    key, job = await cache_get(job_key, job_id)
+    if job is MISSING:
+        async with db_cursor(dictionary=True) as cursor:
+            await cursor.execute("SELECT j.* FROM jobs j WHERE j.id=%s", (job_id,))
+            job = await cursor.fetchone()
+        if job:
+            if job.get("deadline"):
+                job["deadline"] = job["deadline"].strftime("%Y-%m-%d")
+            await cache_set(key, job)
+    if not job:
+        return api_response(False, "Job not found", 404)
+    await attach_employers([job], logo_size=256)
+    job["applied"] = bool(await applied_job_ids(user["id"], [job_id]))
+    return api_response(True, "Job found", job=job)
+
+
+# -------------------- SESSION & FILES --------------------
+async def api_session(request):
+    user = await session_user(request)
+    if user:
+        return api_response(True, "Session active", user=user)
+    return api_response(False, "No active session", 401)
+
+
+async def api_download_resume(request):
+    user = await session_user(request)
+    if not user or user.get("role") != "Employer":
+        return api_response(False, "Unauthorized", 403)
+    if not storage.local:
+        return FlaskFallback()  # signed-URL redirect or proxied object stream
+    key = resume_key(secure_filename(request.path_params["filename"]))
+    if not key or not await anyio.to_thread.run_sync(storage.exists, key):
+        return api_response(False, "File not found", 404)
+    return await send_upload(request, storage.root, key, as_attachment=True)
+
+
+def image_route(kind):
+    async def send_image(request):
+        if not await session_user(request):
+            return Response(status_code=403)
+        if not storage.local:
+            return FlaskFallback()
+        folder = os.path.join(storage.root, kind)
+        filename = request.path_params["filename"]
+        if not await anyio.to_thread.run_sync(
+            os.path.isfile, os.path.join(folder, os.path.basename(filename))
+        ):
+            original = original_name(filename)
+            if original:
+                return await send_upload(request, folder, original, versioned=False)
+        return await send_upload(request, folder, filename)
+    return send_image
+
+
+async def pool_exhausted(request, exc):
+    response = api_response(False, "Server busy, please retry", 503)
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+app = Starlette(
+    routes=[
+        Route("/api/session", api_session, methods=["GET"]),
+        Route("/api/jobs", api_jobs, methods=["GET"]),
+        Route("/api/job/{job_id:int}", api_job_detail, methods=["GET"]),
+        Route("/api/admin/resumes/{filename}", api_download_resume, methods=["GET"]),
+        Route("/uploads/profile_pics/{filename}", image_route("profile_pics"), methods=["GET"]),
+        Route("/uploads/logos/{filename}", image_route("logos"), methods=["GET"]),
+        Mount("/", app=wsgi),
+    ],
+    exception_handlers={PoolTimeout: pool_exhausted},
+    lifespan=lifespan,
+)
@@ -0,0 +1,136 @@
+"""
+Concurrent applies against /api/apply/<job_id>.
+
+    python -m benchmarks.bench_apply --user-id 1 --job-id 3 -n 200 --threads 50
+
+Fires N simultaneous applications from one user for one job through the
+Flask test client (real MySQL, real resume folder). The resume bytes are
+unique to the run. Reports throughput and the status breakdown, then checks
+that exactly one apply was accepted and left one `applications` row, one
+`resume_blobs` row referenced once, applications_count raised by exactly 1
+and no resume file on disk that no row references. Unless --keep is given,
+the application and its resume are removed afterwards (and checked gone)
+and the job's applications_count is reconciled.
+
+The user must not have applied to the job yet.
+"""
+import argparse
+import io
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from commands import reconcile_application_counts
+from config import db_cursor, RESUME_FOLDER
+from resume_upload import release_resumes
+
+
+def stored_files():
+    """Resume blob paths (relative to RESUME_FOLDER) currently on disk"""
+    return {
+        os.path.relpath(os.path.join(root, name), RESUME_FOLDER).replace(os.sep, "/")
+        for root, _, names in os.walk(RESUME_FOLDER)
+        for name in names
+    }
+
+
+def applications_count(job_id):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT applications_count FROM jobs WHERE id=%s", (job_id,))
+        row = cursor.fetchone()
+    if not row:
+        raise SystemExit(f"job {job_id} does not exist")
+    return row[0]
+
+
+def blob_refs(path):
+    """(resume_blobs rows, applications referencing it) for a blob path"""
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM resume_blobs WHERE path=%s", (path,))
+        blobs = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM applications WHERE resume_path=%s", (path,))
+        return blobs, cursor.fetchone()[0]
+
+
+def apply_once(app, user_id, job_id, barrier, content):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["user"] = {"id": user_id, "role": "User"}
+    data = {"resume": (io.BytesIO(content), "resume.pdf")}
+    barrier.wait()
+    start = time.perf_counter()
+    res = client.post(f"/api/apply/{job_id}", data=data, content_type="multipart/form-data")
+    return res.status_code, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--job-id", type=int, required=True)
+    parser.add_argument("-n", type=int, default=100, help="number of applies")
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep the resulting application")
+    args = parser.parse_args()
+
+    app = create_app()
+    with db_cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM applications WHERE user_id=%s AND job_id=%s", (args.user_id, args.job_id)
+        )
+        if cursor.fetchone():
+            raise SystemExit(f"user {args.user_id} has already applied to job {args.job_id}")
+    count_before = applications_count(args.job_id)
+    content = f"%PDF-1.4 benchmark resume {uuid.uuid4()}".encode()
+    barrier = threading.Barrier(min(args.n, args.threads))
+    files_before = stored_files()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(
+            lambda _: apply_once(app, args.user_id, args.job_id, barrier, content), range(args.n)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(r[1] * 1000 for r in results)
+    statuses = Counter(r[0] for r in results)
+    with db_cursor() as cursor:
+        cursor.execute(
+            "SELECT resume_path FROM applications WHERE user_id=%s AND job_id=%s",
+            (args.user_id, args.job_id),
+        )
+        rows = [r[0] for r in cursor.fetchall()]
+    orphans = stored_files() - files_before - set(rows)
+
+    print(f"{args.n} applies in {elapsed:.2f} s ({args.n / elapsed:.1f} req/s)")
+    print(f"latency p50 {latencies[len(latencies) // 2]:.1f} ms  p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms")
+    print(f"status codes: {dict(statuses)}")
+    print(f"application rows: {len(rows)}  duplicates: {max(0, len(rows) - 1)}  orphaned resumes: {len(orphans)}")
+
+    try:
+        assert statuses[200] == 1, f"{statuses[200]} applies accepted, expected 1"
+        assert len(rows) == 1, f"{len(rows)} application rows, expected 1"
+        assert blob_refs(rows[0]) == (1, 1), f"resume_blobs rows, references: {blob_refs(rows[0])}"
+        count = applications_count(args.job_id)
+        assert count == count_before + 1, f"applications_count went {count_before} -> {count}"
+        assert not orphans, f"orphaned resume files: {sorted(orphans)}"
+    finally:
+        if not args.keep:
+            with db_cursor(commit=True) as cursor:
+                cursor.execute(
+                    "DELETE FROM applications WHERE user_id=%s AND job_id=%s",
+                    (args.user_id, args.job_id),
+                )
+            release_resumes(rows)
+            reconcile_application_counts()
+    if not args.keep:
+        assert blob_refs(rows[0]) == (0, 0), "resume blob left behind after cleanup"
+        assert not stored_files() - files_before, "resume file left behind after cleanup"
+    print("ok: one application, one blob reference, applications_count +1, no orphans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Side-by-side load test of the WSGI (gunicorn) and ASGI (uvicorn) modes.
+
+Start both against the same local MySQL, with sessions every worker can
+read (SESSION_BACKEND=cookie, or shared with Redis) and rate limits off:
+
+    export SESSION_BACKEND=cookie RATE_LIMIT_BACKEND=none
+    gunicorn -w 4 -b 127.0.0.1:8000 'app:create_app()'
+    uvicorn asgi:app --workers 4 --port 8001
+
+then
+
+    python -m benchmarks.bench_asgi --identifier user@example.com --password Secret123 \\
+        --clients 1000 --duration 30
+
+Each of --clients concurrent clients logs in once and then requests --path
+(default /api/jobs) back to back for --duration seconds. Reported per
+server: requests/s, p50/p99 latency and errors (non-200 or connection).
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+SERVERS = {"wsgi": "http://127.0.0.1:8000", "asgi": "http://127.0.0.1:8001"}
+
+
+async def client_loop(http, base, path, cookies, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await http.get(base + path, cookies=cookies)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(1)
+
+
+async def run(name, base, args):
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as http:
+        login = await http.post(
+            base + "/api/login", json={"identifier": args.identifier, "password": args.password}
+        )
+        if login.status_code != 200:
+            raise SystemExit(f"{name}: login failed ({login.status_code}) {login.text[:200]}")
+        cookies = dict(login.cookies)
+
+        latencies, errors = [], []
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            client_loop(http, base, args.path, cookies, deadline, latencies, errors)
+            for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    if not latencies:
+        print(f"{name}: no successful requests ({len(errors)} errors)")
+        return
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{name}: {len(latencies) / elapsed:8.1f} req/s  p50 {p50:7.1f} ms  "
+          f"p99 {p99:7.1f} ms  errors {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--identifier", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--path", default="/api/jobs")
+    parser.add_argument("--wsgi", default=SERVERS["wsgi"])
+    parser.add_argument("--asgi", default=SERVERS["asgi"])
+    args = parser.parse_args()
+    for name in ("wsgi", "asgi"):
+        asyncio.run(run(name, getattr(args, name), args))
+
+
+if __name__ == "__main__":
+    main()
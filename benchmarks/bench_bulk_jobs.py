@@ -0,0 +1,114 @@
+"""
+Throughput of posting jobs one by one vs. through the bulk endpoint.
+
+    python -m benchmarks.bench_bulk_jobs [--employer-id 3] [-n 500] [--batch 500]
+
+Posts N synthetic jobs for one employer through the Flask test client
+(real MySQL) three ways: N calls to POST /api/admin/jobs, one
+POST /api/admin/jobs/bulk with a JSON array, and one with a CSV upload.
+Reports jobs/s for each. Without --employer-id the first seeded
+bench_employer is used (python -m benchmarks.seed). The posted jobs are
+deleted afterwards.
+"""
+import argparse
+import csv
+import io
+import time
+
+from app import create_app
+from benchmarks import synthetic
+from blueprints import admin
+from config import db_cursor
+from facets import reconcile_job_facets
+
+TITLE_PREFIX = "bulkbench "
+
+
+def bench_jobs(n):
+    rows = []
+    for job in synthetic.jobs(n):
+        rows.append({
+            "title": TITLE_PREFIX + job["title"],
+            "experience": job["experience"],
+            "salary": str(job["salary"]),
+            "location": job["location"],
+            "description": job["description"],
+            "job_type": job["job_type"],
+            "deadline": "",
+        })
+    return rows
+
+
+def as_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=admin.JOB_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def default_employer():
+    with db_cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM employers WHERE organization_email LIKE 'bench\\_employer\\_%' ORDER BY id LIMIT 1"
+        )
+        row = cursor.fetchone()
+    if not row:
+        raise SystemExit("no seeded employer; pass --employer-id or run python -m benchmarks.seed")
+    return row[0]
+
+
+def cleanup(employer_id):
+    with db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "DELETE FROM jobs WHERE posted_by=%s AND title LIKE %s", (employer_id, TITLE_PREFIX + "%")
+        )
+    reconcile_job_facets()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employer-id", type=int)
+    parser.add_argument("-n", type=int, default=500, help="jobs per run")
+    parser.add_argument("--batch", type=int, default=admin.BULK_INSERT_BATCH, help="rows per executemany")
+    args = parser.parse_args()
+    admin.BULK_INSERT_BATCH = args.batch
+
+    app = create_app()
+    employer_id = args.employer_id or default_employer()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user"] = {"id": employer_id, "role": "Employer"}
+    rows = bench_jobs(args.n)
+
+    def single():
+        for row in rows:
+            response = client.post("/api/admin/jobs", data=row)
+            assert response.status_code == 200, response.get_json()
+
+    def bulk_json():
+        response = client.post("/api/admin/jobs/bulk", json=rows)
+        assert response.status_code == 200, response.get_json()["message"]
+
+    def bulk_csv():
+        response = client.post(
+            "/api/admin/jobs/bulk",
+            data={"file": (io.BytesIO(as_csv(rows)), "jobs.csv")},
+            content_type="multipart/form-data",
+        )
+        assert response.status_code == 200, response.get_json()["message"]
+
+    print(f"{args.n} jobs, employer {employer_id}, batch {args.batch}")
+    try:
+        for name, run in [("single POSTs", single), ("bulk JSON", bulk_json), ("bulk CSV", bulk_csv)]:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<13} {elapsed:8.2f} s  {args.n / elapsed:9.0f} jobs/s")
+            cleanup(employer_id)
+    finally:
+        cleanup(employer_id)
+
+
+if __name__ == "__main__":
+    main()
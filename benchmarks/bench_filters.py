@@ -0,0 +1,98 @@
+"""
+Latency of filtered job listings and of the filter facet counts.
+
+    python -m benchmarks.seed --employers 500 --jobs 1000000
+    python -m benchmarks.bench_filters [--repeat 50]
+
+Runs against the configured database. For each filter set, times the first
+page of /api/jobs as _load_jobs builds it (uncached) and prints the index
+MySQL picks for it. Then times the facet counts read from job_facets against
+the GROUP BY scans over jobs they replace, and checks both agree (run
+`flask reconcile-facets` first if the table was filled by other means).
+"""
+import argparse
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from benchmarks.bench_search import timed, report
+from blueprints.user import _load_jobs
+from config import db_cursor
+from facets import parse_filters, filter_clause, load_facets, salary_bucket, JOB_TYPES, FACET_LOCATION_LIMIT
+
+FILTERS = [
+    "",
+    "job_type=Internship",
+    "location=Pune",
+    "job_type=Remote&location=Bengaluru",
+    "salary_min=10&salary_max=15",
+    "max_experience=2&open=1",
+    "job_type=Full-Time&salary_min=25&max_experience=5",
+    "q=python&location=Chennai",
+]
+PER_PAGE = 6
+
+
+def explain_key(filters):
+    where, params = filter_clause(filters)
+    sql = "EXPLAIN SELECT j.id FROM jobs j"
+    if where:
+        sql += f" WHERE {where}"
+    sql += " ORDER BY j.created_at DESC, j.id DESC LIMIT 7"
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute(sql, tuple(params))
+        plan = cursor.fetchall()[0]
+    return plan["key"] or "(none)", plan["Extra"] or ""
+
+
+def group_by_facets():
+    """The facet counts computed per request, as job_facets avoids"""
+    with db_cursor() as cursor:
+        cursor.execute("SELECT job_type, COUNT(*) FROM jobs WHERE job_type IS NOT NULL GROUP BY job_type")
+        job_types = dict(cursor.fetchall())
+        cursor.execute(
+            "SELECT location, COUNT(*) AS n FROM jobs GROUP BY location ORDER BY n DESC, location LIMIT %s",
+            (FACET_LOCATION_LIMIT,),
+        )
+        locations = cursor.fetchall()
+        cursor.execute("SELECT salary, COUNT(*) FROM jobs GROUP BY salary")
+        salary = {}
+        for value, n in cursor.fetchall():
+            bucket = salary_bucket(value)
+            salary[bucket] = salary.get(bucket, 0) + n
+    return job_types, locations, salary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM jobs")
+        print(f"{cursor.fetchone()[0]:,} jobs")
+
+    for query in FILTERS:
+        query_args = MultiDict(parse_qsl(query))
+        filters, error = parse_filters(query_args)
+        assert not error, error
+        q = query_args.get("q", "")
+        key, extra = explain_key(filters)
+        print(f"{query or '(no filters)'}   key={key} {extra}")
+        report("page 1", timed(lambda: _load_jobs(1, PER_PAGE, q, None, filters), args.repeat))
+
+    print("facet counts")
+    report("job_facets", timed(load_facets, args.repeat))
+    report("group by", timed(group_by_facets, max(1, args.repeat // 10)))
+
+    facets = load_facets()
+    job_types, locations, salary = group_by_facets()
+    assert {f["value"]: f["count"] for f in facets["job_type"]} == {
+        t: n for t, n in job_types.items() if t in JOB_TYPES
+    }, "job_type counts differ; run flask reconcile-facets"
+    assert [f["count"] for f in facets["location"]] == [n for _, n in locations], "location counts differ"
+    assert {f"{f['salary_min']:g}": f["count"] for f in facets["salary"]} == salary, "salary counts differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Login lookup: `email=%s OR mobile=%s` versus a single-column lookup.
+
+    python -m benchmarks.bench_login_lookup --users 1000000 [--seed] [--cleanup]
+
+--seed adds synthetic users (bench_login_<n>) until the users table
+holds --users rows. For a sample of existing emails and mobiles the
+script then times the old OR query (SELECT *) against the lookup
+api_login now runs (identifier_column() + only the needed columns),
+and prints the EXPLAIN plan of both.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from config import db_cursor
+from blueprints.auth import identifier_column
+
+OR_SQL = "SELECT * FROM users WHERE (email=%s OR mobile=%s)"
+SPLIT_SQL = "SELECT id, name, email, mobile, password, profile_pic FROM users WHERE {column}=%s"
+
+# a fixed, realistic-length hash; these accounts are never logged into
+BENCH_HASH = "pbkdf2:sha256:260000$benchsaltbenchsa$" + "0" * 64
+
+
+def seed(target, batch=10000):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM users")
+        existing = cursor.fetchone()[0]
+    for start in range(existing, target, batch):
+        rows = [
+            (f"bench_login_{i}", f"bench_login_{i}@example.com", f"8{i:09d}", BENCH_HASH)
+            for i in range(start, min(start + batch, target))
+        ]
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                "INSERT INTO users (name, email, mobile, password) VALUES (%s,%s,%s,%s)", rows
+            )
+    return max(0, target - existing)
+
+
+def cleanup():
+    with db_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM users WHERE name LIKE 'bench\\_login\\_%'")
+        return cursor.rowcount
+
+
+def sample_identifiers(count):
+    with db_cursor() as cursor:
+        cursor.execute("SELECT MAX(id) FROM users")
+        max_id = cursor.fetchone()[0] or 0
+        rng = random.Random(3)
+        ids = [rng.randint(1, max_id) for _ in range(count)]
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"SELECT email, mobile FROM users WHERE id IN ({placeholders})", tuple(ids))
+        rows = cursor.fetchall()
+    identifiers = []
+    for email, mobile in rows:
+        identifiers.extend([email, mobile])
+    return identifiers
+
+
+def timed(cursor, fn, identifiers):
+    times = []
+    for identifier in identifiers:
+        start = time.perf_counter()
+        fn(cursor, identifier)
+        cursor.fetchall()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def or_lookup(cursor, identifier):
+    cursor.execute(OR_SQL, (identifier, identifier))
+
+
+def split_lookup(cursor, identifier):
+    cursor.execute(SPLIT_SQL.format(column=identifier_column(identifier)), (identifier,))
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = [c[0] for c in cursor.description]
+    for row in cursor.fetchall():
+        plan = dict(zip(columns, row))
+        print(f"    type={plan['type']} key={plan['key']} rows={plan['rows']} extra={plan['Extra']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        print(f"seeded {seed(args.users)} users")
+    identifiers = sample_identifiers(args.samples)
+    if not identifiers:
+        raise SystemExit("users table is empty; run with --seed")
+
+    with db_cursor() as cursor:
+        email, mobile = identifiers[0], identifiers[1]
+        print("OR lookup:")
+        explain(cursor, OR_SQL, (email, email))
+        print("split lookup (email / mobile):")
+        explain(cursor, SPLIT_SQL.format(column="email"), (email,))
+        explain(cursor, SPLIT_SQL.format(column="mobile"), (mobile,))
+
+        for name, fn in (("or", or_lookup), ("split", split_lookup)):
+            p50, p99 = timed(cursor, fn, identifiers)
+            print(f"{name:>6}: p50 {p50:.3f} ms  p99 {p99:.3f} ms  ({len(identifiers)} lookups)")
+
+    if args.cleanup:
+        print(f"removed {cleanup()} seeded users")
+
+
+if __name__ == "__main__":
+    main()
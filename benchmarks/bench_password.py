@@ -0,0 +1,83 @@
+"""
+Calibrate PASSWORD_HASH_ITERATIONS and measure login throughput.
+
+    python -m benchmarks.bench_password --target-ms 250 --concurrency 50
+
+1. Times PBKDF2 on this machine and prints the iteration count whose
+   single hash takes about --target-ms (rounded down to 10k).
+2. Fires --concurrency simultaneous verifications through the bounded
+   hash pool (credentials.py) at that cost and reports latency
+   p50/p99 and how many were shed with HashingBusy.
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+import credentials
+from config import PASSWORD_HASH_ALGORITHM, PASSWORD_HASH_ITERATIONS, PASSWORD_HASH_WORKERS
+
+
+def time_pbkdf2(iterations, algorithm=PASSWORD_HASH_ALGORITHM, samples=5):
+    salt = os.urandom(16)
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac(algorithm, b"Calibrate1", salt, iterations)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def calibrate(target_ms, algorithm=PASSWORD_HASH_ALGORITHM):
+    """Iteration count whose hash takes about target_ms on this CPU"""
+    probe = 100_000
+    per_iteration = time_pbkdf2(probe, algorithm) / probe
+    iterations = int(target_ms / 1000 / per_iteration) // 10_000 * 10_000
+    return max(iterations, 10_000)
+
+
+def load(iterations, concurrency):
+    method = f"pbkdf2:{PASSWORD_HASH_ALGORITHM}:{iterations}"
+    stored = generate_password_hash("Secret123", method=method)
+
+    def login(_):
+        start = time.perf_counter()
+        try:
+            credentials.verify_password(stored, "Secret123")
+        except credentials.HashingBusy:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(login, range(concurrency)))
+        elapsed = time.perf_counter() - start
+    done = sorted(r for r in results if r is not None)
+    if done:
+        p50 = done[len(done) // 2] * 1000
+        p99 = done[min(len(done) - 1, int(len(done) * 0.99))] * 1000
+        print(f"{len(done)} verified in {elapsed:.2f}s  p50 {p50:.0f} ms  p99 {p99:.0f} ms")
+    print(f"{concurrency - len(done)} shed with HashingBusy "
+          f"(PASSWORD_HASH_WORKERS={PASSWORD_HASH_WORKERS})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    current = time_pbkdf2(PASSWORD_HASH_ITERATIONS) * 1000
+    print(f"current: {PASSWORD_HASH_ITERATIONS} iterations = {current:.0f} ms per hash")
+    iterations = calibrate(args.target_ms)
+    measured = time_pbkdf2(iterations) * 1000
+    print(f"PASSWORD_HASH_ITERATIONS={iterations}  ({measured:.0f} ms per hash)")
+    load(iterations, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Connection pool checkout latency under concurrency.
+
+    python -m benchmarks.bench_pool --concurrency 200 --requests 5000
+
+Each simulated request borrows a connection, runs `SELECT SLEEP(--hold)`
+to stand in for the queries of a typical endpoint, and returns it. The
+pool is configured from the DB_POOL_* settings (override with flags), and
+the checkout wait p50/p99/max is reported along with the pool's own stats.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mysql.connector
+
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE
+from db_pool import ConnectionPool, PoolTimeout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--hold", type=float, default=0.005, help="seconds each request holds the connection")
+    parser.add_argument("--size", type=int, default=DB_POOL_SIZE)
+    parser.add_argument("--max-overflow", type=int, default=DB_POOL_MAX_OVERFLOW)
+    parser.add_argument("--timeout", type=float, default=DB_POOL_TIMEOUT)
+    args = parser.parse_args()
+
+    pool = ConnectionPool(
+        lambda: mysql.connector.connect(**DB_CONFIG),
+        size=args.size,
+        max_overflow=args.max_overflow,
+        timeout=args.timeout,
+        recycle=DB_POOL_RECYCLE,
+    )
+
+    def one_request(_):
+        start = time.perf_counter()
+        try:
+            conn = pool.checkout()
+        except PoolTimeout:
+            return None
+        waited = time.perf_counter() - start
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT SLEEP(%s)", (args.hold,))
+            cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+        return waited
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    waits = sorted(w * 1000 for w in results if w is not None)
+    failed = sum(w is None for w in results)
+    print(f"{args.requests} requests, concurrency {args.concurrency}, pool {args.size}+{args.max_overflow}")
+    print(f"elapsed {elapsed:.2f} s ({args.requests / elapsed:.0f} req/s), timeouts {failed}")
+    if waits:
+        print(
+            f"checkout wait p50 {waits[len(waits) // 2]:.2f} ms  "
+            f"p99 {waits[int(len(waits) * 0.99) - 1]:.2f} ms  max {waits[-1]:.2f} ms"
+        )
+    print(pool.stats())
+    pool.dispose()
+
+
+if __name__ == "__main__":
+    main()
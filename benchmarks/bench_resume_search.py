@@ -0,0 +1,113 @@
+"""
+Applicant keyword search over extracted resume text.
+
+    python -m benchmarks.bench_resume_search --resumes 100000
+
+Seeds the configured database with one job that has --resumes applicants,
+each with a distinct resume blob and extracted text, then times
+resume_text.search_applicants (FULLTEXT) against a LIKE scan of the same
+rows. Seeded users are named bench_resume_<n>; --cleanup removes them
+(and, through the cascades, their applications) afterwards.
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import time
+
+from benchmarks import synthetic
+from config import db_cursor
+from resume_text import search_applicants
+
+QUERIES = ["python", "django aws", "react node", "sql excel tableau", "kubernetes terraform linux"]
+
+
+def seed(count, batch=2000):
+    rng = random.Random(7)
+    with db_cursor(commit=True) as cursor:
+        cursor.execute("SELECT id FROM employers ORDER BY id LIMIT 1")
+        employer = cursor.fetchone()
+        if not employer:
+            raise SystemExit("seed at least one employer first")
+        cursor.execute(
+            """INSERT INTO jobs (title, company, location, posted_by, experience, salary)
+               VALUES ('Benchmark Job', 'Bench', 'Remote', %s, '0 years', 0)""",
+            (employer[0],),
+        )
+        job_id = cursor.lastrowid
+
+    for start in range(0, count, batch):
+        users, blobs, texts = [], [], []
+        for i in range(start, min(start + batch, count)):
+            sha = hashlib.sha256(f"bench-{i}".encode()).hexdigest()
+            path = f"{sha[:2]}/{sha[2:4]}/{sha}.pdf"
+            users.append((f"bench_resume_{i}", f"bench_resume_{i}@example.com", f"9{i:09d}", "x"))
+            blobs.append((path, sha, 0))
+            texts.append((path, "done", synthetic.resume_text(rng)))
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany("INSERT INTO users (name, email, mobile, password) VALUES (%s,%s,%s,%s)", users)
+            first_id = cursor.lastrowid  # first id of the multi-row insert
+            cursor.executemany("INSERT INTO resume_blobs (path, sha256, size) VALUES (%s,%s,%s)", blobs)
+            cursor.executemany("INSERT INTO resume_texts (path, status, content) VALUES (%s,%s,%s)", texts)
+            cursor.executemany(
+                "INSERT INTO applications (user_id, job_id, resume_path) VALUES (%s,%s,%s)",
+                [(first_id + n, job_id, blob[0]) for n, blob in enumerate(blobs)],
+            )
+    return job_id
+
+
+def like_search(cursor, job_id, q, limit):
+    clauses = " AND ".join(["t.content LIKE %s"] * len(q.split()))
+    cursor.execute(
+        f"""SELECT a.id FROM applications a
+            JOIN resume_texts t ON t.path = a.resume_path
+            WHERE a.job_id=%s AND {clauses}
+            ORDER BY a.applied_at DESC LIMIT %s""",
+        (job_id, *(f"%{w}%" for w in q.split()), limit),
+    )
+    return cursor.fetchall()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def cleanup(job_id):
+    with db_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM jobs WHERE id=%s", (job_id,))
+        cursor.execute("DELETE FROM users WHERE name LIKE 'bench\\_resume\\_%'")
+        cursor.execute(
+            "DELETE b FROM resume_blobs b LEFT JOIN applications a ON a.resume_path = b.path "
+            "WHERE a.id IS NULL AND b.size = 0"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    job_id = seed(args.resumes)
+    print(f"seeded {args.resumes:,} resumes for job {job_id} in {time.perf_counter() - start:.0f} s")
+
+    with db_cursor(dictionary=True) as cursor:
+        for q in QUERIES:
+            ft = timed(lambda: search_applicants(cursor, job_id, q, 11), args.repeat)
+            like = timed(lambda: like_search(cursor, job_id, q, 11), max(1, args.repeat // 5))
+            print(f"q={q!r:<30} fulltext median {ft[0]:8.2f} ms max {ft[1]:8.2f} ms | "
+                  f"like median {like[0]:9.2f} ms max {like[1]:9.2f} ms")
+
+    if args.cleanup:
+        cleanup(job_id)
+
+
+if __name__ == "__main__":
+    main()
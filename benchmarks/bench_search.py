@@ -0,0 +1,114 @@
+"""
+Job search latency: legacy LIKE scan vs FULLTEXT vs the in-process inverted index.
+
+    python -m benchmarks.bench_search                 # in-process only
+    python -m benchmarks.bench_search --mysql         # also seed and query MySQL
+
+The in-process run compares the inverted index with a Python substring scan,
+which has the same semantics as `LIKE %q%` on title/company/location.
+With --mysql the `jobs` table of the configured database is filled with
+synthetic rows (existing rows are kept) and all three backends are timed
+through db_cursor.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import synthetic
+from search import InvertedIndex, LikeSearch, FulltextSearch
+
+# "hr manager" and "qa" have tokens too short for the FULLTEXT index (LIKE fallback)
+QUERIES = [
+    "python", "senior", "dev", "data sci", "bengaluru", "acme 12", "cloud arch", "remote",
+    "hr manager", "qa",
+]
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    print(f"  {name:<10} median {statistics.median(samples):9.3f} ms   p95 {p95:9.3f} ms")
+
+
+def like_scan(rows, q, limit):
+    q = q.lower()
+    hits = [
+        r for r in rows
+        if q in r["title"].lower() or q in r["company"].lower() or q in r["location"].lower()
+    ]
+    hits.sort(key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    return hits[:limit]
+
+
+def bench_memory(rows, repeat, limit):
+    index = InvertedIndex()
+    start = time.perf_counter()
+    index.load(rows)
+    print(f"inverted index built over {len(rows):,} jobs in {time.perf_counter() - start:.1f} s")
+    for q in QUERIES:
+        print(f"q={q!r}")
+        report("like", timed(lambda: like_scan(rows, q, limit), max(1, repeat // 10)))
+        report("memory", timed(lambda: index.query(q, limit=limit), repeat))
+
+
+def seed_mysql(rows, batch=5000):
+    from config import db_cursor
+
+    sql = """INSERT INTO jobs (title, company, location, description, posted_by, created_at,
+                               experience, salary, job_type)
+             VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
+    with db_cursor(commit=True) as cursor:
+        cursor.execute("SELECT id FROM employers ORDER BY id LIMIT 1")
+        employer = cursor.fetchone()
+        if not employer:
+            raise SystemExit("seed at least one employer before running --mysql")
+        chunk = []
+        for r in rows:
+            chunk.append((r["title"], r["company"], r["location"], r["description"], employer[0],
+                          r["created_at"], r["experience"], r["salary"], r["job_type"]))
+            if len(chunk) == batch:
+                cursor.executemany(sql, chunk)
+                chunk = []
+        if chunk:
+            cursor.executemany(sql, chunk)
+
+
+def bench_mysql(repeat, limit):
+    from config import db_cursor
+
+    backends = [LikeSearch(), FulltextSearch(), InvertedIndex(refresh_interval=float("inf"))]
+    with db_cursor(dictionary=True) as cursor:
+        for q in QUERIES:
+            print(f"q={q!r}")
+            for backend in backends:
+                report(backend.name, timed(lambda: backend.search(cursor, q, limit, 0), repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=7, help="page size + 1, as the endpoints ask for")
+    parser.add_argument("--mysql", action="store_true", help="seed the configured database and query it")
+    parser.add_argument("--skip-seed", action="store_true", help="with --mysql, query the existing rows")
+    args = parser.parse_args()
+
+    rows = list(synthetic.jobs(args.jobs))
+    bench_memory(rows, args.repeat, args.limit)
+    if args.mysql:
+        if not args.skip_seed:
+            seed_mysql(rows)
+        bench_mysql(args.repeat, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cookie size and per-request cost of the session backends.
+
+    python -m benchmarks.bench_session [--requests 20000]
+
+Logs a user in through the session interface and then replays
+GET /api/session (no database access) with the resulting cookie.
+"""
+import argparse
+import time
+
+from app import create_app
+from sessions import create_session_interface
+
+USER = {
+    "id": 4211,
+    "name": "Priya Raghavan",
+    "email": "priya.raghavan@example.com",
+    "mobile": "9876543210",
+    "role": "User",
+    "profile_pic": "user4211_20250101120000.png",
+    "profile_pic_url": "/uploads/profile_pics/user4211_20250101120000.png.128.webp",
+}
+
+
+def run(backend, requests):
+    app = create_app()
+    app.session_interface = create_session_interface(backend)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user"] = dict(USER)
+    value = next(c.value for c in client.cookie_jar if c.name == "session")
+
+    for _ in range(200):  # warm up
+        client.get("/api/session")
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/api/session")
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.status_code
+
+    # open_session alone: what every request pays before the view runs
+    interface = app.session_interface
+    with app.test_request_context(headers={"Cookie": f"session={value}"}):
+        from flask import request
+        start = time.perf_counter()
+        for _ in range(requests):
+            interface.open_session(app, request)
+        open_us = (time.perf_counter() - start) / requests * 1e6
+
+    print(
+        f"{backend:>7}: cookie {len(value):4d} B  "
+        f"request {elapsed / requests * 1e6:7.1f} us  open_session {open_us:6.2f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    for backend in ("cookie", "memory", "shared"):
+        run(backend, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Round-trip uploads through the storage backends.
+
+    python -m benchmarks.bench_storage [--size-mb 40] [--files 200] [--url http://localhost:9000]
+
+For each backend, first checks a round trip through the Storage interface
+(save, multipart save, list, open/read, save_file, local_file, delete) and
+fails on any mismatch. Then writes one large file from a stream (multipart
+above STORAGE_PART_SIZE for s3), reads it back in chunks, checks the SHA-256 of
+both, and lists `--files` small objects. The largest read from the source
+stream shows how much of an upload is buffered at once (one part for s3,
+one 64 KiB chunk for local). Without --url the s3 backend runs against the
+in-process LocalObjectStore; with it, against that endpoint (needs boto3
+and AWS_* credentials for the bucket).
+"""
+import argparse
+import hashlib
+import io
+import os
+import tempfile
+import time
+
+from config import STORAGE_BUCKET, STORAGE_PART_SIZE
+from storage import LocalStorage, S3Storage, LocalObjectStore, create_storage, CHUNK_SIZE
+
+
+class RandomStream:
+    """`size` pseudo-random bytes, produced as they are read"""
+
+    def __init__(self, size, seed=7):
+        self.remaining = size
+        self.block = hashlib.sha256(str(seed).encode()).digest() * 2048  # 64 KiB
+        self.digest = hashlib.sha256()
+        self.largest_read = 0
+
+    def read(self, n=-1):
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        out = (self.block * (n // len(self.block) + 1))[:n]
+        self.remaining -= n
+        self.largest_read = max(self.largest_read, n)
+        self.digest.update(out)
+        return out
+
+
+def read_all(storage, key):
+    body = storage.open(key)
+    try:
+        return b"".join(iter(lambda: body.read(CHUNK_SIZE), b""))
+    finally:
+        body.close()
+
+
+def check_round_trip(name, storage):
+    """Assert every Storage operation the app uses behaves the same on this backend"""
+    small_key, large_key, file_key = "check/small.txt", "check/large.bin", "check/sub/file.pdf"
+    small = b"round trip " * 10
+    assert storage.save(small_key, io.BytesIO(small)) == len(small), f"{name}: save size"
+    assert storage.stat(small_key).st_size == len(small), f"{name}: stat size"
+
+    # two full parts and a short last one: a multipart upload on s3
+    part_size = getattr(storage, "part_size", CHUNK_SIZE)
+    source = RandomStream(2 * part_size + 1000, seed=11)
+    parts = []
+    if isinstance(storage, S3Storage):
+        upload_part = storage.client.upload_part
+        storage.client.upload_part = lambda **kw: parts.append(kw["PartNumber"]) or upload_part(**kw)
+    try:
+        assert storage.save(large_key, source) == 2 * part_size + 1000, f"{name}: multipart save size"
+    finally:
+        if isinstance(storage, S3Storage):
+            del storage.client.upload_part
+    if isinstance(storage, S3Storage):
+        assert parts == [1, 2, 3], f"{name}: expected a 3-part upload, got parts {parts}"
+
+    with tempfile.NamedTemporaryFile(delete=False) as temp:
+        temp.write(small)
+    storage.save_file(file_key, temp.name, move=True)
+    assert not os.path.exists(temp.name), f"{name}: save_file(move=True) left the source"
+
+    listed = {obj.key: obj.st_size for obj in storage.list("check")}
+    assert listed == {small_key: len(small), large_key: 2 * part_size + 1000, file_key: len(small)}, (
+        f"{name}: list returned {listed}"
+    )
+    assert read_all(storage, small_key) == small, f"{name}: small content mismatch"
+    assert hashlib.sha256(read_all(storage, large_key)).hexdigest() == source.digest.hexdigest(), (
+        f"{name}: multipart content mismatch"
+    )
+    with storage.local_file(file_key) as path, open(path, "rb") as f:
+        assert f.read() == small, f"{name}: local_file content mismatch"
+
+    for key in listed:
+        storage.delete(key)
+        assert not storage.exists(key), f"{name}: {key} still exists after delete"
+    assert not list(storage.list("check")), f"{name}: list not empty after delete"
+    try:
+        storage.open(small_key)
+    except FileNotFoundError:
+        pass
+    else:
+        raise AssertionError(f"{name}: open of a deleted key did not raise FileNotFoundError")
+    print(f"{name:<10} round trip ok")
+
+
+def run(name, storage, size, files):
+    key = "bench/large.bin"
+    source = RandomStream(size)
+    start = time.perf_counter()
+    storage.save(key, source)
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    body = storage.open(key)
+    for chunk in iter(lambda: body.read(64 * 1024), b""):
+        digest.update(chunk)
+    body.close()
+    read = time.perf_counter() - start
+    assert digest.hexdigest() == source.digest.hexdigest(), f"{name}: content mismatch"
+    assert storage.stat(key).st_size == size
+
+    for n in range(files):
+        storage.save(f"bench/small/{n:05d}.txt", io.BytesIO(b"x" * 100))
+    start = time.perf_counter()
+    listed = sum(1 for _ in storage.list("bench/small"))
+    listing = time.perf_counter() - start
+    assert listed == files, (listed, files)
+
+    url = storage.url(key, filename="large.bin")
+    for obj in list(storage.list("bench")):
+        storage.delete(obj.key)
+    assert not storage.exists(key)
+
+    mb = size / 1024 / 1024
+    print(
+        f"{name:<10} write {mb / write:8.1f} MB/s  read {mb / read:8.1f} MB/s  "
+        f"buffered {source.largest_read / 1024 / 1024:5.2f} MB  list {files} in {listing * 1000:6.1f} ms"
+        f"  signed url: {'yes' if url else 'no'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=40)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--url", default="", help="S3-compatible endpoint to test instead of the stand-in")
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    print(f"{args.size_mb:g} MB file, part size {STORAGE_PART_SIZE / 1024 / 1024:g} MB")
+    with tempfile.TemporaryDirectory() as root:
+        check_round_trip("local", LocalStorage(root))
+        run("local", LocalStorage(root), size, args.files)
+    if args.url:
+        check_round_trip("s3", create_storage("s3", args.url))
+        run("s3", create_storage("s3", args.url), size, args.files)
+    else:
+        store = LocalObjectStore()
+        check_round_trip("s3 (fake)", S3Storage(store, STORAGE_BUCKET, presign_ttl=300))
+        run("s3 (fake)", S3Storage(store, STORAGE_BUCKET, presign_ttl=300), size, args.files)
+
+
+if __name__ == "__main__":
+    main()
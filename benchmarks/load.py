@@ -0,0 +1,196 @@
+"""
+Replay realistic traffic against create_app() and report per-endpoint
+throughput and latency percentiles.
+
+    python -m benchmarks.seed            # once, see its docstring for volumes
+    python -m benchmarks.load --clients 50 --duration 60 [--employer-share 0.1]
+
+Each client is a thread with its own Flask test client (in-process, real
+MySQL) that logs in as a seeded account and then loops over a session:
+
+- job seeker: job list, 1-3 more pages through next_cursor, a search
+  typed into the debounced search box (only the queries the 300 ms
+  debounce would send), a job detail, and sometimes an application with
+  a generated .docx resume
+- employer: own job list and search, applicants of one job with a second
+  page, an applicant keyword search, and sometimes a resume download
+
+Rate limits and concurrency caps are switched off for the run (override
+with the RATE_LIMIT_BACKEND / CONCURRENCY_* environment variables).
+Applications made during the run stay; `python -m benchmarks.seed
+--cleanup` removes them with the seeded accounts.
+"""
+import os
+
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+os.environ.setdefault("CONCURRENCY_AUTH", "0")
+os.environ.setdefault("CONCURRENCY_APPLY", "0")
+
+import argparse
+import io
+import random
+import threading
+import time
+from collections import defaultdict
+
+from app import create_app
+from benchmarks import synthetic
+from config import db_cursor
+
+SEARCH_TERMS = [t.lower() for t in synthetic.TITLES] + synthetic.LOCATIONS[:6] + [
+    "python developer bengaluru", "remote data", "senior java", "intern",
+]
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label, shared by all clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, label, fn, *args, **kwargs):
+        start = time.perf_counter()
+        response = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples[label].append(elapsed)
+            if response.status_code >= 400:
+                self.errors[label] += 1
+        return response
+
+    def report(self, elapsed):
+        print(f"{'endpoint':<34}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}"
+              f"{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+        total = 0
+        for label in sorted(self.samples):
+            samples = sorted(self.samples[label])
+            total += len(samples)
+
+            def pct(p):
+                return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+            print(f"{label:<34}{len(samples):>8}{len(samples) / elapsed:>9.1f}{pct(0.5):>9.1f}"
+                  f"{pct(0.9):>9.1f}{pct(0.99):>9.1f}{samples[-1] * 1000:>9.1f}"
+                  f"{self.errors[label]:>8}")
+        print(f"{'total':<34}{total:>8}{total / elapsed:>9.1f}")
+
+
+def account_counts():
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM users WHERE email LIKE 'bench\\_user\\_%'")
+        users = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT COUNT(*) FROM employers WHERE organization_email LIKE 'bench\\_employer\\_%'"
+        )
+        employers = cursor.fetchone()[0]
+    if not users or not employers:
+        raise SystemExit("no seeded accounts; run python -m benchmarks.seed first")
+    return users, employers
+
+
+def json_of(response):
+    return response.get_json(silent=True) or {}
+
+
+# -------------------- SESSIONS --------------------
+def job_seeker_session(client, rec, rng, apply_rate):
+    data = json_of(rec.call("GET /api/jobs", client.get, "/api/jobs"))
+    jobs = data.get("jobs", [])
+    for _ in range(rng.randint(1, 3)):
+        if not data.get("next_cursor"):
+            break
+        data = json_of(rec.call(
+            "GET /api/jobs?cursor", client.get, "/api/jobs", query_string={"cursor": data["next_cursor"]}
+        ))
+        jobs += data.get("jobs", [])
+
+    for q in synthetic.typed_queries(rng, rng.choice(SEARCH_TERMS)):
+        found = json_of(rec.call("GET /api/jobs?q", client.get, "/api/jobs", query_string={"q": q}))
+    jobs += found.get("jobs", [])
+
+    if not jobs:
+        return
+    job = rng.choice(jobs)
+    rec.call("GET /api/job/<id>", client.get, f"/api/job/{job['id']}")
+    if not job.get("applied") and rng.random() < apply_rate:
+        resume = synthetic.docx_bytes(synthetic.resume_text(rng))
+        rec.call(
+            "POST /api/apply/<id>", client.post, f"/api/apply/{job['id']}",
+            data={"resume": (io.BytesIO(resume), "resume.docx")},
+            content_type="multipart/form-data",
+        )
+
+
+def employer_session(client, rec, rng, download_rate):
+    jobs = json_of(rec.call("GET /api/admin/jobs", client.get, "/api/admin/jobs")).get("jobs", [])
+    q = rng.choice(synthetic.TITLES).split()[0].lower()
+    rec.call("GET /api/admin/jobs?q", client.get, "/api/admin/jobs", query_string={"q": q})
+    if not jobs:
+        return
+    job = max(jobs, key=lambda j: j.get("applications_count", 0))
+    url = f"/api/admin/applications/{job['id']}"
+    data = json_of(rec.call("GET /api/admin/applications/<id>", client.get, url))
+    applicants = data.get("applicants", [])
+    if data.get("next_cursor"):
+        rec.call("GET /api/admin/applications?cursor", client.get, url,
+                 query_string={"cursor": data["next_cursor"]})
+    skills = " ".join(rng.sample(synthetic.SKILLS, rng.randint(1, 2)))
+    rec.call("GET /api/admin/applications?q", client.get, url, query_string={"q": skills})
+    if applicants and rng.random() < download_rate:
+        name = rng.choice(applicants)["resume_filename"]
+        rec.call("GET /api/admin/resumes/<file>", client.get, f"/api/admin/resumes/{name}")
+
+
+def run_client(app, rec, n, args, counts, deadline):
+    rng = random.Random(n)
+    client = app.test_client()
+    employer = rng.random() < args.employer_share
+    if employer:
+        identifier = f"bench_employer_{rng.randrange(counts[1])}@example.com"
+        login_url = "/api/employer/login"
+    else:
+        identifier = f"bench_user_{rng.randrange(counts[0])}@example.com"
+        login_url = "/api/login"
+    response = rec.call(f"POST {login_url}", client.post, login_url,
+                        json={"identifier": identifier, "password": synthetic.PASSWORD})
+    if response.status_code != 200:
+        return
+    while time.perf_counter() < deadline:
+        if employer:
+            employer_session(client, rec, rng, args.download_rate)
+        else:
+            job_seeker_session(client, rec, rng, args.apply_rate)
+        if args.think_time:
+            time.sleep(rng.expovariate(1 / args.think_time))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--employer-share", type=float, default=0.1)
+    parser.add_argument("--apply-rate", type=float, default=0.05, help="share of job seeker sessions that apply")
+    parser.add_argument("--download-rate", type=float, default=0.2, help="share of employer sessions that download a resume")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between sessions, seconds")
+    args = parser.parse_args()
+
+    app = create_app()
+    counts = account_counts()
+    rec = Recorder()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=run_client, args=(app, rec, n, args, counts, deadline))
+        for n in range(args.clients)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    rec.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
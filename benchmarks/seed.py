@@ -0,0 +1,207 @@
+"""
+Seed the configured MySQL database with synthetic benchmark data.
+
+    python -m benchmarks.seed --users 10000 --employers 500 --jobs 50000 \\
+        --applications 200000 --resume-files 2000
+    python -m benchmarks.seed --cleanup
+
+Accounts are bench_user_<n>@example.com / bench_employer_<n>@example.com
+(mobiles 7xxxxxxxxx / 6xxxxxxxxx), all with the password in
+synthetic.PASSWORD. Resumes are small .docx files written to the
+content-addressed store together with their resume_blobs and resume_texts
+rows, so applicant search works without running the extractor. Seeding is
+additive and skips rows that already exist; --cleanup removes the seeded
+accounts (their jobs and applications cascade) and unreferenced blobs.
+"""
+import argparse
+import hashlib
+import os
+import random
+import time
+from datetime import timedelta
+
+from benchmarks import synthetic
+from commands import reconcile_application_counts
+from facets import experience_years, reconcile_job_facets
+from config import db_cursor, RESUME_FOLDER
+from credentials import hash_password
+from resume_upload import StagedResume, blob_path, store_resume, release_resumes
+
+BATCH = 5000
+
+
+def _batches(rows, size=BATCH):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ids(sql):
+    with db_cursor() as cursor:
+        cursor.execute(sql)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def seed_accounts(users, employers):
+    password = hash_password(synthetic.PASSWORD)  # one hash for all, it is slow on purpose
+    for chunk in _batches(synthetic.employers(employers)):
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                """INSERT IGNORE INTO employers
+                   (employer_name, organization_name, organization_email, mobile, password)
+                   VALUES (%s, %s, %s, %s, %s)""",
+                [(e["employer_name"], e["organization_name"], e["organization_email"],
+                  e["mobile"], password) for e in chunk],
+            )
+    for chunk in _batches(synthetic.users(users)):
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                "INSERT IGNORE INTO users (name, email, mobile, password) VALUES (%s, %s, %s, %s)",
+                [(u["name"], u["email"], u["mobile"], password) for u in chunk],
+            )
+
+
+def seed_jobs(count):
+    with db_cursor() as cursor:
+        cursor.execute(
+            """SELECT id, organization_name FROM employers
+               WHERE organization_email LIKE 'bench\\_employer\\_%'"""
+        )
+        employers = cursor.fetchall()
+    if not employers:
+        raise SystemExit("no seeded employers; run with --employers first")
+    rng = random.Random(5)
+    rows = synthetic.jobs(count, employers=len(employers))
+    for chunk in _batches(rows):
+        values = []
+        for job in chunk:
+            employer_id, company = employers[job["posted_by"] - 1]
+            values.append((
+                job["title"], company, job["location"], job["description"], employer_id,
+                job["created_at"] + timedelta(seconds=rng.randint(0, 29)),
+                job["experience"], experience_years(job["experience"]), job["salary"], job["job_type"],
+            ))
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                """INSERT INTO jobs (title, company, location, description, posted_by, created_at,
+                                     experience, experience_years, salary, job_type)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                values,
+            )
+    reconcile_job_facets()
+
+
+def seed_resumes(count):
+    """Write `count` distinct resumes into the store; returns their blob paths"""
+    rng = random.Random(17)
+    paths = []
+    for _ in range(count):
+        text = synthetic.resume_text(rng)
+        data = synthetic.docx_bytes(text)
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = blob_path(sha256, "docx")
+        temp_path = os.path.join(RESUME_FOLDER, f".seed-{sha256}")
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        staged = StagedResume(temp_path, path, sha256, len(data))
+        with db_cursor(commit=True) as cursor:
+            store_resume(cursor, staged)
+            cursor.execute(
+                "INSERT IGNORE INTO resume_texts (path, status, content) VALUES (%s, 'done', %s)",
+                (path, text),
+            )
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        paths.append(path)
+    return paths
+
+
+def seed_applications(count, resume_paths):
+    resume_paths = resume_paths or _ids("SELECT path FROM resume_blobs WHERE path LIKE '%.docx'")
+    if not resume_paths:
+        raise SystemExit("applications need resumes; pass --resume-files")
+    user_ids = _ids("SELECT id FROM users WHERE email LIKE 'bench\\_user\\_%'")
+    job_ids = _ids(
+        """SELECT j.id FROM jobs j JOIN employers e ON j.posted_by = e.id
+           WHERE e.organization_email LIKE 'bench\\_employer\\_%'"""
+    )
+    if not user_ids or not job_ids:
+        raise SystemExit("seed users and jobs before applications")
+    rng = random.Random(19)
+    # popular jobs get most applications, like real listings
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(job_ids))]
+    rng.shuffle(weights)
+
+    def rows():
+        for _ in range(count):
+            path = rng.choice(resume_paths)
+            sha256 = path.rsplit("/", 1)[-1].split(".", 1)[0]
+            yield (rng.choice(user_ids), rng.choices(job_ids, weights)[0], path, sha256)
+
+    for chunk in _batches(rows()):
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                """INSERT IGNORE INTO applications (user_id, job_id, resume_path, resume_sha256)
+                   VALUES (%s, %s, %s, %s)""",
+                chunk,
+            )
+    reconcile_application_counts()
+
+
+def cleanup():
+    with db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """SELECT DISTINCT a.resume_path FROM applications a
+               JOIN users u ON a.user_id = u.id WHERE u.email LIKE 'bench\\_user\\_%'"""
+        )
+        paths = [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM employers WHERE organization_email LIKE 'bench\\_employer\\_%'")
+        cursor.execute("DELETE FROM users WHERE email LIKE 'bench\\_user\\_%'")
+        cursor.execute(
+            """SELECT b.path FROM resume_blobs b
+               LEFT JOIN applications a ON a.resume_path = b.path
+               WHERE a.id IS NULL AND b.path LIKE '%.docx'"""
+        )
+        paths += [row[0] for row in cursor.fetchall()]
+    removed = release_resumes(paths)
+    reconcile_application_counts()
+    reconcile_job_facets()
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--employers", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--applications", type=int, default=200_000)
+    parser.add_argument("--resume-files", type=int, default=2_000)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(f"removed seeded accounts and {cleanup()} resume file(s)")
+        return
+
+    resume_paths = []
+    steps = [
+        ("accounts", args.users or args.employers, lambda: seed_accounts(args.users, args.employers)),
+        ("jobs", args.jobs, lambda: seed_jobs(args.jobs)),
+        ("resumes", args.resume_files, lambda: resume_paths.extend(seed_resumes(args.resume_files))),
+        ("applications", args.applications, lambda: seed_applications(args.applications, resume_paths)),
+    ]
+    for name, count, step in steps:
+        if not count:
+            continue
+        start = time.perf_counter()
+        step()
+        print(f"{name:<13} {time.perf_counter() - start:7.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Synthetic data used by the benchmark scripts."""
+import io
+import random
+import zipfile
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+TITLES = [
+    "Software Engineer", "Backend Developer", "Frontend Developer", "Data Analyst",
+    "Data Scientist", "DevOps Engineer", "Product Manager", "QA Engineer",
+    "Mobile Developer", "UI Designer", "Business Analyst", "Sales Executive",
+    "HR Manager", "Marketing Associate", "Python Developer", "Java Developer",
+    "Cloud Architect", "Support Engineer", "Content Writer", "Accountant",
+]
+SENIORITY = ["", "Junior ", "Senior ", "Lead ", "Principal "]
+COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises",
+    "Cyberdyne", "Soylent", "Tyrell", "Wonka", "Pied Piper", "Vandelay", "Massive Dynamic",
+]
+LOCATIONS = [
+    "Bengaluru", "Hyderabad", "Chennai", "Pune", "Mumbai", "Delhi", "Noida",
+    "Gurugram", "Kolkata", "Ahmedabad", "Kochi", "Remote",
+]
+JOB_TYPES = ["Full-Time", "Part-Time", "Internship", "Remote"]
+
+
+def jobs(count, employers=1000, seed=42):
+    """Yield `count` job dicts shaped like rows of the jobs table"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    for i in range(1, count + 1):
+        company = f"{rng.choice(COMPANIES)} {rng.randint(1, 500)}"
+        yield {
+            "id": i,
+            "title": rng.choice(SENIORITY) + rng.choice(TITLES),
+            "company": company,
+            "location": rng.choice(LOCATIONS),
+            "description": "",
+            "posted_by": rng.randint(1, employers),
+            "created_at": start + timedelta(seconds=i * 30),
+            "experience": f"{rng.randint(0, 10)} years",
+            "salary": rng.randint(4, 80) / 2,  # LPA
+            "job_type": rng.choice(JOB_TYPES),
+            "deadline": None,
+        }
+
+
+SKILLS = [
+    "python", "django", "flask", "java", "spring", "kotlin", "javascript", "react",
+    "angular", "node", "sql", "mysql", "postgresql", "mongodb", "aws", "azure",
+    "docker", "kubernetes", "terraform", "linux", "excel", "tableau", "pandas",
+    "spark", "hadoop", "selenium", "figma", "photoshop", "salesforce", "sap",
+]
+FILLER = (
+    "experienced professional responsible for delivering projects working with "
+    "cross functional teams improving processes and mentoring colleagues"
+).split()
+
+
+def resume_text(rng, words=300):
+    """A plain-text resume body of roughly `words` words"""
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    body = [rng.choice(skills) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(words)]
+    return f"{rng.choice(TITLES)} skills: {' '.join(skills)}. " + " ".join(body)
+
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera", "Rohan",
+    "Saanvi", "Arjun", "Priya", "Rahul", "Sneha", "Vikram", "Neha", "Karthik", "Pooja",
+]
+LAST_NAMES = [
+    "Sharma", "Iyer", "Reddy", "Nair", "Patel", "Gupta", "Rao", "Singh", "Menon",
+    "Das", "Kulkarni", "Joshi", "Verma", "Pillai", "Banerjee", "Mehta",
+]
+
+# every seeded account logs in with this password
+PASSWORD = "Bench1234"
+
+
+def users(count):
+    """Yield `count` job seeker rows (without password) with unique email and mobile"""
+    rng = random.Random(11)
+    for i in range(count):
+        yield {
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"bench_user_{i}@example.com",
+            "mobile": f"7{i:09d}",
+        }
+
+
+def employers(count):
+    """Yield `count` employer rows (without password) with unique email and mobile"""
+    rng = random.Random(13)
+    for i in range(count):
+        yield {
+            "employer_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "organization_name": f"{rng.choice(COMPANIES)} {i}",
+            "organization_email": f"bench_employer_{i}@example.com",
+            "mobile": f"6{i:09d}",
+        }
+
+
+def docx_bytes(text):
+    """A minimal .docx holding `text`, byte-for-byte reproducible"""
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body><w:p><w:r><w:t>{escape(text)}</w:t></w:r></w:p></w:body></w:document>"
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr(zipfile.ZipInfo("word/document.xml", (2024, 1, 1, 0, 0, 0)), document)
+    return buf.getvalue()
+
+
+def typed_queries(rng, text, debounce=0.3, mean_keystroke_gap=0.15):
+    """
+    Queries a debounced search box sends while `text` is typed: a request
+    fires whenever the pause before the next keystroke exceeds `debounce`
+    seconds, and once more for the full text.
+    """
+    sent = []
+    for n in range(1, len(text)):
+        if rng.expovariate(1 / mean_keystroke_gap) > debounce and text[:n].strip():
+            sent.append(text[:n].strip())
+    sent.append(text.strip())
+    return list(dict.fromkeys(sent))
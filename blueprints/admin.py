@@ -1,15 +1,36 @@
-from flask import Blueprint, request, session, jsonify, send_from_directory
+from flask import Blueprint, request, session, jsonify, Response
 from config import (
     db_cursor,
-    PROFILE_PIC_FOLDER,
-    RESUME_FOLDER,
+    connection_pool,
+    sql_profiler,
     allowed_image_file,
     MAX_FILE_SIZE,
-    LOGO_FOLDER,
+    BULK_JOBS_MAX_ROWS,
 )
+from search import search_job_ids, id_filter, order_by_ids, index_job, unindex_job
+from facets import JOB_TYPES, experience_years, count_jobs
+from pagination import page_args, keyset_clause, next_cursor
+from cache import cache, invalidate_jobs, invalidate_job_lists
+from resume_upload import resume_key, release_resumes
+from resume_text import search_applicants
+from employers import (
+    get_employer_profiles,
+    attach_employers,
+    invalidate_employer,
+    profile_cache_stats,
+    UNKNOWN_COMPANY,
+)
+from images import logo_url, image_url, schedule_thumbnails, remove_image
+from .tasks import task_owner
+from file_serving import send_stored
+from exports import stream_applicants_zip
+from ratelimit import ENDPOINT_CLASSES
+from storage import storage
 from werkzeug.utils import secure_filename
 from datetime import datetime
 from functools import wraps
+import csv
+import io
 import os
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
@@ -30,77 +51,189 @@ def admin_required(fn):
         return fn(*args, **kwargs)
     return decorated
 
-def _add_job(title, experience, salary, location, description, job_type, deadline):
-    """Insert a job, reusing employer's saved logo."""
-    with db_cursor(commit=True, dictionary=True) as cursor:
+JOB_FIELDS = ["title", "experience", "salary", "location", "description", "job_type", "deadline"]
+JOB_FIELD_LENGTHS = {"title": 150, "location": 150, "experience": 50}  # column sizes
+BULK_INSERT_BATCH = 500
+
+INSERT_JOB_SQL = """INSERT INTO jobs
+                    (title, company, experience, experience_years, salary, location, description,
+                     job_type, deadline, posted_by)
+                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
+
+def _validate_job(data):
+    """
+    Check one submitted job (form or a bulk row) and normalize its fields.
+
+    Returns:
+        (job, errors) – job is a dict of JOB_FIELDS, errors a list of messages
+    """
+    job = {
+        field: "" if data.get(field) is None else str(data.get(field)).strip()
+        for field in JOB_FIELDS
+    }
+    job["job_type"] = job["job_type"] or "Full-Time"
+    job["deadline"] = job["deadline"] or None
+
+    if not all(job[field] for field in ("title", "experience", "salary", "location", "job_type")):
+        return job, ["Missing required fields"]
+    errors = []
+    try:
+        float(job["salary"])
+    except ValueError:
+        errors.append("Salary must be a number")
+    if job["deadline"]:
+        try:
+            datetime.strptime(job["deadline"], "%Y-%m-%d")
+        except ValueError:
+            errors.append("Deadline must be YYYY-MM-DD")
+    if job["job_type"] not in JOB_TYPES:
+        errors.append(f"Job type must be one of {', '.join(JOB_TYPES)}")
+    for field, length in JOB_FIELD_LENGTHS.items():
+        if len(job[field]) > length:
+            errors.append(f"{field.capitalize()} is longer than {length} characters")
+    return job, errors
+
+def _bulk_rows():
+    """
+    Rows of a bulk post: a JSON array (or {"jobs": [...]}) or an uploaded
+    CSV file with a header row of JOB_FIELDS.
+
+    Returns:
+        (rows, error_message)
+    """
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get("jobs")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            return None, "Expected a JSON array of job objects"
+        return data, None
+    file = request.files.get("file")
+    if not file or file.filename == "":
+        return None, "Send a JSON array or a CSV file"
+    try:
+        text = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
+        return list(csv.DictReader(text)), None
+    except (UnicodeDecodeError, csv.Error) as e:
+        return None, f"Unreadable CSV: {e}"
+
+def _add_jobs(jobs):
+    """
+    Insert many validated jobs for the logged-in employer in one transaction.
+
+    The employer profile is read once and rows go in executemany batches of
+    BULK_INSERT_BATCH (one multi-row INSERT each). Returns the new job ids.
+    """
+    employer_id = session["user"]["id"]
+    profile = get_employer_profiles([employer_id]).get(employer_id)
+    company_name = profile["company"] if profile else UNKNOWN_COMPANY
+
+    id_ranges = []  # (first, last) id of each batch
+    with db_cursor(commit=True) as cursor:
+        for start in range(0, len(jobs), BULK_INSERT_BATCH):
+            cursor.executemany(
+                INSERT_JOB_SQL,
+                [
+                    (job["title"], company_name, job["experience"], experience_years(job["experience"]),
+                     job["salary"], job["location"], job["description"], job["job_type"], job["deadline"],
+                     employer_id)
+                    for job in jobs[start:start + BULK_INSERT_BATCH]
+                ],
+            )
+            # lastrowid is the first id of the multi-row INSERT; InnoDB gives a
+            # simple INSERT consecutive ids, so the batch is exactly this range
+            id_ranges.append((cursor.lastrowid, cursor.lastrowid + cursor.rowcount - 1))
+        count_jobs(cursor, jobs)
+        # only this request's rows: the same employer may be posting concurrently
         cursor.execute(
-            "SELECT organization_name, logo_filename FROM employers WHERE id=%s",
-            (session["user"]["id"],),
+            f"""SELECT id, title, company, location, posted_by, created_at
+                FROM jobs WHERE posted_by=%s AND ({" OR ".join(["id BETWEEN %s AND %s"] * len(id_ranges))})
+                ORDER BY id""",
+            (employer_id, *(bound for id_range in id_ranges for bound in id_range)),
         )
-        employer = cursor.fetchone()
-        company_name = employer["organization_name"] if employer else "Unknown Company"
-        logo_filename = employer.get("logo_filename") if employer else None
+        inserted = cursor.fetchall()
 
+    for row in inserted:
+        index_job(dict(zip(("id", "title", "company", "location", "posted_by", "created_at"), row)))
+    return [row[0] for row in inserted]
+
+def _add_job(title, experience, salary, location, description, job_type, deadline):
+    """Insert a job; company name and logo come from the employer profile."""
+    employer_id = session["user"]["id"]
+    profile = get_employer_profiles([employer_id]).get(employer_id)
+    company_name = profile["company"] if profile else UNKNOWN_COMPANY
+
+    with db_cursor(commit=True) as cursor:
+        # jobs.company is kept only for the search indexes (ft_jobs_search)
         cursor.execute(
-            """INSERT INTO jobs 
-               (title, company, experience, salary, location, description, job_type, deadline, posted_by, logo_filename) 
-               VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+            INSERT_JOB_SQL,
             (
                 title,
                 company_name,
                 experience,
+                experience_years(experience),
                 salary,
                 location,
                 description,
                 job_type,
                 deadline,
-                session["user"]["id"],
-                logo_filename,
+                employer_id,
             ),
         )
-
-def _list_jobs(q="", page=1, per_page=6):
+        job_id = cursor.lastrowid
+        count_jobs(cursor, [{"job_type": job_type, "location": location, "salary": salary}])
+
+    index_job({
+        "id": job_id,
+        "title": title,
+        "company": company_name,
+        "location": location,
+        "posted_by": employer_id,
+        "created_at": datetime.now(),
+    })
+    return job_id
+
+def _list_jobs(q="", page=1, per_page=6, after=None):
     offset = (page - 1) * per_page
     with db_cursor(dictionary=True) as cursor:
         if q:
+            ids = search_job_ids(
+                cursor, q, per_page + 1, offset, posted_by=session["user"]["id"]
+            )
+            if not ids:
+                return [], False
+            clause, params = id_filter(ids)
             cursor.execute(
-                """SELECT j.*, 
-                          (SELECT COUNT(*) FROM applications a WHERE a.job_id=j.id) AS applications_count 
+                f"""SELECT j.*
                    FROM jobs j 
-                   WHERE j.posted_by=%s AND (j.title LIKE %s OR j.company LIKE %s OR j.location LIKE %s) 
-                   ORDER BY j.created_at DESC
-                   LIMIT %s OFFSET %s""",
-                (
-                    session["user"]["id"],
-                    f"%{q}%",
-                    f"%{q}%",
-                    f"%{q}%",
-                    per_page + 1,
-                    offset,
-                ),
+                   WHERE {clause}""",
+                tuple(params),
             )
+            jobs = order_by_ids(cursor.fetchall(), ids)
         else:
+            where = "j.posted_by=%s"
+            params = [session["user"]["id"]]
+            if after:
+                clause, after_params = keyset_clause("j.created_at", "j.id", after)
+                where += f" AND {clause}"
+                params.extend(after_params)
+                offset = 0
             cursor.execute(
-                """SELECT j.*, 
-                          (SELECT COUNT(*) FROM applications a WHERE a.job_id=j.id) AS applications_count 
+                f"""SELECT j.*
                    FROM jobs j 
-                   WHERE j.posted_by=%s 
-                   ORDER BY j.created_at DESC
+                   WHERE {where} 
+                   ORDER BY j.created_at DESC, j.id DESC
                    LIMIT %s OFFSET %s""",
-                (session["user"]["id"], per_page + 1, offset),
+                tuple(params + [per_page + 1, offset]),
             )
-        jobs = cursor.fetchall()
+            jobs = cursor.fetchall()
         has_next = len(jobs) > per_page
         jobs = jobs[:per_page]
 
-        for job in jobs:
-            if job.get("logo_filename"):
-                job["logo_url"] = f"/uploads/logos/{job['logo_filename']}"
-            else:
-                job["logo_url"] = "/static/images/default-logo.png"
-        return jobs, has_next
+    attach_employers(jobs)
+    return jobs, has_next
 
-def _get_applications(job_id, page=1, per_page=10):
+def _get_applications(job_id, page=1, per_page=10, after=None, q=""):
     offset = (page - 1) * per_page
     with db_cursor(dictionary=True) as cursor:
         cursor.execute(
@@ -118,23 +251,35 @@ def _get_applications(job_id, page=1, per_page=10):
         job = cursor.fetchone()
         if not job:
             return None, None, None
+        job["logo_url"] = logo_url(job.get("logo_filename"))
 
-        cursor.execute(
-            """SELECT a.id AS application_id,
-                      u.id AS user_id,
-                      u.name,
-                      u.email,
-                      u.mobile,
-                      a.applied_at,
-                      a.resume_path
-               FROM applications a
-               JOIN users u ON a.user_id = u.id
-               WHERE a.job_id=%s
-               ORDER BY a.applied_at DESC
-               LIMIT %s OFFSET %s""",
-            (job_id, per_page + 1, offset),
-        )
-        applicants = cursor.fetchall()
+        if q:
+            # keyword search over extracted resume text, best matches first
+            applicants = search_applicants(cursor, job_id, q, per_page + 1, offset)
+        else:
+            where = "a.job_id=%s"
+            params = [job_id]
+            if after:
+                clause, after_params = keyset_clause("a.applied_at", "a.id", after)
+                where += f" AND {clause}"
+                params.extend(after_params)
+                offset = 0
+            cursor.execute(
+                f"""SELECT a.id AS application_id,
+                          u.id AS user_id,
+                          u.name,
+                          u.email,
+                          u.mobile,
+                          a.applied_at,
+                          a.resume_path
+                   FROM applications a
+                   JOIN users u ON a.user_id = u.id
+                   WHERE {where}
+                   ORDER BY a.applied_at DESC, a.id DESC
+                   LIMIT %s OFFSET %s""",
+                tuple(params + [per_page + 1, offset]),
+            )
+            applicants = cursor.fetchall()
         has_next = len(applicants) > per_page
         applicants = applicants[:per_page]
 
@@ -154,49 +299,66 @@ def _get_applications(job_id, page=1, per_page=10):
 @admin_bp.route("/jobs", methods=["POST"])
 @admin_required
 def api_post_job():
-    data = request.form
-    title = (data.get("title") or "").strip()
-    experience = (data.get("experience") or "").strip()
-    salary = (data.get("salary") or "").strip()
-    location = (data.get("location") or "").strip()
-    description = (data.get("description") or "").strip()
-    job_type = (data.get("job_type") or "Full-Time").strip()
-    deadline = data.get("deadline")
-
-    if not all([title, experience, salary, location, job_type]):
-        return api_response(False, "Missing required fields"), 400
+    job, errors = _validate_job(request.form)
+    if errors:
+        return api_response(False, errors[0]), 400
 
     try:
-        float(salary)
-    except ValueError:
-        return api_response(False, "Salary must be a number"), 400
+        _add_job(**job)
+        invalidate_job_lists()
+        return api_response(True, "Job posted successfully")
+    except Exception as e:
+        print("[ERROR posting job]", e)
+        return api_response(False, f"Internal error: {e}"), 500
 
-    if deadline:
-        try:
-            datetime.strptime(deadline, "%Y-%m-%d")
-        except ValueError:
-            return api_response(False, "Deadline must be YYYY-MM-DD"), 400
+# Post many jobs at once (JSON array or CSV upload)
+@admin_bp.route("/jobs/bulk", methods=["POST"])
+@admin_required
+def api_post_jobs_bulk():
+    rows, error = _bulk_rows()
+    if error:
+        return api_response(False, error), 400
+    if not rows:
+        return api_response(False, "No jobs to post"), 400
+    if len(rows) > BULK_JOBS_MAX_ROWS:
+        return api_response(False, f"At most {BULK_JOBS_MAX_ROWS} jobs per request"), 400
+
+    jobs, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        job, row_errors = _validate_job(row)
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+        else:
+            jobs.append(job)
+    # all or nothing unless the caller asks to post the valid rows anyway
+    skip_invalid = request.args.get("skip_invalid", "").lower() in ("1", "true", "yes")
+    if errors and (not skip_invalid or not jobs):
+        return api_response(False, f"{len(errors)} invalid row(s), nothing posted", errors=errors), 400
 
     try:
-        _add_job(title, experience, salary, location, description, job_type, deadline)
-        return api_response(True, "Job posted successfully")
+        job_ids = _add_jobs(jobs)
     except Exception as e:
-        print("[ERROR posting job]", e)
+        print("[ERROR bulk posting jobs]", e)
         return api_response(False, f"Internal error: {e}"), 500
+    invalidate_job_lists()
+    return api_response(
+        True, f"{len(job_ids)} job(s) posted", posted=len(job_ids), job_ids=job_ids, errors=errors
+    )
 
 # List jobs
 @admin_bp.route("/jobs", methods=["GET"])
 @admin_required
 def api_list_jobs():
     q = request.args.get("q", "").strip()
-    try:
-        page = int(request.args.get("page", 1))
-    except ValueError:
-        page = 1
-    page = max(1, page)
+    page, after, error = page_args(request.args)
+    if error:
+        return api_response(False, error), 400
     per_page = 6
-    jobs, has_next = _list_jobs(q, page, per_page)
-    return api_response(True, "Jobs fetched", jobs=jobs, page=page, has_next=has_next)
+    jobs, has_next = _list_jobs(q, page, per_page, None if q else after)
+    cursor = None if q else next_cursor(jobs, has_next, "created_at")
+    return api_response(
+        True, "Jobs fetched", jobs=jobs, page=page, has_next=has_next, next_cursor=cursor
+    )
 
 # Delete job
 @admin_bp.route("/jobs/<int:job_id>", methods=["DELETE"])
@@ -204,17 +366,36 @@ def api_list_jobs():
 def api_delete_job(job_id):
     try:
         with db_cursor(commit=True) as cursor:
+            # lock the job first: an apply inserts through this row, so no
+            # application can commit between reading the paths and the cascade
+            cursor.execute(
+                "SELECT job_type, location, salary FROM jobs WHERE id=%s AND posted_by=%s FOR UPDATE",
+                (job_id, session["user"]["id"]),
+            )
+            row = cursor.fetchone()
+            # resumes of the cascaded applications may become unreferenced
+            resume_paths = []
+            if row:
+                cursor.execute(
+                    "SELECT resume_path FROM applications WHERE job_id=%s FOR UPDATE", (job_id,)
+                )
+                resume_paths = [path for (path,) in cursor.fetchall()]
             cursor.execute(
                 "DELETE FROM jobs WHERE id=%s AND posted_by=%s",
                 (job_id, session["user"]["id"]),
             )
             deleted = cursor.rowcount
+            if deleted:
+                count_jobs(cursor, [dict(zip(("job_type", "location", "salary"), row))], -1)
     except Exception as e:
         return api_response(
             False, f"Cannot delete job (may have applications): {e}"
         ), 400
 
     if deleted:
+        unindex_job(job_id)
+        invalidate_jobs(job_id)
+        release_resumes(resume_paths)
         return api_response(True, "Job deleted successfully")
     return api_response(False, "Job not found or not allowed"), 404
 
@@ -222,14 +403,13 @@ def api_delete_job(job_id):
 @admin_bp.route("/applications/<int:job_id>", methods=["GET"])
 @admin_required
 def api_applications(job_id):
-    try:
-        page = int(request.args.get("page", 1))
-    except ValueError:
-        page = 1
-    page = max(1, page)
+    page, after, error = page_args(request.args)
+    if error:
+        return api_response(False, error), 400
     per_page = 10
+    q = request.args.get("q", "").strip()
 
-    job, applicants, has_next = _get_applications(job_id, page, per_page)
+    job, applicants, has_next = _get_applications(job_id, page, per_page, None if q else after, q)
     if not job:
         return api_response(False, "Job not found or not allowed"), 404
     return api_response(
@@ -239,17 +419,45 @@ def api_applications(job_id):
         applicants=applicants,
         page=page,
         has_next=has_next,
+        next_cursor=None if q else next_cursor(applicants, has_next, "applied_at", "application_id"),
+    )
+
+# Export all applicants of a job: ZIP of their resumes plus applicants.csv
+@admin_bp.route("/applications/<int:job_id>/export", methods=["GET"])
+@admin_required
+def api_export_applications(job_id):
+    with db_cursor() as cursor:
+        cursor.execute(
+            "SELECT title FROM jobs WHERE id=%s AND posted_by=%s", (job_id, session["user"]["id"])
+        )
+        job = cursor.fetchone()
+    if not job:
+        return api_response(False, "Job not found"), 404
+
+    # the slot is held until the last byte is sent, not just for this function
+    gate = ENDPOINT_CLASSES["export"]
+    gate.__enter__()
+    response = Response(
+        stream_applicants_zip(job_id),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{secure_filename(job[0]) or "job"}_{job_id}_applicants.zip"',
+            "Cache-Control": "private, no-store",
+            "X-Accel-Buffering": "no",  # let nginx pass chunks through as they are made
+        },
     )
+    response.call_on_close(gate.__exit__)
+    return response
 
 # Download resume
 @admin_bp.route("/resumes/<filename>", methods=["GET"])
 @admin_required
 def api_download_resume(filename):
     safe_name = secure_filename(filename)
-    file_path = os.path.join(RESUME_FOLDER, safe_name)
-    if not os.path.exists(file_path):
+    key = resume_key(safe_name)
+    if not key or not storage.exists(key):
         return api_response(False, "File not found"), 404
-    return send_from_directory(RESUME_FOLDER, safe_name, as_attachment=True)
+    return send_stored(key, as_attachment=True)
 
 # Upload profile picture
 @admin_bp.route("/profile/upload", methods=["POST"])
@@ -269,38 +477,58 @@ def api_upload_profile():
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     ext = file.filename.rsplit(".", 1)[-1].lower()
     filename = secure_filename(f"admin{session['user']['id']}_{timestamp}.{ext}")
-    filepath = os.path.join(PROFILE_PIC_FOLDER, filename)
-    file.save(filepath)
+    storage.save(f"profile_pics/{filename}", file.stream)
 
-    with db_cursor(commit=True) as cursor:
-        cursor.execute(
-            "UPDATE users SET profile_pic=%s WHERE id=%s",
-            (filename, session["user"]["id"]),
-        )
+    try:
+        with db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "SELECT profile_pic FROM employers WHERE id=%s FOR UPDATE", (session["user"]["id"],)
+            )
+            row = cursor.fetchone()
+            old_pic = row[0] if row else None
+            cursor.execute(
+                "UPDATE employers SET profile_pic=%s WHERE id=%s",
+                (filename, session["user"]["id"]),
+            )
+    except Exception as e:
+        storage.delete(f"profile_pics/{filename}")
+        print(f"[DB ERROR] {e}")
+        return api_response(False, "Internal server error"), 500
+    if old_pic and old_pic != filename:
+        remove_image("profile_pics", old_pic)
 
+    task_id = schedule_thumbnails("profile_pics", filename, owner=task_owner())
     session["user"]["profile_pic"] = filename
-    return api_response(True, "Profile updated", filename=filename)
+    session["user"]["profile_pic_url"] = image_url("profile_pics", filename, 128)
+    session.modified = True  # nested change, not tracked by the session dict
+    return api_response(
+        True, "Profile updated", filename=filename,
+        url=session["user"]["profile_pic_url"], task_id=task_id,
+    )
 
 # Remove profile picture
 @admin_bp.route("/profile/remove", methods=["POST"])
 @admin_required
 def api_remove_profile():
-    old_pic = session["user"].get("profile_pic")
-    if old_pic:
-        filepath = os.path.join(PROFILE_PIC_FOLDER, old_pic)
-        if os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except Exception as e:
-                print(f"Could not delete old admin profile pic: {e}")
-
     with db_cursor(commit=True) as cursor:
         cursor.execute(
-            "UPDATE users SET profile_pic=NULL WHERE id=%s",
+            "SELECT profile_pic FROM employers WHERE id=%s FOR UPDATE", (session["user"]["id"],)
+        )
+        row = cursor.fetchone()
+        old_pic = row[0] if row else None
+        cursor.execute(
+            "UPDATE employers SET profile_pic=NULL WHERE id=%s",
             (session["user"]["id"],),
         )
+    if old_pic:
+        try:
+            remove_image("profile_pics", old_pic)
+        except Exception as e:
+            print(f"Could not delete old admin profile pic: {e}")
 
     session["user"].pop("profile_pic", None)
+    session["user"].pop("profile_pic_url", None)
+    session.modified = True
     return api_response(True, "Profile removed")
 
 # Upload employer logo (only once)
@@ -314,17 +542,52 @@ def upload_logo():
     if not allowed_image_file(file.filename):
         return api_response(False, "Invalid file type"), 400
 
+    # timestamped so every logo version has its own (immutably cacheable) URL
     ext = file.filename.rsplit(".", 1)[-1].lower()
-    filename = f"employer{session['user']['id']}.{ext}"
-    filepath = os.path.join(LOGO_FOLDER, filename)
-    os.makedirs(LOGO_FOLDER, exist_ok=True)
-    file.save(filepath)
+    filename = f"employer{session['user']['id']}_{int(datetime.now().timestamp())}.{ext}"
+    storage.save(f"logos/{filename}", file.stream)
 
     with db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "SELECT logo_filename FROM employers WHERE id=%s FOR UPDATE", (session["user"]["id"],)
+        )
+        row = cursor.fetchone()
+        old_logo = row[0] if row else None
         cursor.execute(
             "UPDATE employers SET logo_filename=%s WHERE id=%s",
             (filename, session["user"]["id"]),
         )
+    invalidate_employer(session["user"]["id"])
+    if old_logo and old_logo != filename:
+        remove_image("logos", old_logo)
+    task_id = schedule_thumbnails("logos", filename, owner=task_owner())
     session["user"]["logo_filename"] = filename
+    session.modified = True
     
-    return api_response(True, "Logo uploaded", logo_url=f"/uploads/logos/{filename}")
+    return api_response(True, "Logo uploaded", logo_url=logo_url(filename), task_id=task_id)
+
+# Cache statistics (hit/miss/eviction counters of this worker)
+@admin_bp.route("/cache/stats", methods=["GET"])
+@admin_required
+def api_cache_stats():
+    return api_response(
+        True, "Cache stats", stats=cache.stats(), employer_profiles=profile_cache_stats()
+    )
+
+# Connection pool statistics of this worker
+@admin_bp.route("/pool/stats", methods=["GET"])
+@admin_required
+def api_pool_stats():
+    return api_response(True, "Pool stats", stats=connection_pool.stats())
+
+# Per-route SQL statistics of this worker (SQL_PROFILING=1)
+@admin_bp.route("/sql/stats", methods=["GET"])
+@admin_required
+def api_sql_stats():
+    return api_response(True, "SQL stats", stats=sql_profiler.stats())
+
+# Recent slow queries with their EXPLAIN plans
+@admin_bp.route("/sql/slow", methods=["GET"])
+@admin_required
+def api_sql_slow():
+    return api_response(True, "Slow queries", queries=sql_profiler.slow_queries())
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, session, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from config import db_cursor
+from config import db_cursor, RATE_LIMIT_LOGIN_IP, RATE_LIMIT_LOGIN_IDENTIFIER, RATE_LIMIT_REGISTER_IP
+from credentials import hash_password, verify_password, upgrade_password_hash, HashingBusy
+from images import image_url
+from ratelimit import rate_limit, admission, login_identifier
 import re
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api")
@@ -23,6 +25,18 @@ def validate_mobile(mobile):
     return mobile.isdigit() and len(mobile) == 10
 
 
+def identifier_column(identifier, email_column="email"):
+    """
+    Unique column a login identifier is looked up in: `email_column` for an
+    email, "mobile" for a 10-digit number, None if it is neither.
+    """
+    if validate_email(identifier):
+        return email_column
+    if validate_mobile(identifier):
+        return "mobile"
+    return None
+
+
 def validate_password(password):
     # Password policy: min 8 chars, 1 uppercase, 1 lowercase, 1 digit
     return (
@@ -36,6 +50,8 @@ def validate_password(password):
 # -------------------- USER REGISTER ----------------------
 # =========================================================
 @auth_bp.route("/register", methods=["POST"])
+@rate_limit("register", RATE_LIMIT_REGISTER_IP)
+@admission("auth")
 def api_register():
     if not request.is_json:
         return api_response(False, "Request must be JSON"), 400
@@ -62,22 +78,27 @@ def api_register():
             "with 1 uppercase, 1 lowercase, and 1 digit"
         ), 400
 
-    hashed_pw = generate_password_hash(password, method="pbkdf2:sha256")
-
     try:
         with db_cursor() as cursor:
+            # one unique-index probe per column instead of an OR (index merge)
             cursor.execute(
-                "SELECT id FROM users WHERE email=%s OR mobile=%s LIMIT 1",
+                """SELECT id FROM users WHERE email=%s
+                   UNION ALL
+                   SELECT id FROM users WHERE mobile=%s
+                   LIMIT 1""",
                 (email, mobile),
             )
             if cursor.fetchone():
                 return api_response(False, "Email or Mobile already registered"), 400
 
+        hashed_pw = hash_password(password)
         with db_cursor(commit=True) as cursor:
             cursor.execute(
                 "INSERT INTO users (name, email, mobile, password) VALUES (%s, %s, %s, %s)",
                 (name, email, mobile, hashed_pw),
             )
+    except HashingBusy:
+        raise  # answered with 503 by the app
     except Exception as e:
         return api_response(False, f"Database error: {str(e)}"), 500
 
@@ -87,6 +108,8 @@ def api_register():
 # -------------------- EMPLOYER REGISTER ------------------
 # =========================================================
 @auth_bp.route("/employer/register", methods=["POST"])
+@rate_limit("register", RATE_LIMIT_REGISTER_IP)
+@admission("auth")
 def api_employer_register():
     if not request.is_json:
         return api_response(False, "Request must be JSON"), 400
@@ -110,23 +133,33 @@ def api_employer_register():
     if not validate_password(password):
         return api_response(False, "Weak password"), 400
 
-    hashed_pw = generate_password_hash(password, method="pbkdf2:sha256")
-
     try:
         with db_cursor() as cursor:
-            cursor.execute(
-                "SELECT id FROM employers WHERE organization_email=%s OR mobile=%s LIMIT 1",
-                (organization_email, mobile),
-            )
+            if mobile is None:
+                cursor.execute(
+                    "SELECT id FROM employers WHERE organization_email=%s LIMIT 1",
+                    (organization_email,),
+                )
+            else:
+                cursor.execute(
+                    """SELECT id FROM employers WHERE organization_email=%s
+                       UNION ALL
+                       SELECT id FROM employers WHERE mobile=%s
+                       LIMIT 1""",
+                    (organization_email, mobile),
+                )
             if cursor.fetchone():
                 return api_response(False, "Email or Mobile already registered"), 400
 
+        hashed_pw = hash_password(password)
         with db_cursor(commit=True) as cursor:
             cursor.execute(
                 """INSERT INTO employers (employer_name, organization_name, organization_email, mobile, password)
                    VALUES (%s, %s, %s, %s, %s)""",
                 (employer_name, organization_name, organization_email, mobile, hashed_pw),
             )
+    except HashingBusy:
+        raise  # answered with 503 by the app
     except Exception as e:
         return api_response(False, f"Database error: {str(e)}"), 500
 
@@ -136,6 +169,9 @@ def api_employer_register():
 # -------------------- USER LOGIN -------------------------
 # =========================================================
 @auth_bp.route("/login", methods=["POST"])
+@rate_limit("login", RATE_LIMIT_LOGIN_IP)
+@rate_limit("login-id", RATE_LIMIT_LOGIN_IDENTIFIER, login_identifier)
+@admission("auth")
 def api_login():
     if not request.is_json:
         return api_response(False, "Request must be JSON"), 400
@@ -147,17 +183,25 @@ def api_login():
     if not identifier or not password:
         return api_response(False, "Missing identifier or password"), 400
 
+    column = identifier_column(str(identifier))
+    if column is None:
+        return api_response(False, "Invalid credentials"), 401
+
     try:
         with db_cursor(dictionary=True) as cursor:
             cursor.execute(
-                "SELECT * FROM users WHERE (email=%s OR mobile=%s)",
-                (identifier, identifier),
+                f"""SELECT id, name, email, mobile, password, profile_pic
+                    FROM users WHERE {column}=%s""",
+                (identifier,),
             )
             user = cursor.fetchone()
     except Exception:
         return api_response(False, "Database error"), 500
 
-    if user and check_password_hash(user["password"], password):
+    valid, rehash = verify_password(user["password"], password) if user else (False, False)
+    if valid:
+        if rehash:
+            upgrade_password_hash("users", user["id"], user["password"], password)
         session["user"] = {
             "id": user["id"],
             "name": user["name"],
@@ -165,6 +209,9 @@ def api_login():
             "mobile": user["mobile"],
             "role": "User"
         }
+        if user.get("profile_pic"):
+            session["user"]["profile_pic"] = user["profile_pic"]
+            session["user"]["profile_pic_url"] = image_url("profile_pics", user["profile_pic"], 128)
         return api_response(True, "Login successful", user=session["user"])
     else:
         return api_response(False, "Invalid credentials"), 401
@@ -173,6 +220,9 @@ def api_login():
 # -------------------- EMPLOYER LOGIN ---------------------
 # =========================================================
 @auth_bp.route("/employer/login", methods=["POST"])
+@rate_limit("login", RATE_LIMIT_LOGIN_IP)
+@rate_limit("employer-login-id", RATE_LIMIT_LOGIN_IDENTIFIER, login_identifier)
+@admission("auth")
 def api_employer_login():
     if not request.is_json:
         return api_response(False, "Request must be JSON"), 400
@@ -184,17 +234,26 @@ def api_employer_login():
     if not identifier or not password:
         return api_response(False, "Missing identifier or password"), 400
 
+    column = identifier_column(str(identifier), email_column="organization_email")
+    if column is None:
+        return api_response(False, "Invalid credentials"), 401
+
     try:
         with db_cursor(dictionary=True) as cursor:
             cursor.execute(
-                "SELECT * FROM employers WHERE (organization_email=%s OR mobile=%s)",
-                (identifier, identifier),
+                f"""SELECT id, employer_name, organization_name, organization_email,
+                           mobile, password, logo_filename, profile_pic
+                    FROM employers WHERE {column}=%s""",
+                (identifier,),
             )
             employer = cursor.fetchone()
     except Exception:
         return api_response(False, "Database error"), 500
 
-    if employer and check_password_hash(employer["password"], password):
+    valid, rehash = verify_password(employer["password"], password) if employer else (False, False)
+    if valid:
+        if rehash:
+            upgrade_password_hash("employers", employer["id"], employer["password"], password)
         session["user"] = {
             "id": employer["id"],
             "employer_name": employer["employer_name"],
@@ -204,6 +263,9 @@ def api_employer_login():
             "role": "Employer",  
             "logo_filename": employer.get("logo_filename"), 
         }
+        if employer.get("profile_pic"):
+            session["user"]["profile_pic"] = employer["profile_pic"]
+            session["user"]["profile_pic_url"] = image_url("profile_pics", employer["profile_pic"], 128)
         return api_response(True, "Login successful", user=session["user"])  
     else:
         return api_response(False, "Invalid credentials"), 401
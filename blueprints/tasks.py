@@ -0,0 +1,28 @@
+from flask import Blueprint, session, jsonify
+from tasks import get_task
+
+tasks_bp = Blueprint("tasks", __name__, url_prefix="/api/tasks")
+
+# -------------------- HELPERS --------------------
+def api_response(success, message, **kwargs):
+    data = {"success": success, "message": message}
+    if kwargs:
+        data.update(kwargs)
+    return jsonify(data)
+
+def task_owner():
+    """Owner tag stored with tasks queued by the logged-in user"""
+    user = session.get("user")
+    return f"{user['role']}:{user['id']}" if user else None
+
+# -------------------- TASK STATUS --------------------
+@tasks_bp.route("/<task_id>", methods=["GET"])
+def api_task_status(task_id):
+    owner = task_owner()
+    if not owner:
+        return api_response(False, "Unauthorized"), 403
+    task = get_task(task_id)
+    if not task or task["owner"] != owner:
+        return api_response(False, "Task not found"), 404
+    task.pop("owner")
+    return api_response(True, "Task status", task=task)
@@ -1,9 +1,19 @@
 from flask import Blueprint, request, session, jsonify
-from config import db_cursor, PROFILE_PIC_FOLDER, allowed_image_file, allowed_resume_file, LOGO_FOLDER
-from resume_upload import save_resume
+from config import db_cursor, allowed_image_file, allowed_resume_file, RATE_LIMIT_APPLY_USER
+from resume_upload import save_resume, store_resume, discard_resume, release_resumes
+from resume_text import schedule_extraction
+from .tasks import task_owner
+from employers import attach_employers
+from images import image_url, schedule_thumbnails, remove_image
+from storage import storage
+from search import search_job_ids, id_filter, order_by_ids
+from facets import parse_filters, filters_key, filter_clause, get_facets
+from pagination import page_args, keyset_clause, next_cursor
+from cache import get_or_load, job_key, job_list_key
+from ratelimit import rate_limit, admission, session_user
 from functools import wraps
 from werkzeug.utils import secure_filename
-import os, time
+import time
 
 user_bp = Blueprint("user", __name__, url_prefix="/api")
 
@@ -27,55 +37,96 @@ def login_required(role="User"):
     return wrapper
 
 # ---------- JOB HELPERS ----------------
-def get_jobs(page, per_page, q=""):
-    """Fetch jobs with logo and whether current user applied"""
+def _load_jobs(page, per_page, q="", after=None, filters=None):
+    """Query one page of jobs (shared by all users, no `applied` flag)"""
     offset = (page - 1) * per_page
-    user_id = session["user"]["id"]
+    where, where_params = filter_clause(filters or {})
     with db_cursor(dictionary=True) as cursor:
         base_sql = """
-            SELECT j.id, j.company, j.title, j.location, j.job_type, j.logo_filename,
-                   EXISTS(SELECT 1 FROM applications a WHERE a.job_id = j.id AND a.user_id = %s) AS applied
+            SELECT j.id, j.posted_by, j.title, j.location, j.job_type, j.created_at
             FROM jobs j
         """
-        params = [user_id]
+        params = []
 
         if q:
-            base_sql += " WHERE (j.title LIKE %s OR j.company LIKE %s OR j.location LIKE %s) "
-            params.extend([f"%{q}%", f"%{q}%", f"%{q}%"])
-
-        base_sql += " ORDER BY j.created_at DESC LIMIT %s OFFSET %s"
-        params.extend([per_page + 1, offset])
+            ids = search_job_ids(
+                cursor, q, per_page + 1, offset, where=(where, where_params) if where else None
+            )
+            if not ids:
+                return []
+            clause, id_params = id_filter(ids)
+            base_sql += f" WHERE {clause}"
+            params.extend(id_params)
+        else:
+            conditions = [where] if where else []
+            params.extend(where_params)
+            if after:
+                clause, after_params = keyset_clause("j.created_at", "j.id", after)
+                conditions.append(clause)
+                params.extend(after_params)
+                offset = 0
+            if conditions:
+                base_sql += " WHERE " + " AND ".join(conditions)
+            base_sql += " ORDER BY j.created_at DESC, j.id DESC LIMIT %s OFFSET %s"
+            params.extend([per_page + 1, offset])
 
         cursor.execute(base_sql, tuple(params))
         jobs = cursor.fetchall()
+        if q:
+            jobs = order_by_ids(jobs, ids)
+    return jobs
+
+
+def _applied_job_ids(user_id, job_ids):
+    """Subset of job_ids the user has applied to (point lookups on uq_app_user_job)"""
+    if not job_ids:
+        return set()
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    with db_cursor() as cursor:
+        cursor.execute(
+            f"SELECT job_id FROM applications WHERE user_id=%s AND job_id IN ({placeholders})",
+            (user_id, *job_ids),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def get_jobs(page, per_page, q="", after=None, filters=None):
+    """Fetch jobs with company, logo and whether current user applied.
 
+    `after` is a decoded keyset cursor; when given it replaces the page offset.
+    Searches are relevance ranked and always paginate by page. `filters`
+    come from facets.parse_filters and apply to both.
+    """
+    filters = filters or {}
+    jobs = get_or_load(
+        job_list_key(page, per_page, q, after, filters_key(filters)),
+        lambda: _load_jobs(page, per_page, q, after, filters),
+    )
+    # company/logo are resolved after the cache so logo changes show up at once
+    attach_employers(jobs)
+    applied = _applied_job_ids(session["user"]["id"], [job["id"] for job in jobs])
     for job in jobs:
-        job["logo_url"] = f"/uploads/logos/{job['logo_filename']}" if job.get("logo_filename") else "/static/images/default-logo.png"
-        job["applied"] = bool(job.get("applied"))
+        job["applied"] = job["id"] in applied
     return jobs
 
 
-def get_job(job_id):
-    """Fetch job detail with applied status"""
-    user_id = session["user"]["id"]
+def _load_job(job_id):
     with db_cursor(dictionary=True) as cursor:
-        cursor.execute(
-            """SELECT j.*,
-                      EXISTS(
-                        SELECT 1 FROM applications a
-                        WHERE a.job_id = j.id AND a.user_id = %s
-                      ) AS applied
-               FROM jobs j
-               WHERE j.id=%s""",
-            (user_id, job_id),
-        )
+        cursor.execute("SELECT j.* FROM jobs j WHERE j.id=%s", (job_id,))
         job = cursor.fetchone()
-        if job:
-            if job.get("deadline"):
-                job["deadline"] = job["deadline"].strftime("%Y-%m-%d")
-            job["logo_url"] = f"/uploads/logos/{job['logo_filename']}" if job.get("logo_filename") else "/static/images/default-logo.png"
-            job["applied"] = bool(job.get("applied"))
-        return job
+    if job:
+        if job.get("deadline"):
+            job["deadline"] = job["deadline"].strftime("%Y-%m-%d")
+    return job
+
+
+def get_job(job_id):
+    """Fetch job detail with applied status"""
+    job = get_or_load(job_key(job_id), lambda: _load_job(job_id))
+    if job:
+        attach_employers([job], logo_size=256)
+        job["applied"] = bool(_applied_job_ids(session["user"]["id"], [job_id]))
+    return job
 
 
 
@@ -83,19 +134,29 @@ def get_job(job_id):
 @user_bp.route("/jobs", methods=["GET"])
 @login_required(role="User")
 def api_jobs():
-    try:
-        page = int(request.args.get("page", 1))
-    except ValueError:
-        page = 1
-    page = max(1, page)
+    page, after, error = page_args(request.args)
+    if error:
+        return api_response(False, error), 400
+    filters, error = parse_filters(request.args)
+    if error:
+        return api_response(False, error), 400
     per_page = 6
     q = request.args.get("q", "").strip()
 
-    jobs = get_jobs(page, per_page, q)
+    jobs = get_jobs(page, per_page, q, after, filters)
     has_next = len(jobs) > per_page
     jobs = jobs[:per_page]
+    cursor = None if q else next_cursor(jobs, has_next, "created_at")
+
+    return api_response(
+        True, "Jobs fetched", jobs=jobs, page=page, has_next=has_next, next_cursor=cursor
+    )
 
-    return api_response(True, "Jobs fetched", jobs=jobs, page=page, has_next=has_next)
+
+@user_bp.route("/jobs/facets", methods=["GET"])
+@login_required(role="User")
+def api_job_facets():
+    return api_response(True, "Facets fetched", facets=get_facets())
 
 
 # -------------------- JOB DETAIL --------------------
@@ -111,22 +172,10 @@ def api_job_detail(job_id):
 # -------------------- APPLY JOB --------------------
 @user_bp.route("/apply/<int:job_id>", methods=["POST"])
 @login_required(role="User")
+@rate_limit("apply", RATE_LIMIT_APPLY_USER, session_user)
+@admission("apply")
 def api_apply_job(job_id):
     user_id = session["user"]["id"]
-    
-    # confirm job exists
-    job = get_job(job_id)
-    if not job:
-        return api_response(False, "Job not found"), 404
-    
-    # check duplicate application
-    with db_cursor(dictionary=True) as cursor:
-        cursor.execute(
-            "SELECT id FROM applications WHERE user_id=%s AND job_id=%s",
-            (user_id, job_id),
-        )
-        if cursor.fetchone():
-            return api_response(False, "Already applied"), 400
 
     file = request.files.get("resume")
     if not file or file.filename == "":
@@ -134,18 +183,48 @@ def api_apply_job(job_id):
     
     if not allowed_resume_file(file.filename):
         return api_response(False, "Unsupported resume file type"), 400
-    
-    filename, error = save_resume(file, user_id, job_id)
+
+    # stream the file to disk before checking out a connection so the
+    # upload never holds one; store_resume() publishes it in the transaction
+    staged, error = save_resume(file)
     if error:
         return api_response(False, error), 400
 
-    with db_cursor(commit=True) as cursor:
-        cursor.execute(
-            "INSERT INTO applications (user_id, job_id, resume_path) VALUES (%s, %s, %s)",
-            (user_id, job_id, filename),
-        )
+    try:
+        with db_cursor(commit=True) as cursor:
+            new_blob = store_resume(cursor, staged)
+            # the job must exist and uq_app_user_job rejects a second
+            # application, so concurrent submits cannot both insert
+            cursor.execute(
+                """INSERT INTO applications (user_id, job_id, resume_path, resume_sha256)
+                   SELECT %s, j.id, %s, %s FROM jobs j WHERE j.id=%s
+                   ON DUPLICATE KEY UPDATE applications.id = applications.id""",
+                (user_id, staged.path, staged.sha256, job_id),
+            )
+            inserted = cursor.rowcount == 1
+            if inserted:
+                cursor.execute(
+                    "UPDATE jobs SET applications_count = applications_count + 1 WHERE id=%s",
+                    (job_id,),
+                )
+            else:
+                cursor.execute("SELECT 1 FROM jobs WHERE id=%s", (job_id,))
+                job_exists = cursor.fetchone() is not None
+    except Exception as e:
+        release_resumes([staged.path])
+        print(f"[DB ERROR] {e}")
+        return api_response(False, "Internal server error"), 500
+    finally:
+        discard_resume(staged)
+
+    if not inserted:
+        release_resumes([staged.path])
+        if not job_exists:
+            return api_response(False, "Job not found"), 404
+        return api_response(False, "Already applied"), 400
 
-    return api_response(True, "Application submitted")
+    task_id = schedule_extraction(staged.path, owner=task_owner()) if new_blob else None
+    return api_response(True, "Application submitted", task_id=task_id)
 
 
 # -------------------- UPLOAD PROFILE PICTURE --------------------
@@ -162,28 +241,41 @@ def api_upload_profile():
     
     ext = file.filename.rsplit(".", 1)[-1].lower()
     filename = f"user{session['user']['id']}_{int(time.time())}.{ext}"
-    filepath = os.path.join(PROFILE_PIC_FOLDER, filename)
+    key = f"profile_pics/{filename}"
 
     try:
-        os.makedirs(PROFILE_PIC_FOLDER, exist_ok=True)
-        file.save(filepath)
+        storage.save(key, file.stream)
     except Exception as e:
         print(f"Error saving profile pic: {e}")
         return api_response(False, "Error saving file"), 500
     try:
         with db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "SELECT profile_pic FROM users WHERE id=%s FOR UPDATE", (session["user"]["id"],)
+            )
+            row = cursor.fetchone()
+            old_pic = row[0] if row else None
             cursor.execute(
                 "UPDATE users SET profile_pic=%s WHERE id=%s",
                 (filename, session["user"]["id"]),
             )
     except Exception as e:
-        if os.path.exists(filepath):
-            os.remove(filepath)
+        storage.delete(key)
         print(f"[DB ERROR] {e}")
         return api_response(False, "Internal server error"), 500
-    
+    if old_pic and old_pic != filename and old_pic.startswith(f"user{session['user']['id']}_"):
+        # nothing references the replaced picture any more; an employer's
+        # admin<id>_* picture once recorded on this row is still theirs
+        remove_image("profile_pics", old_pic)
+
+    task_id = schedule_thumbnails("profile_pics", filename, owner=task_owner())
     session["user"]["profile_pic"] = filename
-    return api_response(True, "Profile updated", filename=filename)
+    session["user"]["profile_pic_url"] = image_url("profile_pics", filename, 128)
+    session.modified = True  # nested change, not tracked automatically
+    return api_response(
+        True, "Profile updated", filename=filename,
+        url=session["user"]["profile_pic_url"], task_id=task_id,
+    )
 
 
 # -------------------- REMOVE PROFILE PICTURE --------------------
@@ -191,15 +283,9 @@ def api_upload_profile():
 @login_required(role="User")
 def api_remove_profile():
     old_pic = session["user"].get("profile_pic")
-    if old_pic:
-        filepath = os.path.join(PROFILE_PIC_FOLDER, old_pic)
+    if old_pic and old_pic.startswith(f"user{session['user']['id']}_"):
         try:
-            if (
-                os.path.exists(filepath)
-                and os.path.commonpath([os.path.abspath(filepath), os.path.abspath(PROFILE_PIC_FOLDER)])
-                == os.path.abspath(PROFILE_PIC_FOLDER)
-            ):
-                os.remove(filepath)
+            remove_image("profile_pics", old_pic)  # basename only, cannot leave the folder
         except Exception as e:
             print(f"Could not delete old profile pic: {e}")
 
@@ -210,4 +296,6 @@ def api_remove_profile():
         )
 
     session["user"].pop("profile_pic", None)
+    session["user"].pop("profile_pic_url", None)
+    session.modified = True
     return api_response(True, "Profile picture removed")
@@ -0,0 +1,279 @@
+import time
+import pickle
+import threading
+from collections import OrderedDict
+from config import CACHE_BACKEND, CACHE_URL, CACHE_TTL, CACHE_MAX_ENTRIES
+
+try:
+    import redis
+except ImportError:  # optional, only needed for CACHE_BACKEND=shared with a CACHE_URL
+    redis = None
+
+MISSING = object()
+
+
+# =========================================================
+# -------------------- IN-PROCESS LRU ---------------------
+# =========================================================
+class LRUCache:
+    """Thread-safe in-process cache with LRU eviction and per-entry TTL."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return pickle.loads(entry[1])
+
+    def set(self, key, value, ttl=None):
+        # stored pickled so callers can freely mutate what they get back
+        entry = (time.monotonic() + (ttl or self.ttl), pickle.dumps(value))
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def purge_expired(self):
+        """Drop every expired entry in one pass; returns how many were removed"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+            for key in expired:
+                del self._data[key]
+            self.evictions += len(expired)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# =========================================================
+# -------------------- SHARED (REDIS) ---------------------
+# =========================================================
+class LocalSharedStore:
+    """
+    Minimal stand-in for a Redis server (get/set with ex/delete/incr/expire/info).
+
+    Used when CACHE_BACKEND=shared but no CACHE_URL is configured, e.g. on a
+    developer machine, so the shared code path runs without a server.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires_at, bytes)
+        self._lock = threading.Lock()
+        self.evicted_keys = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] < time.time():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (time.time() + ex if ex else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evicted_keys += 1
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[0] is not None and entry[0] < time.time()):
+                entry = (None, b"0")
+            value = int(entry[1]) + amount
+            self._data[key] = (entry[0], str(value).encode())
+            self._data.move_to_end(key)
+        return value
+
+    def expire(self, key, seconds):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            self._data[key] = (time.time() + seconds, entry[1])
+        return True
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                key for key, (expires_at, _) in self._data.items()
+                if expires_at is not None and expires_at < now
+            ]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def info(self, section=None):
+        return {"evicted_keys": self.evicted_keys}
+
+
+class SharedCache:
+    """Cache stored in Redis (or LocalSharedStore), shared by every worker."""
+
+    def __init__(self, client, ttl=CACHE_TTL, prefix="jobportal:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl or self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def purge_expired(self):
+        # Redis expires keys itself; only the local stand-in needs a sweep
+        purge = getattr(self.client, "purge_expired", None)
+        return purge() if purge else 0
+
+    def stats(self):
+        try:
+            evictions = int(self.client.info("stats").get("evicted_keys", 0))
+        except Exception:
+            evictions = None
+        with self._lock:
+            return {
+                "backend": "shared",
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": evictions,
+            }
+
+
+class NullCache:
+    """Caching disabled: every lookup misses."""
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def purge_expired(self):
+        return 0
+
+    def stats(self):
+        return {"backend": "none"}
+
+
+def create_cache(backend=CACHE_BACKEND, url=CACHE_URL):
+    if backend == "memory":
+        return LRUCache()
+    if backend == "shared":
+        if not url:
+            return SharedCache(LocalSharedStore())
+        if redis is None:
+            raise RuntimeError("CACHE_URL is set but the redis package is not installed")
+        return SharedCache(redis.Redis.from_url(url))
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+cache = create_cache()
+
+
+# -------------------- HELPERS --------------------
+def get_or_load(key, loader, ttl=None):
+    """Read-through lookup: return the cached value or load, store and return it"""
+    value = cache.get(key)
+    if value is MISSING:
+        value = loader()
+        if value is not None:
+            cache.set(key, value, ttl)
+    return value
+
+
+# ---------- job keys ----------
+# Job data shared by every user is cached here; the per-user `applied`
+# flag is looked up separately so one entry serves all users.
+JOB_LIST_GENERATION_KEY = "jobs:list:gen"
+
+
+def job_key(job_id):
+    return f"job:{job_id}"
+
+
+def job_list_generation():
+    gen = cache.get(JOB_LIST_GENERATION_KEY)
+    if gen is MISSING:
+        gen = time.time_ns()
+        cache.set(JOB_LIST_GENERATION_KEY, gen, ttl=365 * 24 * 3600)
+    return gen
+
+
+def job_list_key(page, per_page, q="", after=None, filters=""):
+    """Key of one page of /api/jobs; all pages share the current generation"""
+    position = f"after={after[0].isoformat()},{after[1]}" if after else f"page={page}"
+    return f"jobs:list:{job_list_generation()}:{per_page}:{q.lower()}:{filters}:{position}"
+
+
+def job_facets_key():
+    return f"jobs:facets:{job_list_generation()}"
+
+
+def invalidate_job_lists():
+    """Any change to the set of jobs shifts every page, so start a new generation"""
+    cache.set(JOB_LIST_GENERATION_KEY, time.time_ns(), ttl=365 * 24 * 3600)
+
+
+def invalidate_jobs(*job_ids):
+    cache.delete(*(job_key(job_id) for job_id in job_ids))
+    invalidate_job_lists()
@@ -0,0 +1,97 @@
+import click
+from config import db_cursor
+from resume_upload import migrate_legacy_resumes
+from resume_text import extract_pending
+from images import IMAGE_KINDS, make_thumbnails, original_name
+from storage import storage
+from facets import reconcile_job_facets, backfill_experience_years
+from upload_gc import FOLDERS, DEFAULT_BATCH, DEFAULT_MIN_AGE, reconcile_folder, missing_references
+import posixpath
+
+
+def reconcile_application_counts():
+    """Recompute jobs.applications_count from applications; returns rows repaired"""
+    with db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """UPDATE jobs j
+               LEFT JOIN (
+                   SELECT job_id, COUNT(*) AS n FROM applications GROUP BY job_id
+               ) c ON c.job_id = j.id
+               SET j.applications_count = COALESCE(c.n, 0)
+               WHERE j.applications_count <> COALESCE(c.n, 0)"""
+        )
+        return cursor.rowcount
+
+
+def register_commands(app):
+    """Attach maintenance commands to `flask --app app <command>`"""
+
+    @app.cli.command("reconcile-counts")
+    def reconcile_counts_command():
+        """Repair drift in jobs.applications_count."""
+        repaired = reconcile_application_counts()
+        click.echo(f"Repaired applications_count on {repaired} job(s)")
+
+    @app.cli.command("reconcile-facets")
+    def reconcile_facets_command():
+        """Recompute the job filter facet counts and fill missing experience_years."""
+        filled = backfill_experience_years()
+        repaired = reconcile_job_facets()
+        click.echo(f"Repaired {repaired} facet count(s), set experience_years on {filled} job(s)")
+
+    @app.cli.command("dedupe-resumes")
+    @click.option("--dry-run", is_flag=True, help="Report what would change without touching anything.")
+    def dedupe_resumes_command(dry_run):
+        """Move legacy resumes into the content-addressed store."""
+        stats = migrate_legacy_resumes(dry_run=dry_run)
+        click.echo(
+            f"{stats['files']} file(s) hashed, {stats['duplicates']} duplicate(s) "
+            f"({stats['bytes_freed']} bytes) {'would be ' if dry_run else ''}removed, "
+            f"{stats['missing']} referenced file(s) missing"
+        )
+
+    @app.cli.command("extract-resumes")
+    @click.option("--batch", default=500, show_default=True)
+    def extract_resumes_command(batch):
+        """Extract text from resumes not yet in the applicant search index."""
+        total = 0
+        while True:
+            done = extract_pending(batch)
+            total += done
+            if done < batch:
+                break
+        click.echo(f"Extracted {total} resume(s)")
+
+    @app.cli.command("make-thumbnails")
+    def make_thumbnails_command():
+        """Generate missing thumbnail variants for existing profile pictures and logos."""
+        count = 0
+        for kind in IMAGE_KINDS:
+            for obj in storage.list(kind):
+                name = posixpath.basename(obj.key)
+                if name.startswith(".") or original_name(name):
+                    continue
+                make_thumbnails(kind, name)
+                count += 1
+        click.echo(f"Processed {count} image(s)")
+
+    @app.cli.command("reconcile-uploads")
+    @click.option("--apply", is_flag=True, help="Delete the orphans (default: only report them).")
+    @click.option("--folder", type=click.Choice(sorted(FOLDERS)), multiple=True,
+                  help="Limit to these upload folders (repeatable).")
+    @click.option("--batch", default=DEFAULT_BATCH, show_default=True)
+    @click.option("--min-age", default=DEFAULT_MIN_AGE, show_default=True,
+                  help="Seconds a file must be old before it can be an orphan.")
+    @click.option("--verbose", is_flag=True, help="List every orphan.")
+    def reconcile_uploads_command(apply, folder, batch, min_age, verbose):
+        """Find unreferenced upload files and references to missing ones."""
+        for kind in folder or sorted(FOLDERS):
+            report = (lambda path, size: click.echo(f"  orphan {kind}/{path} ({size} bytes)")) if verbose else None
+            stats = reconcile_folder(kind, apply=apply, batch=batch, min_age=min_age, report=report)
+            click.echo(
+                f"{kind}: {stats['scanned']} file(s) scanned, {stats['referenced']} referenced, "
+                f"{stats['recent']} too recent, {stats['orphans']} orphan(s) "
+                f"({stats['orphan_bytes']} bytes), {stats['kept']} kept, {stats['removed']} removed"
+            )
+            for name in missing_references(kind, batch):
+                click.echo(f"  missing {kind}/{name} (referenced, not on disk)")
@@ -1,8 +1,10 @@
 import mysql.connector
-from mysql.connector import pooling
+from db_pool import ConnectionPool
+from sql_profiler import SQLProfiler, ProfiledCursor
 from contextlib import contextmanager
 from dotenv import load_dotenv
 import os
+import time
 
 # ---------------- LOAD ENV ----------------
 load_dotenv()
@@ -16,29 +18,46 @@ DB_CONFIG = {
     "user": os.getenv("DB_USER", "root"),
     "password": os.getenv("DB_PASS", ""),
     "database": os.getenv("DB_NAME", "jobportal"),
-    "pool_name": "mypool",
-    "pool_size": 5,
-    "pool_reset_session": True
   }
 
-# Optional: Connection pool (better for production)
-try:
-    connection_pool = pooling.MySQLConnectionPool(**DB_CONFIG)
-except Exception:
-    connection_pool = None  # fallback to direct connect
+# Connection pool, per worker process. Keep
+# (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW) * gunicorn workers below MySQL's max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))     # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))     # max connection lifetime, seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no")
+
+connection_pool = ConnectionPool(
+    lambda: mysql.connector.connect(**DB_CONFIG),
+    size=DB_POOL_SIZE,
+    max_overflow=DB_POOL_MAX_OVERFLOW,
+    timeout=DB_POOL_TIMEOUT,
+    recycle=DB_POOL_RECYCLE,
+    pre_ping=DB_POOL_PRE_PING,
+)
 
 def get_db():
-    """Return a new database connection (use pool if available)."""
-    if connection_pool:
-        return connection_pool.get_connection()
-    return mysql.connector.connect(**DB_CONFIG)
+    """Borrow a connection from the pool; close() returns it."""
+    return connection_pool.checkout()
 
 @contextmanager
 def db_cursor(dictionary=False, commit=False):
-    conn = get_db()
-    cursor = conn.cursor(dictionary=dictionary)
+    profile = sql_profiler.current()
+    if profile is not None:
+        start = time.perf_counter()
+        conn = get_db()
+        profile.checkouts += 1
+        profile.checkout_time += time.perf_counter() - start
+    else:
+        conn = get_db()
+    try:
+        cursor = conn.cursor(dictionary=dictionary)
+    except Exception:
+        conn.close()
+        raise
     try:
-        yield cursor
+        yield cursor if profile is None else ProfiledCursor(cursor, profile)
         if commit:
             conn.commit()
     except Exception as e:
@@ -48,6 +67,71 @@ def db_cursor(dictionary=False, commit=False):
         cursor.close()
         conn.close()
 
+# Per-request SQL profiling (query counts/timings, slow query EXPLAIN, N+1
+# detection), reported at /api/admin/sql/stats. Off by default.
+sql_profiler = SQLProfiler(
+    enabled=os.getenv("SQL_PROFILING", "0").lower() in ("1", "true", "yes"),
+    slow_ms=float(os.getenv("SQL_SLOW_MS", 100)),
+    explain=os.getenv("SQL_EXPLAIN", "1").lower() not in ("0", "false", "no"),
+    n_plus_one=int(os.getenv("SQL_N_PLUS_ONE", 5)),
+    log=os.getenv("SQL_PROFILE_LOG", "slow"),  # off, slow or all
+    explain_with=db_cursor,
+)
+
+# ---------------- PASSWORD HASHING ----------------
+# Pick PASSWORD_HASH_ITERATIONS with `python -m benchmarks.bench_password`.
+# Hashes made with other parameters are upgraded on the next successful login.
+PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "sha256")
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 260000))
+PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))      # concurrent hashes per process
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 32))         # waiting hashes before 503
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))   # seconds
+
+# ---------------- SEARCH CONFIG ----------------
+# "fulltext" (MySQL FULLTEXT index), "memory" (in-process inverted index) or "like" (legacy scan)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "fulltext")
+SEARCH_INDEX_REFRESH = int(os.getenv("SEARCH_INDEX_REFRESH", 60))  # seconds, "memory" backend only
+# What the server's FULLTEXT index leaves out (innodb_ft_min_token_size, default
+# stopword list); queries using such words fall back to the LIKE scan
+SEARCH_FULLTEXT_MIN_TOKEN = int(os.getenv("SEARCH_FULLTEXT_MIN_TOKEN", 3))
+SEARCH_FULLTEXT_STOPWORDS = os.getenv("SEARCH_FULLTEXT_STOPWORDS", "1").lower() not in ("0", "false", "no")
+
+# ---------------- JOB FILTERS ----------------
+# Lower bounds (LPA) of the salary facet buckets; the last bucket is open-ended.
+# Run `flask reconcile-facets` after changing them.
+FACET_SALARY_BUCKETS = [float(b) for b in os.getenv("FACET_SALARY_BUCKETS", "0,3,6,10,15,25,50").split(",")]
+FACET_LOCATION_LIMIT = int(os.getenv("FACET_LOCATION_LIMIT", 20))  # locations listed, most jobs first
+
+# ---------------- CACHE CONFIG ----------------
+# "memory" (per-process LRU), "shared" (Redis at CACHE_URL, or a local stand-in if unset) or "none"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_URL = os.getenv("CACHE_URL", "")
+CACHE_TTL = int(os.getenv("CACHE_TTL", 300))  # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+
+# ---------------- SESSION CONFIG ----------------
+# "cookie" (Flask's signed cookie, no server state), "shared" (Redis at SESSION_URL, or a
+# local stand-in if unset) or "memory" (per-process, a single worker only)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")
+SESSION_URL = os.getenv("SESSION_URL", CACHE_URL)
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", 100000))
+SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", 300))  # seconds between expiry sweeps
+
+# ---------------- RATE LIMITS ----------------
+# "memory" (token buckets per process), "shared" (sliding windows in Redis at
+# RATE_LIMIT_URL, or a local stand-in if unset) or "none"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL", CACHE_URL)
+RATE_LIMIT_LOGIN_IP = os.getenv("RATE_LIMIT_LOGIN_IP", "20/minute")
+RATE_LIMIT_LOGIN_IDENTIFIER = os.getenv("RATE_LIMIT_LOGIN_IDENTIFIER", "5/minute")
+RATE_LIMIT_REGISTER_IP = os.getenv("RATE_LIMIT_REGISTER_IP", "5/minute")
+RATE_LIMIT_APPLY_USER = os.getenv("RATE_LIMIT_APPLY_USER", "30/hour")
+# Requests of one endpoint class in flight per process; more get a 429 (0 = no cap)
+CONCURRENCY_AUTH = int(os.getenv("CONCURRENCY_AUTH", 4))
+CONCURRENCY_APPLY = int(os.getenv("CONCURRENCY_APPLY", 4))
+CONCURRENCY_EXPORT = int(os.getenv("CONCURRENCY_EXPORT", 2))  # bulk applicant ZIP downloads
+
 # ---------------- FILE UPLOAD CONFIG ----------------
 BASE_UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
 
@@ -55,6 +139,25 @@ PROFILE_PIC_FOLDER = os.path.join(BASE_UPLOAD_FOLDER, "profile_pics")
 RESUME_FOLDER = os.path.join(BASE_UPLOAD_FOLDER, "resumes")
 LOGO_FOLDER = os.path.join(BASE_UPLOAD_FOLDER, "logos")
 
+# Serving of /uploads: "" streams from Python, "x-accel" hands off to nginx
+# (internal location UPLOADS_ACCEL_PREFIX aliased to BASE_UPLOAD_FOLDER),
+# "x-sendfile" to Apache/lighttpd mod_xsendfile
+UPLOADS_SENDFILE = os.getenv("UPLOADS_SENDFILE", "")
+UPLOADS_ACCEL_PREFIX = os.getenv("UPLOADS_ACCEL_PREFIX", "/protected-uploads")
+
+# Where uploads live: "local" (BASE_UPLOAD_FOLDER on this node) or "s3"
+# (bucket STORAGE_BUCKET at STORAGE_URL, e.g. MinIO; an in-process stand-in
+# if unset). Credentials come from the usual AWS_* environment variables.
+# The folders above stay in use as scratch space for uploads in progress.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_URL = os.getenv("STORAGE_URL", "")
+STORAGE_BUCKET = os.getenv("STORAGE_BUCKET", "jobportal-uploads")
+STORAGE_PREFIX = os.getenv("STORAGE_PREFIX", "")
+STORAGE_REGION = os.getenv("STORAGE_REGION", "us-east-1")
+# Downloads redirect to a signed URL valid this long (0 = stream through the app)
+STORAGE_PRESIGN_TTL = int(os.getenv("STORAGE_PRESIGN_TTL", 300))
+STORAGE_PART_SIZE = int(os.getenv("STORAGE_PART_SIZE", 8 * 1024 * 1024))  # multipart above this
+
 # Ensure folders exist
 os.makedirs(PROFILE_PIC_FOLDER, exist_ok=True)
 os.makedirs(RESUME_FOLDER, exist_ok=True)
@@ -64,6 +167,14 @@ os.makedirs(LOGO_FOLDER, exist_ok=True)
 ALLOWED_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg"}
 ALLOWED_RESUME_EXTENSIONS = {"pdf", "doc", "docx"}
 MAX_FILE_SIZE=2*1024*1024
+BULK_JOBS_MAX_ROWS = int(os.getenv("BULK_JOBS_MAX_ROWS", 2000))  # jobs per /api/admin/jobs/bulk request
+
+# ---------------- BACKGROUND TASKS ----------------
+TASK_DB_PATH = os.getenv("TASK_DB_PATH", os.path.join(os.getcwd(), "instance", "tasks.sqlite3"))
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", 2))            # worker threads per process
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", 3))
+TASK_RETRY_DELAY = float(os.getenv("TASK_RETRY_DELAY", 5))    # seconds, doubled per attempt
+TASK_STALE_AFTER = float(os.getenv("TASK_STALE_AFTER", 600))  # requeue tasks running this long
 
 def allowed_file(filename, allowed_extensions):
     """Generic file extension check"""
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import (
+    db_cursor,
+    PASSWORD_HASH_ALGORITHM,
+    PASSWORD_HASH_ITERATIONS,
+    PASSWORD_SALT_LENGTH,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_TIMEOUT,
+)
+
+# Password hashing and verification.
+#
+# PBKDF2 is deliberately slow, so every hash runs on a small per-process
+# thread pool (hashlib releases the GIL while it works): at most
+# PASSWORD_HASH_WORKERS cores are busy hashing no matter how many logins
+# arrive at once, and once PASSWORD_HASH_QUEUE more are waiting new ones
+# are turned away with HashingBusy (a 503) instead of piling up.
+
+HASH_METHOD = f"pbkdf2:{PASSWORD_HASH_ALGORITHM}:{PASSWORD_HASH_ITERATIONS}"
+
+CREDENTIAL_TABLES = ("users", "employers")
+
+
+class HashingBusy(Exception):
+    """Too many password hashes are queued in this process."""
+
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy
+    try:
+        future = _executor.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+    except FutureTimeout:
+        future.cancel()
+        raise HashingBusy
+
+
+def hash_password(password, method=HASH_METHOD, salt_length=PASSWORD_SALT_LENGTH):
+    return _run(generate_password_hash, password, method, salt_length)
+
+
+def needs_rehash(stored_hash, method=HASH_METHOD):
+    """True if stored_hash was made with other parameters than `method`"""
+    return stored_hash.split("$", 1)[0] != method
+
+
+def verify_password(stored_hash, password):
+    """
+    Check a password against its stored hash.
+
+    Returns:
+        (valid, needs_rehash)
+    """
+    if not stored_hash:
+        return False, False
+    valid = _run(check_password_hash, stored_hash, password)
+    return valid, valid and needs_rehash(stored_hash)
+
+
+def upgrade_password_hash(table, account_id, stored_hash, password):
+    """
+    Re-hash a just-verified password with the current parameters.
+
+    Only replaces the hash it was verified against, so a concurrent password
+    change is never overwritten. Failures are logged, not raised: the login
+    itself already succeeded.
+    """
+    if table not in CREDENTIAL_TABLES:
+        raise ValueError(f"Unknown credential table: {table}")
+    try:
+        new_hash = hash_password(password)
+        with db_cursor(commit=True) as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET password=%s WHERE id=%s AND password=%s",
+                (new_hash, account_id, stored_hash),
+            )
+    except Exception as e:
+        print(f"[REHASH ERROR] {table} {account_id}: {e}")
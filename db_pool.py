@@ -0,0 +1,174 @@
+import time
+import threading
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the checkout timeout."""
+
+
+class PooledConnection:
+    """Proxy around a raw connection; close() hands it back to the pool."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool._release(raw, self._created_at)
+
+
+class ConnectionPool:
+    """
+    Blocking connection pool.
+
+    - `size` connections are kept open; up to `max_overflow` more are opened
+      under load and closed again when returned.
+    - checkout() waits up to `timeout` seconds for a free connection before
+      raising PoolTimeout (counted as an exhaustion event).
+    - Connections older than `recycle` seconds are replaced, and with
+      `pre_ping` every borrowed connection is checked first, so a MySQL
+      restart or wait_timeout does not surface as a failed request.
+    """
+
+    def __init__(self, connect, size=5, max_overflow=5, timeout=10.0, recycle=1800, pre_ping=True):
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = deque()  # (raw, created_at), most recently used last
+        self._cond = threading.Condition()
+        self._opened = 0
+        self._in_use = 0
+
+        # metrics
+        self.checkouts = 0
+        self.waits = 0
+        self.exhausted = 0
+        self.recycled = 0
+        self.ping_failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_samples = deque(maxlen=1000)
+
+    # ---------- checkout / release ----------
+    def checkout(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._opened < self.size + self.max_overflow:
+                    self._opened += 1
+                    raw = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.exhausted += 1
+                    raise PoolTimeout(
+                        f"connection pool exhausted ({self._opened} open, timeout {self.timeout}s)"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        try:
+            if raw is not None:
+                raw, created_at = self._validate(raw, created_at)
+            if raw is None:
+                raw, created_at = self._connect(), time.monotonic()
+        except Exception:
+            with self._cond:
+                self._opened -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        self._record_wait(time.monotonic() - start, waited)
+        return PooledConnection(self, raw, created_at)
+
+    def _validate(self, raw, created_at):
+        """Return (raw, created_at), or (None, None) if raw had to be discarded"""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            self.recycled += 1
+            self._close_quietly(raw)
+            return None, None
+        if self.pre_ping and not raw.is_connected():
+            self.ping_failures += 1
+            self._close_quietly(raw)
+            return None, None
+        return raw, created_at
+
+    def _release(self, raw, created_at):
+        try:
+            if raw.in_transaction:
+                raw.rollback()
+            keep = True
+        except Exception:
+            keep = False
+        with self._cond:
+            self._in_use -= 1
+            if keep and len(self._idle) < self.size:
+                self._idle.append((raw, created_at))
+                raw = None
+            else:
+                self._opened -= 1
+            self._cond.notify()
+        if raw is not None:
+            self._close_quietly(raw)
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ---------- metrics ----------
+    def _record_wait(self, seconds, waited):
+        with self._cond:
+            self.checkouts += 1
+            self.waits += waited
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            self._wait_samples.append(seconds)
+
+    def stats(self):
+        with self._cond:
+            samples = sorted(self._wait_samples)
+            p99 = samples[max(0, int(len(samples) * 0.99) - 1)] if samples else 0.0
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._opened,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "exhausted": self.exhausted,
+                "recycled": self.recycled,
+                "ping_failures": self.ping_failures,
+                "wait_avg_ms": round(self._wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_p99_ms": round(p99 * 1000, 3),
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+    def dispose(self):
+        """Close all idle connections (e.g. after fork in a pre-fork server)"""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._opened -= len(idle)
+        for raw, _ in idle:
+            self._close_quietly(raw)
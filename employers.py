@@ -0,0 +1,85 @@
+from config import db_cursor, CACHE_TTL
+from cache import LRUCache, MISSING
+from images import logo_url
+
+# Company name and logo are read from the employer profile, not copied into
+# every job row. Profiles are cached per process; upload_logo invalidates
+# the entry of this worker, others pick the change up within CACHE_TTL.
+PROFILE_CACHE_ENTRIES = 10_000
+
+UNKNOWN_COMPANY = "Unknown Company"
+
+_profiles = LRUCache(max_entries=PROFILE_CACHE_ENTRIES, ttl=CACHE_TTL)
+
+PROFILES_SQL = "SELECT id, organization_name, logo_filename FROM employers WHERE id IN ({placeholders})"
+
+
+def cached_profiles(employer_ids):
+    """
+    Split employer_ids into the profiles already cached and the ids that
+    still have to be loaded with PROFILES_SQL.
+
+    Returns:
+        ({employer_id: profile}, [missing_id, ...])
+    """
+    profiles, missing = {}, []
+    for employer_id in set(employer_ids):
+        profile = _profiles.get(employer_id)
+        if profile is MISSING:
+            missing.append(employer_id)
+        else:
+            profiles[employer_id] = profile
+    return profiles, missing
+
+
+def remember_profiles(rows, profiles):
+    """Cache the employer rows returned by PROFILES_SQL and add them to profiles"""
+    for row in rows:
+        profile = {"company": row["organization_name"], "logo_filename": row["logo_filename"]}
+        _profiles.set(row["id"], profile)
+        profiles[row["id"]] = profile
+    return profiles
+
+
+def get_employer_profiles(employer_ids):
+    """
+    Company name and logo filename of every employer in employer_ids.
+
+    Cached profiles are served from memory; the rest are loaded with a
+    single primary-key IN query.
+
+    Returns:
+        {employer_id: {"company": str, "logo_filename": str | None}}
+    """
+    profiles, missing = cached_profiles(employer_ids)
+    if missing:
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                PROFILES_SQL.format(placeholders=", ".join(["%s"] * len(missing))),
+                tuple(missing),
+            )
+            remember_profiles(cursor.fetchall(), profiles)
+    return profiles
+
+
+def apply_profiles(jobs, profiles, logo_size=128):
+    """Set company and logo_url on each job from its posted_by profile"""
+    for job in jobs:
+        profile = profiles.get(job["posted_by"])
+        job["company"] = profile["company"] if profile else UNKNOWN_COMPANY
+        job["logo_url"] = logo_url(profile["logo_filename"] if profile else None, logo_size)
+    return jobs
+
+
+def attach_employers(jobs, logo_size=128):
+    """Set company and logo_url on each job from its posted_by employer"""
+    profiles = get_employer_profiles(job["posted_by"] for job in jobs)
+    return apply_profiles(jobs, profiles, logo_size)
+
+
+def invalidate_employer(employer_id):
+    _profiles.delete(employer_id)
+
+
+def profile_cache_stats():
+    return _profiles.stats()
@@ -0,0 +1,139 @@
+import io
+import csv
+import posixpath
+import tempfile
+import zipfile
+from config import db_cursor
+from pagination import keyset_clause
+from resume_upload import resume_key
+from storage import storage, CHUNK_SIZE
+from werkzeug.utils import secure_filename
+
+# Bulk export of a job's applicants: one ZIP with every resume plus
+# applicants.csv, produced while it is being sent.
+#
+# Applicants are read in keyset batches over idx_app_job_applied (newest
+# first, like the applicants page), each batch on a short connection
+# checkout, so a slow download never pins a pool connection. Resumes are
+# copied from storage in CHUNK_SIZE pieces and every piece is handed to the
+# client as soon as zipfile has written it. The CSV rows are spooled to a
+# temp file (on disk past CSV_SPOOL_SIZE) and added as the last entry.
+
+EXPORT_BATCH = 500
+CSV_SPOOL_SIZE = 1024 * 1024
+
+CSV_COLUMNS = ["application_id", "user_id", "name", "email", "mobile", "applied_at", "resume_file"]
+
+APPLICANTS_SQL = """SELECT a.id AS application_id,
+                           u.id AS user_id,
+                           u.name,
+                           u.email,
+                           u.mobile,
+                           a.applied_at,
+                           a.resume_path
+                    FROM applications a
+                    JOIN users u ON a.user_id = u.id
+                    WHERE {where}
+                    ORDER BY a.applied_at DESC, a.id DESC
+                    LIMIT %s"""
+
+# Already compressed formats are stored as is; deflating them costs CPU for nothing
+STORED_EXTENSIONS = {"pdf", "docx"}
+
+
+def iter_applicants(job_id, batch=EXPORT_BATCH):
+    """Every applicant row of a job, newest first, fetched `batch` rows per query"""
+    after = None
+    while True:
+        where, params = "a.job_id=%s", [job_id]
+        if after:
+            clause, after_params = keyset_clause("a.applied_at", "a.id", after)
+            where += f" AND {clause}"
+            params.extend(after_params)
+        with db_cursor(dictionary=True) as cursor:
+            cursor.execute(APPLICANTS_SQL.format(where=where), tuple(params + [batch]))
+            rows = cursor.fetchall()
+        yield from rows
+        if len(rows) < batch:
+            return
+        after = (rows[-1]["applied_at"], rows[-1]["application_id"])
+
+
+class _Pipe(io.RawIOBase):
+    """Write-only, unseekable sink that collects what zipfile writes until drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _resume_entry(row):
+    """ZIP entry for an applicant's resume: resumes/<application id>_<name>.<ext>"""
+    ext = posixpath.splitext(row["resume_path"])[1].lstrip(".").lower()
+    name = secure_filename(row["name"] or "") or "applicant"
+    info = zipfile.ZipInfo(
+        f"resumes/{row['application_id']}_{name}.{ext}",
+        date_time=row["applied_at"].timetuple()[:6],
+    )
+    info.compress_type = zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+    return info
+
+
+def stream_applicants_zip(job_id):
+    """
+    Iterator over the bytes of the export ZIP of a job (the caller checks access).
+
+    A resume that is missing from storage is left out; its resume_file
+    column is empty. Errors after the first byte can only end the stream
+    early, so the archive is then truncated.
+    """
+    return (chunk for chunk in _zip_chunks(job_id, _Pipe()) if chunk)
+
+
+def _zip_chunks(job_id, pipe):
+    with tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_SIZE, mode="w+", newline="") as rows_csv:
+        writer = csv.writer(rows_csv)
+        writer.writerow(CSV_COLUMNS)
+        with zipfile.ZipFile(pipe, "w") as archive:
+            for row in iter_applicants(job_id):
+                entry = ""
+                key = resume_key(row["resume_path"]) if row["resume_path"] else None
+                try:
+                    body = storage.open(key) if key else None
+                except FileNotFoundError:
+                    body = None
+                if body is not None:
+                    info = _resume_entry(row)
+                    try:
+                        with archive.open(info, "w", force_zip64=True) as out:
+                            for chunk in iter(lambda: body.read(CHUNK_SIZE), b""):
+                                out.write(chunk)
+                                yield pipe.drain()
+                    finally:
+                        body.close()
+                    entry = info.filename
+                writer.writerow([
+                    row["application_id"], row["user_id"], row["name"], row["email"],
+                    row["mobile"], row["applied_at"].isoformat(sep=" "), entry,
+                ])
+                yield pipe.drain()
+
+            rows_csv.seek(0)
+            info = zipfile.ZipInfo("applicants.csv")
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, "w", force_zip64=True) as out:
+                for text in iter(lambda: rows_csv.read(CHUNK_SIZE), ""):
+                    out.write(text.encode("utf-8"))
+                    yield pipe.drain()
+        yield pipe.drain()  # central directory
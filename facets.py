@@ -0,0 +1,231 @@
+import re
+import math
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from urllib.parse import urlencode
+from config import db_cursor, FACET_SALARY_BUCKETS, FACET_LOCATION_LIMIT
+from cache import get_or_load, job_facets_key, invalidate_job_lists
+
+# Structured job filters for /api/jobs and the facet counts listed next to them.
+#
+# Filters become plain predicates on jobs j. job_type and location have
+# (column, created_at, id) indexes, so a filtered listing still walks an
+# index in the order of the unfiltered one; salary has a range index.
+#
+# Facet counts (jobs per job_type, location and salary bucket) are kept in
+# job_facets. count_jobs() updates them in the transaction that inserts or
+# deletes the jobs, so /api/jobs/facets reads a few rows of a small table
+# instead of running GROUP BY over jobs. `flask reconcile-facets` recomputes
+# them. The counts are over all jobs, not narrowed by the active filters.
+
+JOB_TYPES = ("Full-Time", "Part-Time", "Internship", "Remote")  # jobs.job_type ENUM
+MAX_EXPERIENCE_YEARS = 255  # jobs.experience_years TINYINT UNSIGNED
+
+YEARS_RE = re.compile(r"\d+")
+FRESHER_RE = re.compile(r"fresher|entry|no experience", re.IGNORECASE)
+
+
+def experience_years(text):
+    """Minimum years asked for by a free-text experience field ("2-4 years" -> 2), or None"""
+    match = YEARS_RE.search(text or "")
+    if match:
+        return min(int(match.group()), MAX_EXPERIENCE_YEARS)
+    if FRESHER_RE.search(text or ""):
+        return 0
+    return None
+
+
+def salary_bucket(salary):
+    """Label of the FACET_SALARY_BUCKETS bucket (its lower bound) holding salary"""
+    # jobs.salary is DECIMAL(10,2): bucket the stored value, not the submitted one
+    i = bisect_right(FACET_SALARY_BUCKETS, round(float(salary), 2)) - 1
+    return f"{FACET_SALARY_BUCKETS[max(i, 0)]:g}"
+
+
+# -------------------- FILTERS --------------------
+def parse_filters(args):
+    """
+    Parse the filter query args of /api/jobs:
+    job_type and location (repeatable), salary_min (inclusive),
+    salary_max (exclusive), max_experience (years) and open=1 (deadline not
+    passed). Works with Flask's and Starlette's query args.
+
+    Returns:
+        (filters, error) – filters holds only the args that were given
+    """
+    filters = {}
+    job_types = {value for value in args.getlist("job_type") if value}
+    if job_types:
+        if not job_types <= set(JOB_TYPES):
+            return None, f"job_type must be one of {', '.join(JOB_TYPES)}"
+        filters["job_type"] = sorted(job_types)
+    locations = {value.strip() for value in args.getlist("location") if value.strip()}
+    if locations:
+        filters["location"] = sorted(locations)
+
+    for name in ("salary_min", "salary_max"):
+        value = args.get(name, "").strip()
+        if not value:
+            continue
+        try:
+            filters[name] = float(value)
+        except ValueError:
+            return None, f"{name} must be a number"
+        if not math.isfinite(filters[name]):
+            return None, f"{name} must be a number"
+
+    value = args.get("max_experience", "").strip()
+    if value:
+        if not value.isdigit():
+            return None, "max_experience must be a whole number of years"
+        filters["max_experience"] = min(int(value), MAX_EXPERIENCE_YEARS)
+
+    if args.get("open", "").lower() in ("1", "true", "yes"):
+        filters["open"] = True
+    return filters, None
+
+
+def filters_key(filters):
+    """Canonical string of parsed filters, for cache keys"""
+    return urlencode(sorted(filters.items()), doseq=True)
+
+
+def filter_clause(filters):
+    """
+    SQL condition on jobs j for parsed filters.
+
+    Returns:
+        (clause, params) – clause is "" when there is nothing to filter
+    """
+    clauses, params = [], []
+    for column in ("job_type", "location"):
+        values = filters.get(column)
+        if values:
+            clauses.append(f"j.{column} IN ({', '.join(['%s'] * len(values))})")
+            params.extend(values)
+    if "salary_min" in filters:
+        clauses.append("j.salary >= %s")
+        params.append(filters["salary_min"])
+    if "salary_max" in filters:
+        clauses.append("j.salary < %s")
+        params.append(filters["salary_max"])
+    if "max_experience" in filters:
+        clauses.append("j.experience_years <= %s")
+        params.append(filters["max_experience"])
+    if filters.get("open"):
+        clauses.append("(j.deadline IS NULL OR j.deadline >= CURDATE())")
+    return " AND ".join(clauses), params
+
+
+# -------------------- FACET COUNTS --------------------
+def facet_values(job):
+    """(facet, value) pairs a job is counted under"""
+    pairs = [("location", job["location"]), ("salary", salary_bucket(job["salary"]))]
+    if job.get("job_type"):
+        pairs.append(("job_type", job["job_type"]))
+    return pairs
+
+
+def count_jobs(cursor, jobs, delta=1):
+    """
+    Add `delta` to the facet counts of each job (1 when inserting, -1 when
+    deleting). Run it on the cursor of the transaction that changes the jobs.
+    """
+    counts = Counter(pair for job in jobs for pair in facet_values(job))
+    if not counts:
+        return
+    # facet rows are locked in one order by every writer, so posters don't deadlock
+    cursor.executemany(
+        """INSERT INTO job_facets (facet, value, job_count) VALUES (%s, %s, %s)
+           ON DUPLICATE KEY UPDATE job_count = job_count + VALUES(job_count)""",
+        [(facet, value, n * delta) for (facet, value), n in sorted(counts.items())],
+    )
+
+
+def reconcile_job_facets():
+    """Recompute job_facets from jobs; returns how many facet values were repaired"""
+    with db_cursor(commit=True) as cursor:
+        counts = Counter()
+        cursor.execute("SELECT job_type, COUNT(*) FROM jobs WHERE job_type IS NOT NULL GROUP BY job_type")
+        counts.update({("job_type", value): n for value, n in cursor.fetchall()})
+        cursor.execute("SELECT location, COUNT(*) FROM jobs GROUP BY location")
+        counts.update({("location", value): n for value, n in cursor.fetchall()})
+        cursor.execute("SELECT salary, COUNT(*) FROM jobs GROUP BY salary")
+        for salary, n in cursor.fetchall():
+            counts[("salary", salary_bucket(salary))] += n
+
+        cursor.execute("SELECT facet, value, job_count FROM job_facets FOR UPDATE")
+        current = {(facet, value): n for facet, value, n in cursor.fetchall()}
+        stale = [key for key in current if key not in counts]
+        changed = [(*key, n) for key, n in sorted(counts.items()) if current.get(key) != n]
+        if stale:
+            cursor.executemany("DELETE FROM job_facets WHERE facet=%s AND value=%s", stale)
+        if changed:
+            cursor.executemany(
+                """INSERT INTO job_facets (facet, value, job_count) VALUES (%s, %s, %s)
+                   ON DUPLICATE KEY UPDATE job_count = VALUES(job_count)""",
+                changed,
+            )
+    if stale or changed:
+        invalidate_job_lists()
+    return len(stale) + len(changed)
+
+
+def backfill_experience_years(batch=1000):
+    """Fill jobs.experience_years where it was never set; returns rows updated"""
+    with db_cursor() as cursor:
+        cursor.execute("SELECT id, experience FROM jobs WHERE experience_years IS NULL")
+        rows = [(experience_years(experience), job_id) for job_id, experience in cursor.fetchall()]
+    rows = [row for row in rows if row[0] is not None]
+    for start in range(0, len(rows), batch):
+        with db_cursor(commit=True) as cursor:
+            cursor.executemany(
+                "UPDATE jobs SET experience_years=%s WHERE id=%s", rows[start:start + batch]
+            )
+    return len(rows)
+
+
+def load_facets():
+    """Facet counts for the job filters, from job_facets"""
+    with db_cursor() as cursor:
+        cursor.execute(
+            """SELECT facet, value, job_count FROM job_facets
+               WHERE facet IN ('job_type', 'salary') AND job_count > 0"""
+        )
+        counts = defaultdict(dict)
+        for facet, value, n in cursor.fetchall():
+            counts[facet][value] = n
+        cursor.execute(
+            """SELECT value, job_count FROM job_facets
+               WHERE facet='location' AND job_count > 0
+               ORDER BY job_count DESC, value
+               LIMIT %s""",
+            (FACET_LOCATION_LIMIT,),
+        )
+        locations = cursor.fetchall()
+
+    salary = []
+    for i, low in enumerate(FACET_SALARY_BUCKETS):
+        n = counts["salary"].get(f"{low:g}")
+        if not n:
+            continue
+        high = FACET_SALARY_BUCKETS[i + 1] if i + 1 < len(FACET_SALARY_BUCKETS) else None
+        salary.append({
+            "value": f"{low:g}-{high:g}" if high is not None else f"{low:g}+",
+            "salary_min": low,
+            "salary_max": high,
+            "count": n,
+        })
+    return {
+        "job_type": [
+            {"value": job_type, "count": counts["job_type"][job_type]}
+            for job_type in JOB_TYPES if job_type in counts["job_type"]
+        ],
+        "location": [{"value": value, "count": n} for value, n in locations],
+        "salary": salary,
+    }
+
+
+def get_facets():
+    """Cached facet counts; a new job list generation (any job posted or deleted) reloads them"""
+    return get_or_load(job_facets_key(), load_facets)
@@ -0,0 +1,147 @@
+import os
+import re
+import mimetypes
+import posixpath
+from flask import request, send_file, abort, redirect, Response
+from werkzeug.http import parse_etags, parse_date, http_date, quote_etag
+from werkzeug.security import safe_join
+from config import BASE_UPLOAD_FOLDER, UPLOADS_SENDFILE, UPLOADS_ACCEL_PREFIX
+from storage import storage, CHUNK_SIZE
+
+# Names that change whenever the content does can be cached "forever":
+# timestamped uploads (user1_1757779089.png, employer2_1757878778.png, ...)
+# and content-addressed resumes (<sha256>.pdf). Everything else must be
+# revalidated, which is cheap because the ETag comes from os.stat().
+VERSIONED_NAME_RE = re.compile(r"(_\d{10}|_\d{14}|^[0-9a-f]{64})\.")
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def file_etag(st):
+    """Strong validator from size and mtime, so no byte of the file is read"""
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def is_versioned(filename):
+    return VERSIONED_NAME_RE.search(filename) is not None
+
+
+def cache_headers(st, versioned):
+    """ETag, Last-Modified and Cache-Control for a file with stat result `st`"""
+    if versioned:
+        cache_control = f"private, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = "private, no-cache"
+    return {
+        "ETag": quote_etag(file_etag(st)),
+        "Last-Modified": http_date(int(st.st_mtime)),
+        "Cache-Control": cache_control,
+    }
+
+
+def is_not_modified(headers, st):
+    """True if the request headers show the client's copy is still current"""
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        return parse_etags(if_none_match).contains(file_etag(st))
+    if_modified_since = parse_date(headers.get("If-Modified-Since"))
+    return if_modified_since is not None and if_modified_since.timestamp() >= int(st.st_mtime)
+
+
+def sendfile_headers(path, as_attachment=False):
+    """Headers handing the body to the front-end server, or None if UPLOADS_SENDFILE is off"""
+    if not UPLOADS_SENDFILE:
+        return None
+    rel = os.path.relpath(path, BASE_UPLOAD_FOLDER).replace(os.sep, "/")
+    if UPLOADS_SENDFILE == "x-accel":
+        headers = {"X-Accel-Redirect": f"{UPLOADS_ACCEL_PREFIX.rstrip('/')}/{rel}"}
+    else:
+        headers = {"X-Sendfile": path}
+    headers["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if as_attachment:
+        headers["Content-Disposition"] = f'attachment; filename="{os.path.basename(path)}"'
+    return headers
+
+
+def send_upload(folder, filename, versioned=None, as_attachment=False):
+    """
+    Serve a file below BASE_UPLOAD_FOLDER with HTTP caching.
+
+    - Strong ETag and Last-Modified on every response; If-None-Match /
+      If-Modified-Since are answered with 304 before the file is opened.
+    - Versioned names get `Cache-Control: private, max-age=1y, immutable`,
+      the rest `private, no-cache` (uploads sit behind the login session,
+      so shared caches must not keep them).
+    - With UPLOADS_SENDFILE set to "x-accel" (nginx) or "x-sendfile"
+      (Apache/lighttpd) the body is left to the front-end server.
+    """
+    path = safe_join(folder, filename)
+    if path is None:
+        abort(404)
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        abort(404)
+    if versioned is None:
+        versioned = is_versioned(os.path.basename(path))
+
+    headers = cache_headers(st, versioned)
+    if is_not_modified(request.headers, st):
+        return Response(status=304, headers=headers)
+
+    handoff = sendfile_headers(path, as_attachment)
+    if handoff:
+        return Response(headers={**headers, **handoff})
+
+    sent = send_file(
+        path, as_attachment=as_attachment, etag=file_etag(st), last_modified=st.st_mtime,
+        conditional=False,
+    )
+    sent.headers["Cache-Control"] = headers["Cache-Control"]
+    return sent
+
+
+def stream_body(body, chunk_size=CHUNK_SIZE):
+    try:
+        for chunk in iter(lambda: body.read(chunk_size), b""):
+            yield chunk
+    finally:
+        body.close()
+
+
+def send_stored(key, versioned=None, as_attachment=False):
+    """
+    Serve an upload by storage key, whichever backend holds it.
+
+    Local files go through send_upload. Objects in a bucket are redirected to
+    a signed URL (the bytes never pass through the app) or, with presigning
+    off, streamed in chunks; both answer conditional requests with 304 first.
+    """
+    if storage.local:
+        return send_upload(storage.root, key, versioned, as_attachment)
+    try:
+        obj = storage.stat(key)
+    except ValueError:
+        abort(404)
+    if obj is None:
+        abort(404)
+    name = posixpath.basename(key)
+    if versioned is None:
+        versioned = is_versioned(name)
+
+    headers = cache_headers(obj, versioned)
+    if is_not_modified(request.headers, obj):
+        return Response(status=304, headers=headers)
+
+    url = storage.url(key, filename=name if as_attachment else None)
+    if url:
+        response = redirect(url)
+        # the signature expires, so the redirect may only be reused briefly
+        response.headers["Cache-Control"] = f"private, max-age={storage.presign_ttl // 2}"
+        return response
+
+    headers["Content-Type"] = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    headers["Content-Length"] = str(obj.st_size)
+    if as_attachment:
+        headers["Content-Disposition"] = f'attachment; filename="{name}"'
+    return Response(stream_body(storage.open(key)), headers=headers, direct_passthrough=True)
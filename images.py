@@ -0,0 +1,84 @@
+import io
+import os
+import re
+from storage import storage
+from tasks import task, enqueue
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional, originals are served when Pillow is missing
+    Image = None
+
+# Fixed-size variants made for every profile picture and logo:
+#   employer2.png -> employer2.png.64.webp, employer2.png.128.webp, ...
+# Each fits inside a size x size box and keeps its aspect ratio.
+THUMBNAIL_SIZES = (64, 128, 256)
+THUMBNAIL_FORMAT = "webp"
+THUMBNAIL_QUALITY = 80
+
+IMAGE_KINDS = ("profile_pics", "logos")  # storage key prefixes
+
+VARIANT_RE = re.compile(r"^(.+)\.(\d+)\.%s$" % THUMBNAIL_FORMAT)
+
+DEFAULT_LOGO_URL = "/static/images/default-logo.png"
+
+
+def variant_name(filename, size):
+    return f"{filename}.{size}.{THUMBNAIL_FORMAT}"
+
+
+def original_name(variant):
+    """Original filename a variant was made from, or None if it is not a variant"""
+    match = VARIANT_RE.match(variant)
+    if match and int(match.group(2)) in THUMBNAIL_SIZES:
+        return match.group(1)
+    return None
+
+
+def image_url(kind, filename, size):
+    """URL of the `size` px variant of an uploaded image (the route falls back to the original)"""
+    return f"/uploads/{kind}/{variant_name(filename, size)}"
+
+
+def logo_url(filename, size=128):
+    return image_url("logos", filename, size) if filename else DEFAULT_LOGO_URL
+
+
+@task("make_thumbnails")
+def make_thumbnails(kind, filename):
+    """Write every THUMBNAIL_SIZES variant of an uploaded image"""
+    if Image is None:
+        return
+    name = os.path.basename(filename)
+    try:
+        with storage.local_file(f"{kind}/{name}") as path, Image.open(path) as img:
+            img = ImageOps.exif_transpose(img)
+            img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+            for size in sorted(THUMBNAIL_SIZES, reverse=True):
+                img.thumbnail((size, size), Image.LANCZOS)
+                out = io.BytesIO()
+                img.save(out, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, method=4)
+                out.seek(0)
+                storage.save(f"{kind}/{variant_name(name, size)}", out)
+    except FileNotFoundError:
+        return  # replaced or removed before the task ran
+
+
+def schedule_thumbnails(kind, filename, owner=None):
+    """Queue variant generation for a freshly saved image; returns the task id"""
+    return enqueue("make_thumbnails", kind, filename, owner=owner)
+
+
+def remove_variants(kind, filename):
+    """Delete the variants of an image that is being removed"""
+    for size in THUMBNAIL_SIZES:
+        storage.delete(f"{kind}/{variant_name(os.path.basename(filename), size)}")
+
+
+def remove_image(kind, filename):
+    """Delete a replaced image and its variants"""
+    if not filename:
+        return
+    name = os.path.basename(filename)
+    storage.delete(f"{kind}/{name}")
+    remove_variants(kind, name)
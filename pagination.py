@@ -0,0 +1,69 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(sort_value, row_id):
+    """Opaque cursor for the row at (sort_value, row_id)"""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        (sort_value, row_id) or None if the cursor is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_clause(sort_column, id_column, after):
+    """
+    WHERE fragment selecting rows strictly after `after` in
+    `ORDER BY sort_column DESC, id_column DESC` order.
+
+    Spelled out instead of a row comparison so MySQL can range-scan the
+    (…, sort_column, id_column) index.
+    """
+    sort_value, row_id = after
+    return (
+        f"({sort_column} < %s OR ({sort_column} = %s AND {id_column} < %s))",
+        [sort_value, sort_value, row_id],
+    )
+
+
+def next_cursor(rows, has_next, sort_key, id_key="id"):
+    """Cursor pointing after the last row of a page, or None on the last page"""
+    if not has_next or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[sort_key], last[id_key])
+
+
+def page_args(args):
+    """
+    Parse ?page= / ?cursor= query args.
+
+    Returns:
+        (page, after, error) – after is the decoded cursor or None
+    """
+    try:
+        page = int(args.get("page", 1))
+    except ValueError:
+        page = 1
+    page = max(1, page)
+
+    token = args.get("cursor")
+    if not token:
+        return page, None, None
+    after = decode_cursor(token)
+    if after is None:
+        return page, None, "Invalid cursor"
+    return page, after, None
@@ -0,0 +1,203 @@
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import NamedTuple
+from flask import request, session
+from config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_URL,
+    CONCURRENCY_AUTH,
+    CONCURRENCY_APPLY,
+    CONCURRENCY_EXPORT,
+)
+from cache import LocalSharedStore, redis
+
+# Request admission control.
+#
+# - rate_limit(): per-key request rates (client IP, login identifier, user
+#   id), enforced with token buckets in this process ("memory") or sliding
+#   window counters shared through Redis ("shared").
+# - admission(): caps the requests of an endpoint class that run at once in
+#   this process, so expensive routes (PBKDF2, resume uploads) are turned
+#   away before they take a database connection.
+#
+# Both reject with RateLimited, which the app answers with 429 + Retry-After.
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after, message="Too many requests, please retry later"):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after + 0.999))
+        self.message = message
+
+
+class Rule(NamedTuple):
+    limit: int
+    period: int  # seconds
+
+
+def parse_rule(text):
+    """ "10/minute" -> Rule(10, 60); also accepts "10/30" (seconds)"""
+    count, _, per = text.partition("/")
+    period = PERIODS.get(per.strip().rstrip("s")) or int(per)
+    return Rule(int(count), period)
+
+
+# -------------------- BACKENDS --------------------
+class TokenBucketLimiter:
+    """
+    In-process token buckets: each key holds up to `limit` tokens that refill
+    at limit/period per second. The least recently used buckets are dropped
+    beyond max_keys (a dropped bucket starts full again).
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def hit(self, key, rule):
+        """Take one token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        rate = rule.limit / rule.period
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (rule.limit, now))
+            tokens = min(rule.limit, tokens + (now - updated_at) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding window counters in Redis (or LocalSharedStore), shared by every
+    worker. The count of the previous fixed window is weighted by how much
+    of it still overlaps the sliding window; INCR keeps updates atomic.
+    """
+
+    def __init__(self, client, prefix="jobportal:rl:"):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key, rule):
+        now = time.time()
+        window = int(now // rule.period)
+        elapsed = now - window * rule.period
+        current_key = f"{self.prefix}{key}:{window}"
+        previous = int(self.client.get(f"{self.prefix}{key}:{window - 1}") or 0)
+        current = self.client.incr(current_key)
+        if current == 1:
+            self.client.expire(current_key, rule.period * 2)
+        weight = (rule.period - elapsed) / rule.period
+        if previous * weight + current <= rule.limit:
+            return 0
+        return rule.period - elapsed
+
+
+class NullLimiter:
+    """Rate limiting disabled."""
+
+    def hit(self, key, rule):
+        return 0
+
+
+def create_limiter(backend=RATE_LIMIT_BACKEND, url=RATE_LIMIT_URL):
+    if backend == "memory":
+        return TokenBucketLimiter()
+    if backend == "shared":
+        if not url:
+            return SlidingWindowLimiter(LocalSharedStore())
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_URL is set but the redis package is not installed")
+        return SlidingWindowLimiter(redis.Redis.from_url(url))
+    if backend == "none":
+        return NullLimiter()
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+limiter = create_limiter()
+
+
+# -------------------- KEYS --------------------
+def client_ip():
+    # behind a reverse proxy, wrap the app in werkzeug's ProxyFix so this is the client
+    return request.remote_addr
+
+
+def login_identifier():
+    data = request.get_json(silent=True) or {}
+    identifier = data.get("identifier")
+    return str(identifier).strip().lower() if identifier else None
+
+
+def session_user():
+    user = session.get("user")
+    return f"{user['role']}:{user['id']}" if user else None
+
+
+# -------------------- DECORATORS --------------------
+def rate_limit(name, rule, key_func=client_ip):
+    """Allow `rule` (e.g. "5/minute") requests per key_func() value to the route"""
+    rule = parse_rule(rule) if isinstance(rule, str) else rule
+
+    def decorator(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            key = key_func()
+            if key is not None:
+                wait = limiter.hit(f"{name}:{key}", rule)
+                if wait:
+                    raise RateLimited(wait)
+            return fn(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+class ConcurrencyLimiter:
+    """Non-blocking cap on requests in flight; over the cap is rejected at once."""
+
+    def __init__(self, name, max_concurrent):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+        self.rejected = 0
+
+    def __enter__(self):
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise RateLimited(1, "Server busy, please retry")
+        return self
+
+    def __exit__(self, *exc):
+        if self._slots is not None:
+            self._slots.release()
+
+
+ENDPOINT_CLASSES = {
+    "auth": ConcurrencyLimiter("auth", CONCURRENCY_AUTH),
+    "apply": ConcurrencyLimiter("apply", CONCURRENCY_APPLY),
+    "export": ConcurrencyLimiter("export", CONCURRENCY_EXPORT),
+}
+
+
+def admission(endpoint_class):
+    """Run the route under the concurrency cap of `endpoint_class`"""
+    gate = ENDPOINT_CLASSES[endpoint_class]
+
+    def decorator(fn):
+        @wraps(fn)
+        def decorated(*args, **kwargs):
+            with gate:
+                return fn(*args, **kwargs)
+        return decorated
+    return decorator
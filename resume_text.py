@@ -0,0 +1,144 @@
+import re
+import zipfile
+from html import unescape
+from config import db_cursor
+from resume_upload import resume_key
+from storage import storage
+from search import FulltextSearch, tokenize
+from tasks import task, enqueue
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # in requirements.txt; without it PDFs fail extraction
+    PdfReader = None
+    print("[EXTRACT] pypdf is not installed; PDF resumes cannot be searched (pip install pypdf)")
+
+MAX_TEXT_LENGTH = 200_000  # characters kept per resume
+
+DOCX_PARAGRAPH_RE = re.compile(r"</w:p>")
+DOCX_TEXT_RE = re.compile(r"<w:t[^>]*>([^<]*)</w:t>")
+
+
+# -------------------- EXTRACTION --------------------
+def _pdf_text(filepath):
+    reader = PdfReader(filepath)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _docx_text(filepath):
+    with zipfile.ZipFile(filepath) as docx:
+        xml = docx.read("word/document.xml").decode("utf-8", "replace")
+    paragraphs = DOCX_PARAGRAPH_RE.split(xml)
+    return "\n".join(
+        "".join(unescape(t) for t in DOCX_TEXT_RE.findall(p)) for p in paragraphs
+    ).strip()
+
+
+def extract_text(filepath):
+    """
+    Pull plain text out of a stored resume.
+
+    Returns:
+        (status, text) – status is "done", "unsupported" or "failed"
+    """
+    ext = filepath.rsplit(".", 1)[-1].lower()
+    try:
+        if ext == "pdf":
+            if PdfReader is None:
+                raise RuntimeError("pypdf is not installed")
+            text = _pdf_text(filepath)
+        elif ext == "docx":
+            text = _docx_text(filepath)
+        else:
+            return "unsupported", ""
+    except Exception as e:
+        print(f"[EXTRACT ERROR] {filepath}: {e}")
+        return "failed", ""
+    return "done", " ".join(text.split())[:MAX_TEXT_LENGTH]
+
+
+@task("extract_resume")
+def extract_resume(path):
+    """Extract one blob into resume_texts (idempotent)"""
+    key = resume_key(path)
+    try:
+        with storage.local_file(key) as filepath:
+            status, text = extract_text(filepath)
+    except (FileNotFoundError, ValueError):  # missing blob or unusable name
+        status, text = "failed", ""
+    with db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """INSERT INTO resume_texts (path, status, content) VALUES (%s, %s, %s)
+               ON DUPLICATE KEY UPDATE status = VALUES(status), content = VALUES(content),
+                                       extracted_at = CURRENT_TIMESTAMP""",
+            (path, status, text),
+        )
+    return status
+
+
+def extract_pending(limit=500):
+    """Extract blobs that have no resume_texts row yet; returns how many were processed"""
+    with db_cursor() as cursor:
+        cursor.execute(
+            """SELECT b.path FROM resume_blobs b
+               LEFT JOIN resume_texts t ON t.path = b.path
+               WHERE t.path IS NULL
+               LIMIT %s""",
+            (limit,),
+        )
+        paths = [row[0] for row in cursor.fetchall()]
+    for path in paths:
+        extract_resume(path)
+    return len(paths)
+
+
+def schedule_extraction(path, owner=None):
+    """Queue text extraction for a newly stored blob; returns the task id"""
+    return enqueue("extract_resume", path, owner=owner)
+
+
+# -------------------- SEARCH --------------------
+FULLTEXT = FulltextSearch()  # which tokens ft_resume_content indexes
+
+
+def search_applicants(cursor, job_id, q, limit, offset=0):
+    """
+    Applicants of a job whose resume text matches every keyword of q,
+    best matches first. Keywords the ft_resume_content index skips (too
+    short or stopwords, e.g. "qa", "go", "c") are matched with LIKE over the
+    resume texts of this job's applicants and do not add to the score.
+    """
+    tokens = sorted(set(tokenize(q)))
+    if not tokens:
+        return []
+    query = " ".join(f"+{token}*" for token in tokens if FULLTEXT.indexed(token))
+    skipped = [token for token in tokens if not FULLTEXT.indexed(token)]
+
+    conditions, params = ["a.job_id=%s"], [job_id]
+    if query:
+        score = "MATCH(t.content) AGAINST (%s IN BOOLEAN MODE)"
+        conditions.append(score)
+        params = [query, job_id, query]
+    else:
+        score = "0"
+    for token in skipped:
+        conditions.append("t.content LIKE %s")
+        params.append(f"%{token}%")
+    cursor.execute(
+        f"""SELECT a.id AS application_id,
+                   u.id AS user_id,
+                   u.name,
+                   u.email,
+                   u.mobile,
+                   a.applied_at,
+                   a.resume_path,
+                   {score} AS score
+            FROM applications a
+            JOIN resume_texts t ON t.path = a.resume_path
+            JOIN users u ON a.user_id = u.id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score DESC, a.applied_at DESC, a.id DESC
+            LIMIT %s OFFSET %s""",
+        tuple(params + [limit, offset]),
+    )
+    return cursor.fetchall()
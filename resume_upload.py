@@ -1,15 +1,96 @@
 import os
-from werkzeug.utils import secure_filename
-from datetime import datetime
-from config import RESUME_FOLDER, allowed_resume_file
+import re
+import hashlib
+import tempfile
+from typing import NamedTuple
+from config import RESUME_FOLDER, MAX_FILE_SIZE, allowed_resume_file, db_cursor
+from storage import storage
 
-def save_resume(file, user_id: int, job_id: int) -> tuple[str | None, str | None]:
+CHUNK_SIZE = 64 * 1024
+
+# Resumes are content addressed: storage key resumes/ab/cd/<sha256>.<ext>.
+# applications.resume_path holds the part below resumes/ and points at a
+# resume_blobs row; a blob is garbage once no application references it.
+# Uploads are staged in RESUME_FOLDER on local disk while being hashed.
+BLOB_NAME_RE = re.compile(r"^([0-9a-f]{64})\.([a-z0-9]+)$")
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+class StagedResume(NamedTuple):
+    """An uploaded resume written to a temp file, not yet stored."""
+    temp_path: str
+    path: str       # blob path below resumes/
+    sha256: str
+    size: int
+
+
+def blob_path(sha256: str, ext: str) -> str:
+    """Sharded path of a blob, relative to resumes/"""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}.{ext}"
+
+
+def resume_key(name: str) -> str | None:
+    """
+    Storage key of a stored resume given its blob path or bare file name
+    (as shown to employers). Legacy flat names resolve to resumes/<name>.
+    Returns None for names that cannot be a resume.
+    """
+    name = os.path.basename(name)
+    match = BLOB_NAME_RE.match(name)
+    if match:
+        return f"resumes/{blob_path(match.group(1), match.group(2))}"
+    if not name or name.startswith("."):
+        return None
+    return f"resumes/{name}"
+
+
+def stream_to_temp(stream, folder: str, max_size: int) -> tuple[str, str, int]:
+    """
+    Copy `stream` into a temporary file in `folder` in fixed-size chunks.
+
+    Memory use is one chunk regardless of the upload size. The copy stops
+    as soon as more than `max_size` bytes have been read.
+
+    Returns:
+        (temp_path, sha256_hexdigest, size)
+
+    Raises:
+        FileTooLarge: the stream exceeded max_size (the temp file is removed)
     """
-    Save the uploaded resume file with a safe, unique name.
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLarge
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+
+def save_resume(file) -> tuple[StagedResume | None, str | None]:
+    """
+    Stream the uploaded resume to a temp file and work out its blob path.
+
+    The bytes only become visible once store_resume() runs inside the
+    transaction that references them; call discard_resume() afterwards in
+    every case.
 
     Returns:
-        (filename, error_message)
-        - filename (str): saved resume filename (not full path)
+        (staged, error_message)
+        - staged (StagedResume): the staged upload, None on failure
         - error_message (str): None if success, else reason for failure
     """
     if not file or file.filename == "":
@@ -18,19 +99,129 @@ def save_resume(file, user_id: int, job_id: int) -> tuple[str | None, str | None
     # Validate file extension
     if not allowed_resume_file(file.filename):
         return None, "Invalid file type"
+    ext = file.filename.rsplit(".", 1)[1].lower()
 
-    # Make filename safe
-    filename = secure_filename(file.filename)
-
-    # Add timestamp, user_id and job_id for uniqueness
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    unique_filename = f"user{user_id}_job{job_id}_{timestamp}_{filename}"
-
-    # Save file in resume upload folder
-    filepath = os.path.join(RESUME_FOLDER, unique_filename)
     try:
-        file.save(filepath)
+        temp_path, sha256, size = stream_to_temp(file.stream, RESUME_FOLDER, MAX_FILE_SIZE)
+    except FileTooLarge:
+        return None, f"File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)"
     except Exception as e:
         return None, f"Error saving file: {e}"
 
-    return unique_filename, None
+    return StagedResume(temp_path, blob_path(sha256, ext), sha256, size), None
+
+
+def store_resume(cursor, staged: StagedResume) -> bool:
+    """
+    Make the staged bytes available at their blob path.
+
+    Must run in the transaction that inserts the referencing application:
+    the upsert locks the resume_blobs row until commit, which serializes it
+    with release_resumes() so a blob can't be collected between being
+    found in storage and being referenced. Identical content already stored
+    is reused and the staged copy is dropped by discard_resume().
+
+    Returns True if the content was new to the store.
+    """
+    cursor.execute(
+        """INSERT INTO resume_blobs (path, sha256, size) VALUES (%s, %s, %s)
+           ON DUPLICATE KEY UPDATE size = VALUES(size)""",
+        (staged.path, staged.sha256, staged.size),
+    )
+    key = f"resumes/{staged.path}"
+    if storage.exists(key):
+        return False
+    storage.save_file(key, staged.temp_path, move=True)
+    return True
+
+
+def discard_resume(staged: StagedResume | None) -> None:
+    """Remove the staged temp file if store_resume() did not move it into place"""
+    if staged is None:
+        return
+    try:
+        os.remove(staged.temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def release_resumes(paths) -> int:
+    """
+    Garbage-collect blobs that no application references any more.
+
+    Called after applications are deleted (or an application insert was
+    rejected). Returns the number of files removed.
+    """
+    removed = 0
+    for path in set(paths):
+        if not path:
+            continue
+        with db_cursor(commit=True) as cursor:
+            cursor.execute("SELECT path FROM resume_blobs WHERE path=%s FOR UPDATE", (path,))
+            cursor.fetchall()
+            cursor.execute(
+                "SELECT COUNT(*) FROM applications WHERE resume_path=%s FOR SHARE", (path,)
+            )
+            if cursor.fetchone()[0]:
+                continue
+            cursor.execute("DELETE FROM resume_blobs WHERE path=%s", (path,))
+            key = resume_key(path)
+            if key and storage.delete(key):
+                removed += 1
+    return removed
+
+
+def _hash_file(filepath: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def migrate_legacy_resumes(dry_run: bool = False) -> dict:
+    """
+    Move resumes saved under the old user{id}_job{id}_{timestamp}_ names into
+    the content-addressed store, pointing every application at its blob and
+    dropping byte-identical copies. The legacy files are read from
+    RESUME_FOLDER on this node.
+    """
+    stats = {"files": 0, "duplicates": 0, "missing": 0, "bytes_freed": 0}
+    with db_cursor() as cursor:
+        cursor.execute(
+            "SELECT id, resume_path FROM applications WHERE LOCATE('/', resume_path) = 0"
+        )
+        by_path = {}
+        for app_id, path in cursor.fetchall():
+            by_path.setdefault(path, []).append(app_id)
+
+    seen = set()
+    for legacy, app_ids in by_path.items():
+        src = os.path.join(RESUME_FOLDER, os.path.basename(legacy))
+        if not os.path.isfile(src):
+            stats["missing"] += 1
+            continue
+        sha256, size = _hash_file(src)
+        ext = legacy.rsplit(".", 1)[-1].lower()
+        staged = StagedResume(src, blob_path(sha256, ext), sha256, size)
+        stats["files"] += 1
+        duplicate = staged.path in seen or storage.exists(f"resumes/{staged.path}")
+        seen.add(staged.path)
+        if duplicate:
+            stats["duplicates"] += 1
+            stats["bytes_freed"] += size
+        if dry_run:
+            continue
+
+        placeholders = ", ".join(["%s"] * len(app_ids))
+        with db_cursor(commit=True) as cursor:
+            store_resume(cursor, staged)
+            cursor.execute(
+                f"""UPDATE applications SET resume_path=%s, resume_sha256=%s
+                    WHERE id IN ({placeholders})""",
+                (staged.path, sha256, *app_ids),
+            )
+        discard_resume(staged)  # only still there if it was a duplicate
+    return stats
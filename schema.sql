@@ -15,7 +15,8 @@ CREATE TABLE users (
   mobile VARCHAR(15) NOT NULL UNIQUE,
   password VARCHAR(255) NOT NULL,
   profile_pic VARCHAR(255) DEFAULT NULL,
-  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  KEY idx_users_profile_pic (profile_pic)  -- upload reconciliation (`flask reconcile-uploads`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 -- ---------------------------
@@ -30,7 +31,10 @@ CREATE TABLE employers (
   mobile VARCHAR(15) UNIQUE,
   password VARCHAR(255) NOT NULL,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  logo_filename VARCHAR(255) DEFAULT NULL
+  logo_filename VARCHAR(255) DEFAULT NULL,
+  profile_pic VARCHAR(255) DEFAULT NULL,
+  KEY idx_employers_logo (logo_filename),
+  KEY idx_employers_profile_pic (profile_pic)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 -- ---------------------------
@@ -40,20 +44,40 @@ DROP TABLE IF EXISTS jobs;
 CREATE TABLE jobs (
   id INT AUTO_INCREMENT PRIMARY KEY,
   title VARCHAR(150) NOT NULL,
-  company VARCHAR(255) NOT NULL,
-  logo VARCHAR(255) DEFAULT NULL,
+  company VARCHAR(255) NOT NULL,  -- search copy of employers.organization_name; shown from the employer
   location VARCHAR(150) NOT NULL,
   description TEXT,
   posted_by INT NOT NULL,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   experience VARCHAR(50) NOT NULL,
+  experience_years TINYINT UNSIGNED DEFAULT NULL,  -- parsed from experience by the app, for filtering
   salary DECIMAL(10,2) NOT NULL,
   job_type ENUM('Full-Time','Part-Time','Internship','Remote') DEFAULT 'Full-Time',
   deadline DATE DEFAULT NULL,
-  logo_filename VARCHAR(255) DEFAULT NULL,
+  applications_count INT UNSIGNED NOT NULL DEFAULT 0,  -- maintained by the app, repaired by `flask reconcile-counts`
+  KEY idx_jobs_created (created_at, id),
+  KEY idx_jobs_employer_created (posted_by, created_at, id),
+  KEY idx_jobs_type_created (job_type, created_at, id),          -- /api/jobs filters
+  KEY idx_jobs_location_created (location, created_at, id),
+  KEY idx_jobs_salary (salary),
+  FULLTEXT KEY ft_jobs_search (title, company, location),
   CONSTRAINT fk_jobs_employer FOREIGN KEY (posted_by) REFERENCES employers(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+-- ---------------------------
+-- Table: job_facets
+-- Jobs per job_type, location and salary bucket, for the /api/jobs filters.
+-- Maintained by the app with the jobs, repaired by `flask reconcile-facets`.
+-- ---------------------------
+DROP TABLE IF EXISTS job_facets;
+CREATE TABLE job_facets (
+  facet VARCHAR(20) NOT NULL,  -- job_type, location or salary (bucket lower bound)
+  value VARCHAR(150) NOT NULL,
+  job_count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (facet, value),
+  KEY idx_job_facets_count (facet, job_count)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
 -- ---------------------------
 -- Table: applications
 -- ---------------------------
@@ -63,7 +87,40 @@ CREATE TABLE applications (
   user_id INT NOT NULL,
   job_id INT NOT NULL,
   resume_path VARCHAR(255) NOT NULL,
+  resume_sha256 CHAR(64) DEFAULT NULL,
   applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_app_user_job (user_id, job_id),
+  KEY idx_app_resume (resume_path),
+  KEY idx_app_job_applied (job_id, applied_at, id),
   CONSTRAINT fk_app_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
   CONSTRAINT fk_app_job FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- ---------------------------
+-- Table: resume_blobs
+-- ---------------------------
+-- One row per stored resume file (uploads/resumes/ab/cd/<sha256>.<ext>).
+-- Its reference count is the number of applications whose resume_path
+-- points at it; unreferenced blobs are garbage-collected.
+DROP TABLE IF EXISTS resume_blobs;
+CREATE TABLE resume_blobs (
+  path VARCHAR(255) PRIMARY KEY,
+  sha256 CHAR(64) NOT NULL,
+  size INT UNSIGNED NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- ---------------------------
+-- Table: resume_texts
+-- ---------------------------
+-- Plain text extracted from each resume blob in the background, indexed
+-- for employer-side applicant search.
+DROP TABLE IF EXISTS resume_texts;
+CREATE TABLE resume_texts (
+  path VARCHAR(255) PRIMARY KEY,
+  status ENUM('done','unsupported','failed') NOT NULL,
+  content MEDIUMTEXT,
+  extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  FULLTEXT KEY ft_resume_content (content),
+  CONSTRAINT fk_resume_text_blob FOREIGN KEY (path) REFERENCES resume_blobs(path) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -0,0 +1,325 @@
+import re
+import math
+import time
+import heapq
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from config import (
+    SEARCH_BACKEND,
+    SEARCH_INDEX_REFRESH,
+    SEARCH_FULLTEXT_MIN_TOKEN,
+    SEARCH_FULLTEXT_STOPWORDS,
+)
+
+# Fields that take part in job search, with their ranking weight
+SEARCH_FIELDS = {"title": 3.0, "company": 2.0, "location": 1.0}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# InnoDB's default FULLTEXT stopword list (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD)
+INNODB_STOPWORDS = frozenset("""
+    a about an are as at be by com de en for from how i in is it la of on or
+    that the this to was what when where who will with und www
+""".split())
+
+
+def tokenize(text):
+    """Lowercase and split text into alphanumeric tokens"""
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def boolean_query(q):
+    """MySQL boolean-mode query requiring every token as a prefix ("pyth dev" -> "+pyth* +dev*")"""
+    return " ".join(f"+{token}*" for token in tokenize(q))
+
+
+# =========================================================
+# -------------------- LIKE (legacy) ----------------------
+# =========================================================
+class LikeSearch:
+    """Original leading-wildcard LIKE scan, kept as a fallback and benchmark baseline."""
+
+    name = "like"
+
+    def search(self, cursor, q, limit, offset, posted_by=None, where=None):
+        sql = "SELECT j.id FROM jobs j WHERE (j.title LIKE %s OR j.company LIKE %s OR j.location LIKE %s)"
+        params = [f"%{q}%", f"%{q}%", f"%{q}%"]
+        if posted_by is not None:
+            sql += " AND j.posted_by=%s"
+            params.append(posted_by)
+        if where:
+            sql += f" AND {where[0]}"
+            params.extend(where[1])
+        sql += " ORDER BY j.created_at DESC, j.id DESC LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+        cursor.execute(sql, tuple(params))
+        return [row_id(row) for row in cursor.fetchall()]
+
+    def add(self, job):
+        pass
+
+    def remove(self, job_id):
+        pass
+
+
+# =========================================================
+# -------------------- MYSQL FULLTEXT ---------------------
+# =========================================================
+class FulltextSearch:
+    """MySQL FULLTEXT index (ft_jobs_search) queried in boolean mode with prefix terms."""
+
+    name = "fulltext"
+
+    def __init__(self, min_token=SEARCH_FULLTEXT_MIN_TOKEN, stopwords=SEARCH_FULLTEXT_STOPWORDS):
+        self.min_token = min_token
+        self.stopwords = INNODB_STOPWORDS if stopwords else frozenset()
+        self.fallback = LikeSearch()
+
+    def indexed(self, token):
+        """Whether MySQL puts `token` in the FULLTEXT index at all"""
+        return len(token) >= self.min_token and token not in self.stopwords
+
+    def search(self, cursor, q, limit, offset, posted_by=None, where=None):
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+        if not all(self.indexed(token) for token in tokens):
+            # "hr", "qa", "ui", "it" never match in the index; the LIKE scan finds them
+            return self.fallback.search(cursor, q, limit, offset, posted_by, where)
+        query = boolean_query(q)
+        sql = """SELECT j.id, MATCH(j.title, j.company, j.location) AGAINST (%s IN BOOLEAN MODE) AS score
+                 FROM jobs j
+                 WHERE MATCH(j.title, j.company, j.location) AGAINST (%s IN BOOLEAN MODE)"""
+        params = [query, query]
+        if posted_by is not None:
+            sql += " AND j.posted_by=%s"
+            params.append(posted_by)
+        if where:
+            sql += f" AND {where[0]}"
+            params.extend(where[1])
+        sql += " ORDER BY score DESC, j.created_at DESC, j.id DESC LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+        cursor.execute(sql, tuple(params))
+        return [row_id(row) for row in cursor.fetchall()]
+
+    def add(self, job):
+        pass  # maintained by MySQL
+
+    def remove(self, job_id):
+        pass
+
+
+# =========================================================
+# -------------------- IN-PROCESS INDEX -------------------
+# =========================================================
+class InvertedIndex:
+    """
+    In-process inverted index over jobs.title/company/location.
+
+    Every query token must match (as a prefix) a token of the job. Results are
+    ranked by a field-weighted tf-idf score and ties broken by recency, so the
+    newest matching jobs come first as they did with the LIKE scan.
+
+    The index is loaded from MySQL on first use and reloaded every
+    SEARCH_INDEX_REFRESH seconds so that jobs posted through other workers
+    show up; jobs posted or deleted through this worker are applied
+    immediately via add()/remove().
+    """
+
+    name = "memory"
+
+    def __init__(self, refresh_interval=SEARCH_INDEX_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._clear()
+
+    def _clear(self):
+        self.postings = defaultdict(dict)   # token -> {job_id: weighted term frequency}
+        self.docs = {}                      # job_id -> (sort_key, posted_by, tokens)
+        self.vocabulary = []                # sorted tokens, for prefix lookup
+        self._vocabulary_dirty = False
+
+    # ---------- maintenance ----------
+    def load(self, rows):
+        """Replace the index contents with the given job rows"""
+        with self._lock:
+            self._clear()
+            for job in rows:
+                self._add(job)
+            self._loaded_at = time.monotonic()
+
+    def add(self, job):
+        with self._lock:
+            if self._loaded_at is None:
+                return  # not built yet; the first search loads it from MySQL
+            self._remove(job["id"])
+            self._add(job)
+
+    def remove(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _add(self, job):
+        weights = defaultdict(float)
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(job.get(field)):
+                weights[token] += weight
+        for token, weight in weights.items():
+            if token not in self.postings:
+                self._vocabulary_dirty = True
+            self.postings[token][job["id"]] = weight
+        created_at = job.get("created_at")
+        sort_key = (created_at.timestamp() if created_at else 0.0, job["id"])
+        self.docs[job["id"]] = (sort_key, job.get("posted_by"), tuple(weights))
+
+    def _remove(self, job_id):
+        doc = self.docs.pop(job_id, None)
+        if not doc:
+            return
+        for token in doc[2]:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(job_id, None)
+            if not posting:
+                del self.postings[token]
+                self._vocabulary_dirty = True
+
+    def _stale(self):
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.refresh_interval
+        )
+
+    def _ensure_loaded(self, cursor):
+        if not self._stale():
+            return
+        with self._lock:
+            # requests that saw the index stale queue here; only the first reloads
+            if not self._stale():
+                return
+            cursor.execute("SELECT id, title, company, location, posted_by, created_at FROM jobs")
+            columns = [c[0] for c in cursor.description]
+            rows = [row if isinstance(row, dict) else dict(zip(columns, row)) for row in cursor.fetchall()]
+            self.load(rows)
+
+    # ---------- querying ----------
+    def _expand(self, token):
+        """All indexed tokens starting with `token`"""
+        if self._vocabulary_dirty:
+            self.vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        i = bisect_left(self.vocabulary, token)
+        matches = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            matches.append(self.vocabulary[i])
+            i += 1
+        return matches
+
+    def query(self, q, posted_by=None, limit=None):
+        """Return ranked job ids matching every token of q (the top `limit` if given)"""
+        tokens = tokenize(q)
+        if not tokens:
+            return []
+        with self._lock:
+            total = len(self.docs) or 1
+            scores = None
+            for token in dict.fromkeys(tokens):
+                token_scores = defaultdict(float)
+                for term in self._expand(token):
+                    posting = self.postings[term]
+                    idf = math.log(1 + total / len(posting))
+                    # exact matches rank above prefix-only matches
+                    boost = 1.0 if term == token else 0.5
+                    for job_id, tf in posting.items():
+                        token_scores[job_id] += tf * idf * boost
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {j: s + token_scores[j] for j, s in scores.items() if j in token_scores}
+                if not scores:
+                    return []
+
+            docs = self.docs
+            if posted_by is not None:
+                scores = {j: s for j, s in scores.items() if docs[j][1] == posted_by}
+            rank = lambda j: (scores[j], docs[j][0])
+            if limit is None:
+                return sorted(scores, key=rank, reverse=True)
+            return heapq.nlargest(limit, scores, key=rank)
+
+    def search(self, cursor, q, limit, offset, posted_by=None, where=None):
+        self._ensure_loaded(cursor)
+        if where:
+            # the index only knows the search fields; other filters are checked in MySQL
+            return filter_ids(cursor, self.query(q, posted_by), where, offset + limit)[offset:]
+        return self.query(q, posted_by, offset + limit)[offset:]
+
+
+# -------------------- HELPERS --------------------
+def row_id(row):
+    return row["id"] if isinstance(row, dict) else row[0]
+
+
+BACKENDS = {
+    LikeSearch.name: LikeSearch,
+    FulltextSearch.name: FulltextSearch,
+    InvertedIndex.name: InvertedIndex,
+}
+
+
+def create_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown search backend: {name}") from None
+
+
+search_backend = create_backend(SEARCH_BACKEND)
+
+
+def search_job_ids(cursor, q, limit, offset=0, posted_by=None, where=None):
+    """
+    Ranked ids of jobs matching q, using the configured backend.
+
+    `where` is an optional (clause, params) SQL condition on jobs j that
+    results must also meet (see facets.filter_clause).
+    """
+    return search_backend.search(cursor, q, limit, offset, posted_by, where)
+
+
+def id_filter(ids):
+    """SQL clause and params restricting jobs j to the given ids"""
+    placeholders = ", ".join(["%s"] * len(ids))
+    return f"j.id IN ({placeholders})", list(ids)
+
+
+def filter_ids(cursor, ids, where, limit, batch=1000):
+    """The first `limit` of the ranked ids whose jobs meet the SQL condition `where`"""
+    clause, params = where
+    kept = []
+    for start in range(0, len(ids), batch):
+        chunk = ids[start:start + batch]
+        id_clause, id_params = id_filter(chunk)
+        cursor.execute(f"SELECT j.id FROM jobs j WHERE {id_clause} AND {clause}", tuple(id_params + params))
+        matched = {row_id(row) for row in cursor.fetchall()}
+        kept.extend(job_id for job_id in chunk if job_id in matched)
+        if len(kept) >= limit:
+            break
+    return kept[:limit]
+
+
+def order_by_ids(rows, ids):
+    """Reorder fetched rows to follow the ranked order of ids"""
+    by_id = {row["id"]: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def index_job(job):
+    search_backend.add(job)
+
+
+def unindex_job(job_id):
+    search_backend.remove(job_id)
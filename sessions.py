@@ -0,0 +1,128 @@
+import time
+import secrets
+import threading
+from flask.sessions import SessionInterface, SecureCookieSession, SecureCookieSessionInterface
+from config import SESSION_BACKEND, SESSION_URL, SESSION_MAX_ENTRIES, SESSION_SWEEP_INTERVAL
+from cache import LRUCache, LocalSharedStore, SharedCache, MISSING, redis
+
+# Server-side sessions.
+#
+# The cookie only carries an opaque random session id; the session dict
+# lives in a store (per-process LRU or Redis) keyed by that id. Requests
+# no longer ship and HMAC-verify the whole user dict, and the store is only
+# written when the session actually changed.
+
+
+class ServerSideSession(SecureCookieSession):
+    """Session dict plus the id it is stored under (None until first saved)."""
+
+    def __init__(self, initial=None, sid=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = sid is None
+        self.owner = _owner(self)
+
+
+def _owner(session):
+    user = dict.get(session, "user")
+    return (user.get("role"), user.get("id")) if user else None
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface backed by `store` (any cache.py backend).
+
+    - The session id is rotated whenever the logged-in user changes, so an
+      id seen before login is never authenticated (session fixation).
+    - Emptied sessions (logout) are deleted from the store.
+    - Expired entries are swept in bulk at most every `sweep_interval`
+      seconds, so idle sessions don't linger until LRU eviction.
+    """
+
+    def __init__(self, store, sweep_interval=SESSION_SWEEP_INTERVAL, prefix="session:"):
+        self.store = store
+        self.sweep_interval = sweep_interval
+        self.prefix = prefix
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._sweep_lock = threading.Lock()
+
+    def _key(self, sid):
+        return self.prefix + sid
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.store.get(self._key(sid))
+            if data is not MISSING:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession()
+
+    def save_session(self, app, session, response):
+        self.maybe_sweep()
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.sid is not None:
+                # logged out (or emptied): drop the stored copy and the cookie
+                self.store.delete(self._key(session.sid))
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app))
+            return
+
+        if not session.modified:
+            return
+
+        sid = session.sid
+        if sid is None or _owner(session) != session.owner:
+            if sid is not None:
+                self.store.delete(self._key(sid))
+            sid = secrets.token_urlsafe(32)
+
+        lifetime = int(app.permanent_session_lifetime.total_seconds())
+        self.store.set(self._key(sid), dict(session), ttl=lifetime)
+
+        if sid != session.sid:
+            response.set_cookie(
+                name,
+                sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+            session.sid = sid
+            session.owner = _owner(session)
+
+    def maybe_sweep(self):
+        """Purge expired sessions if the sweep interval has passed; returns how many"""
+        if time.monotonic() < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            return self.store.purge_expired()
+        finally:
+            self._sweep_lock.release()
+
+
+def create_session_interface(backend=SESSION_BACKEND, url=SESSION_URL):
+    if backend == "memory":
+        return ServerSideSessionInterface(LRUCache(max_entries=SESSION_MAX_ENTRIES))
+    if backend == "shared":
+        if not url:
+            return ServerSideSessionInterface(
+                SharedCache(LocalSharedStore(max_entries=SESSION_MAX_ENTRIES))
+            )
+        if redis is None:
+            raise RuntimeError("SESSION_URL is set but the redis package is not installed")
+        return ServerSideSessionInterface(SharedCache(redis.Redis.from_url(url)))
+    if backend == "cookie":
+        return SecureCookieSessionInterface()
+    raise ValueError(f"Unknown session backend: {backend}")
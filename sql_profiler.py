@@ -0,0 +1,246 @@
+import re
+import time
+import queue
+import threading
+from collections import deque
+from contextvars import ContextVar
+
+# Per-request SQL instrumentation.
+#
+# config.db_cursor asks current() for the active RequestProfile; outside a
+# profiled request (or with profiling off) that is None and db_cursor takes
+# its plain path, so the disabled cost is one ContextVar lookup per cursor.
+
+SELECT_RE = re.compile(r"^\s*(\(\s*)?select\b", re.IGNORECASE)
+PLACEHOLDER_LIST_RE = re.compile(r"%s(\s*,\s*%s)+")
+WHITESPACE_RE = re.compile(r"\s+")
+
+_current = ContextVar("sql_profile", default=None)
+
+
+def normalize(statement):
+    """Statement shape: IN-lists of any length and all whitespace collapse"""
+    statement = PLACEHOLDER_LIST_RE.sub("%s, ...", statement)
+    return WHITESPACE_RE.sub(" ", statement).strip()
+
+
+class RequestProfile:
+    """Queries and connection checkouts of one request."""
+
+    def __init__(self, route):
+        self.route = route
+        self.started = time.perf_counter()
+        self.queries = []  # (statement, params, seconds)
+        self.checkouts = 0
+        self.checkout_time = 0.0
+        self.status = None
+
+    @property
+    def query_time(self):
+        return sum(q[2] for q in self.queries)
+
+    def repeated(self, threshold):
+        """Statements run at least `threshold` times: likely N+1 loops"""
+        counts = {}
+        for statement, _, _ in self.queries:
+            shape = normalize(statement)
+            counts[shape] = counts.get(shape, 0) + 1
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+
+class ProfiledCursor:
+    """Cursor proxy that records every execute() in a RequestProfile."""
+
+    def __init__(self, cursor, profile):
+        self._cursor = cursor
+        self._profile = profile
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, statement, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(statement, params, *args, **kwargs)
+        finally:
+            self._profile.queries.append((statement, params, time.perf_counter() - start))
+
+    def executemany(self, statement, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(statement, seq_params, *args, **kwargs)
+        finally:
+            self._profile.queries.append((statement, None, time.perf_counter() - start))
+
+
+class SQLProfiler:
+    """
+    Collects per-request query counts and timings and aggregates them per route.
+
+    - Queries slower than `slow_ms` are kept in a ring buffer; SELECTs get an
+      EXPLAIN (at most `explain_per_request` per request and once per
+      statement shape every `explain_interval` seconds). The EXPLAINs run on
+      one background thread, so the request that was slow does not wait for
+      them and at most one extra connection is used; the plan shows up in
+      slow_queries() once it is done.
+    - A statement shape run `n_plus_one` or more times in one request is
+      flagged as a probable N+1.
+    - `log` is "off", "slow" (requests with slow queries or N+1) or "all".
+    """
+
+    def __init__(self, enabled=False, slow_ms=100, explain=True, explain_per_request=3,
+                 explain_interval=300, n_plus_one=5, log="slow", max_slow=200, explain_with=None,
+                 explain_backlog=100):
+        self.enabled = enabled
+        self.slow = slow_ms / 1000
+        self.explain = explain
+        self.explain_per_request = explain_per_request
+        self.explain_interval = explain_interval
+        self.n_plus_one = n_plus_one
+        self.log = log
+        self.explain_with = explain_with  # db_cursor-like factory for the EXPLAIN queries
+
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._slow_queries = deque(maxlen=max_slow)
+        self._explained = {}  # shape -> monotonic time of the last EXPLAIN
+        self._explain_queue = queue.Queue(maxsize=explain_backlog)
+        self._explain_thread = None
+
+    # ---------- request lifecycle ----------
+    def begin(self, route):
+        if self.enabled:
+            _current.set(RequestProfile(route))
+
+    def current(self):
+        return _current.get()
+
+    def end(self, status=None):
+        """Close the active profile, record it and return it (None if none was active)"""
+        profile = _current.get()
+        if profile is None:
+            return None
+        _current.set(None)
+        status = status or profile.status
+
+        elapsed = time.perf_counter() - profile.started
+        slow = [q for q in profile.queries if q[2] >= self.slow]
+        repeated = profile.repeated(self.n_plus_one)
+        entries = []
+
+        with self._lock:
+            stats = self._routes.setdefault(profile.route, {
+                "requests": 0, "queries": 0, "max_queries": 0, "query_ms": 0.0,
+                "checkouts": 0, "max_checkouts": 0, "checkout_ms": 0.0,
+                "request_ms": 0.0, "slow_queries": 0, "n_plus_one": 0,
+            })
+            stats["requests"] += 1
+            stats["queries"] += len(profile.queries)
+            stats["max_queries"] = max(stats["max_queries"], len(profile.queries))
+            stats["query_ms"] += profile.query_time * 1000
+            stats["checkouts"] += profile.checkouts
+            stats["max_checkouts"] = max(stats["max_checkouts"], profile.checkouts)
+            stats["checkout_ms"] += profile.checkout_time * 1000
+            stats["request_ms"] += elapsed * 1000
+            stats["slow_queries"] += len(slow)
+            stats["n_plus_one"] += bool(repeated)
+            for statement, params, seconds in slow:
+                entry = {
+                    "route": profile.route,
+                    "statement": normalize(statement),
+                    "ms": round(seconds * 1000, 3),
+                    "at": time.time(),
+                    "plan": None,
+                }
+                self._slow_queries.append(entry)
+                entries.append(entry)
+        if slow and self.explain:
+            self._queue_explains(slow, entries)
+
+        if self.log == "all" or (self.log == "slow" and (slow or repeated)):
+            print(
+                f"[SQL] {profile.route} {status or ''} queries={len(profile.queries)} "
+                f"conns={profile.checkouts} db={profile.query_time * 1000:.1f}ms "
+                f"checkout={profile.checkout_time * 1000:.1f}ms total={elapsed * 1000:.1f}ms"
+                + (f" slow={len(slow)}" if slow else "")
+            )
+            for shape, n in repeated.items():
+                print(f"[SQL N+1] {profile.route} ran {n}x: {shape[:200]}")
+        return profile
+
+    def _queue_explains(self, slow, entries):
+        """Hand the slow SELECTs of a request to the EXPLAIN thread; it fills in entries' plans"""
+        if self.explain_with is None:
+            return
+        queued = 0
+        now = time.monotonic()
+        for (statement, params, _), entry in zip(slow, entries):
+            shape = entry["statement"]
+            if queued >= self.explain_per_request or not SELECT_RE.match(statement):
+                continue
+            with self._lock:
+                if now - self._explained.get(shape, -self.explain_interval) < self.explain_interval:
+                    continue
+                self._explained[shape] = now
+                entry["plan"] = "pending"
+            self._start_explain_thread()
+            try:
+                self._explain_queue.put_nowait((statement, params, entry))
+                queued += 1
+            except queue.Full:
+                with self._lock:
+                    entry["plan"] = "skipped: EXPLAIN backlog full"
+                    del self._explained[shape]
+
+    def _start_explain_thread(self):
+        with self._lock:
+            if self._explain_thread is None:
+                self._explain_thread = threading.Thread(
+                    target=self._explain_worker, name="sql-explain", daemon=True
+                )
+                self._explain_thread.start()
+
+    def _explain_worker(self):
+        while True:
+            statement, params, entry = self._explain_queue.get()
+            try:
+                # a new thread has no active profile, so this query is not recorded
+                with self.explain_with(dictionary=True) as cursor:
+                    cursor.execute("EXPLAIN " + statement, params)
+                    plan = cursor.fetchall()
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+            with self._lock:
+                entry["plan"] = plan
+
+    # ---------- reporting ----------
+    def stats(self):
+        with self._lock:
+            routes = {}
+            for route, s in self._routes.items():
+                n = s["requests"]
+                routes[route] = {
+                    "requests": n,
+                    "queries_avg": round(s["queries"] / n, 2),
+                    "queries_max": s["max_queries"],
+                    "query_ms_avg": round(s["query_ms"] / n, 3),
+                    "connections_avg": round(s["checkouts"] / n, 2),
+                    "connections_max": s["max_checkouts"],
+                    "checkout_ms_avg": round(s["checkout_ms"] / n, 3),
+                    "request_ms_avg": round(s["request_ms"] / n, 3),
+                    "slow_queries": s["slow_queries"],
+                    "n_plus_one_requests": s["n_plus_one"],
+                }
+            return {"enabled": self.enabled, "slow_ms": self.slow * 1000, "routes": routes}
+
+    def slow_queries(self):
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._slow_queries)]
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._slow_queries.clear()
@@ -115,7 +115,8 @@ async function fetchAdminProfile() {
       document.getElementById("userMobile").textContent = data.user.mobile || "-";
 
       if (data.user.profile_pic) {
-        document.getElementById("profilePic").src = "/uploads/profile_pics/" + data.user.profile_pic;
+        document.getElementById("profilePic").src =
+          data.user.profile_pic_url || "/uploads/profile_pics/" + data.user.profile_pic;
       }
 
       // Hide logo field if already uploaded
@@ -225,7 +226,7 @@ async function fetchApplications(jobId) {
         document.getElementById("userMobile").textContent = data.job.organization_mobile || "-";
 
         if (data.job.logo_filename) {
-          document.getElementById("profilePic").src = "/uploads/logos/" + data.job.logo_filename;
+          document.getElementById("profilePic").src = data.job.logo_url;
         } else {
           document.getElementById("profilePic").src = "/static/images/default-user.png";
         }
@@ -233,6 +234,11 @@ async function fetchApplications(jobId) {
 
 
       if (data.applicants.length) {
+        const exportLink = document.getElementById("exportApplicants");
+        if (exportLink) {
+          exportLink.href = `/api/admin/applications/${jobId}/export`;
+          exportLink.style.display = "";
+        }
         data.applicants.forEach((app, i) => {
           const row = document.createElement("tr");
           row.innerHTML = `
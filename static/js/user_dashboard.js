@@ -28,7 +28,7 @@ async function fetchUserProfile() {
       document.getElementById("userMobile").textContent = data.user.mobile || "-";
       if (data.user.profile_pic) {
         document.getElementById("profilePic").src =
-          "/uploads/profile_pics/" + data.user.profile_pic;
+          data.user.profile_pic_url || "/uploads/profile_pics/" + data.user.profile_pic;
       }
     }
   } catch (err) {
@@ -59,7 +59,7 @@ document.getElementById("profileUpload")?.addEventListener("change", async funct
     const data = await res.json();
     if (res.ok && data.success) {
       document.getElementById("profilePic").src =
-        "/uploads/profile_pics/" + data.filename;
+        data.url || "/uploads/profile_pics/" + data.filename;
       showPageAlert("Profile updated", "success");
     } else {
       showPageAlert(data.message || "Failed to upload profile picture");
@@ -95,10 +95,61 @@ document.getElementById("logoutBtn")?.addEventListener("click", async () => {
   window.location.href = "/login";
 });
 
+// ---------------- Job Filters ----------------
+function filterParams() {
+  const params = new URLSearchParams();
+  const form = document.getElementById("jobFilters");
+  if (!form) return params;
+  const value = (name) => form.elements[name].value.trim();
+
+  if (value("job_type")) params.set("job_type", value("job_type"));
+  if (value("location")) params.set("location", value("location"));
+  if (value("salary")) {
+    const [min, max] = value("salary").split(":");
+    params.set("salary_min", min);
+    if (max) params.set("salary_max", max);
+  }
+  if (value("max_experience")) params.set("max_experience", value("max_experience"));
+  if (form.elements.open.checked) params.set("open", "1");
+  return params;
+}
+
+async function fetchFacets() {
+  const form = document.getElementById("jobFilters");
+  if (!form) return;
+  try {
+    const res = await fetch("/api/jobs/facets", { credentials: "include" });
+    const data = await res.json();
+    if (!res.ok || !data.success) return;
+
+    const addOptions = (name, items, valueOf, labelOf) => {
+      items.forEach((item) => {
+        const option = document.createElement("option");
+        option.value = valueOf(item);
+        option.textContent = `${labelOf(item)} (${item.count})`;
+        form.elements[name].appendChild(option);
+      });
+    };
+    addOptions("job_type", data.facets.job_type, (f) => f.value, (f) => f.value);
+    addOptions("location", data.facets.location, (f) => f.value, (f) => f.value);
+    addOptions(
+      "salary",
+      data.facets.salary,
+      (f) => `${f.salary_min}:${f.salary_max ?? ""}`,
+      (f) => `${f.value} LPA`
+    );
+  } catch (err) {
+    console.error("Fetch facets error:", err);
+  }
+}
+
 // ---------------- Job Listing ----------------
 async function fetchJobs(q = "", page = 1) {
   try {
-    const res = await fetch(`/api/jobs?q=${encodeURIComponent(q)}&page=${page}`, {
+    const params = filterParams();
+    params.set("q", q);
+    params.set("page", page);
+    const res = await fetch(`/api/jobs?${params}`, {
       credentials: "include",
     });
     const data = await res.json();
@@ -267,6 +318,14 @@ if (searchInput) {
   });
 }
 
+// ---------------- Filters ----------------
+document.getElementById("jobFilters")?.addEventListener("change", () => {
+  fetchJobs(document.getElementById("searchInput")?.value.trim() || "");
+});
+
 fetchUserProfile();
-if (document.getElementById("jobGrid")) fetchJobs();
+if (document.getElementById("jobGrid")) {
+  fetchFacets();
+  fetchJobs();
+}
 if (document.getElementById("jobTitle")) fetchJobDetail();
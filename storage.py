@@ -0,0 +1,429 @@
+import io
+import os
+import hmac
+import time
+import hashlib
+import tempfile
+import threading
+import posixpath
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import NamedTuple
+from urllib.parse import quote, urlencode
+from config import (
+    BASE_UPLOAD_FOLDER,
+    STORAGE_BACKEND,
+    STORAGE_URL,
+    STORAGE_BUCKET,
+    STORAGE_PREFIX,
+    STORAGE_REGION,
+    STORAGE_PRESIGN_TTL,
+    STORAGE_PART_SIZE,
+)
+
+try:
+    import boto3
+except ImportError:  # optional, only needed for STORAGE_BACKEND=s3 with a STORAGE_URL
+    boto3 = None
+
+# Uploaded files are addressed by keys relative to the upload root:
+#   profile_pics/user1_1757779089.png, logos/employer2_1757878778.png,
+#   resumes/ab/cd/<sha256>.pdf
+# Both backends take and return the same keys, so rows never store where a
+# file physically lives.
+
+CHUNK_SIZE = 64 * 1024
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 rejects smaller parts except the last one
+
+
+class StoredObject(NamedTuple):
+    """Size and modification time of a stored file, shaped like os.stat_result"""
+    key: str
+    st_size: int
+    st_mtime: float
+
+    @property
+    def st_mtime_ns(self):
+        return int(self.st_mtime * 1_000_000_000)
+
+
+def check_key(key):
+    """Reject keys that could escape the upload root"""
+    if not key or key.startswith("/") or "\\" in key or ".." in key.split("/"):
+        raise ValueError(f"Invalid storage key: {key!r}")
+    return key
+
+
+def read_exactly(stream, size):
+    """Read `size` bytes, fewer only at EOF (socket-backed streams return short reads)"""
+    chunks, remaining = [], size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def copy_stream(src, dst, chunk_size=CHUNK_SIZE):
+    size = 0
+    for chunk in iter(lambda: src.read(chunk_size), b""):
+        dst.write(chunk)
+        size += len(chunk)
+    return size
+
+
+# =========================================================
+# -------------------- LOCAL FILESYSTEM -------------------
+# =========================================================
+class LocalStorage:
+    """Files below `root` on this node's disk; served by the app (or X-Accel)."""
+
+    local = True
+
+    def __init__(self, root=BASE_UPLOAD_FOLDER):
+        self.root = root
+
+    def path(self, key):
+        return os.path.join(self.root, *check_key(key).split("/"))
+
+    def open(self, key):
+        return open(self.path(key), "rb")
+
+    def save(self, key, stream):
+        """Write `stream` to `key` in chunks; readers never see a partial file"""
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                size = copy_stream(stream, out)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return size
+
+    def save_file(self, key, filepath, move=False):
+        """Store a local file; with move=True it is renamed into place when possible"""
+        if move:
+            target = self.path(key)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.replace(filepath, target)
+                return os.path.getsize(target)
+            except OSError:
+                pass  # another filesystem, copy below
+        with open(filepath, "rb") as src:
+            size = self.save(key, src)
+        if move:
+            os.remove(filepath)
+        return size
+
+    def stat(self, key):
+        try:
+            st = os.stat(self.path(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return StoredObject(key, st.st_size, st.st_mtime)
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def list(self, prefix=""):
+        """Yield a StoredObject for every file below prefix, one directory listing at a time"""
+        pending = [prefix.strip("/")]
+        while pending:
+            rel = pending.pop()
+            try:
+                with os.scandir(os.path.join(self.root, rel)) as entries:
+                    for entry in entries:
+                        key = f"{rel}/{entry.name}" if rel else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(key)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            yield StoredObject(key, st.st_size, st.st_mtime)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    def url(self, key, filename=None):
+        return None  # served by file_serving.send_upload
+
+    @contextmanager
+    def local_file(self, key):
+        """Path of the stored file for libraries that need one (Pillow, pypdf)"""
+        path = self.path(key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(key)
+        yield path
+
+
+# =========================================================
+# -------------------- S3-COMPATIBLE ----------------------
+# =========================================================
+def _not_found(error):
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage:
+    """
+    Files in an S3-compatible bucket (AWS S3, MinIO, ...), shared by every node.
+
+    - Writes are streamed: a single PUT below `part_size`, otherwise a
+      multipart upload holding one part in memory at a time (aborted on error).
+    - Reads stream the object body.
+    - With `presign_ttl` set, downloads are redirected to signed URLs so the
+      bytes go straight from the bucket to the browser.
+    """
+
+    local = False
+
+    def __init__(self, client, bucket, prefix="", part_size=STORAGE_PART_SIZE, presign_ttl=STORAGE_PRESIGN_TTL):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.presign_ttl = presign_ttl
+
+    def _key(self, key):
+        return self.prefix + check_key(key)
+
+    def open(self, key):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+        except Exception as e:
+            if _not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def save(self, key, stream):
+        first = read_exactly(stream, self.part_size)
+        if len(first) < self.part_size:
+            self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=first)
+            return len(first)
+
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=self._key(key))["UploadId"]
+        parts, size, chunk = [], 0, first
+        try:
+            while chunk:
+                number = len(parts) + 1
+                response = self.client.upload_part(
+                    Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+                    PartNumber=number, Body=chunk,
+                )
+                parts.append({"PartNumber": number, "ETag": response["ETag"]})
+                size += len(chunk)
+                chunk = read_exactly(stream, self.part_size)
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self._key(key), UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self._key(key), UploadId=upload_id)
+            raise
+        return size
+
+    def save_file(self, key, filepath, move=False):
+        with open(filepath, "rb") as src:
+            size = self.save(key, src)
+        if move:
+            os.remove(filepath)
+        return size
+
+    def stat(self, key):
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception as e:
+            if _not_found(e):
+                return None
+            raise
+        return StoredObject(key, head["ContentLength"], head["LastModified"].timestamp())
+
+    def exists(self, key):
+        return self.stat(key) is not None
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        return True  # S3 does not say whether the key existed
+
+    def list(self, prefix=""):
+        """Yield a StoredObject for every key below prefix, one listing page at a time"""
+        params = {"Bucket": self.bucket, "Prefix": self.prefix + prefix.strip("/")}
+        while True:
+            page = self.client.list_objects_v2(**params)
+            for item in page.get("Contents", []):
+                yield StoredObject(
+                    item["Key"][len(self.prefix):], item["Size"], item["LastModified"].timestamp()
+                )
+            if not page.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = page["NextContinuationToken"]
+
+    def url(self, key, filename=None):
+        """Signed GET URL for a direct download, or None if presigning is off"""
+        if not self.presign_ttl:
+            return None
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=self.presign_ttl)
+
+    @contextmanager
+    def local_file(self, key):
+        """Download to a temporary file for libraries that need a path"""
+        body = self.open(key)
+        fd, temp_path = tempfile.mkstemp(prefix=".storage-", suffix=posixpath.splitext(key)[1])
+        try:
+            with os.fdopen(fd, "wb") as out:
+                copy_stream(body, out)
+            yield temp_path
+        finally:
+            body.close()
+            os.remove(temp_path)
+
+
+class StorageError(Exception):
+    """Error shaped like botocore's ClientError (`response["Error"]["Code"]`)."""
+
+    def __init__(self, code, message=""):
+        super().__init__(f"{code}: {message}" if message else code)
+        self.response = {"Error": {"Code": code, "Message": message}}
+
+
+class LocalObjectStore:
+    """
+    Minimal in-process stand-in for an S3/MinIO server, speaking the subset
+    of the boto3 client API that S3Storage uses (single and multipart puts,
+    streamed gets, head, delete, paginated listing, presigned URLs).
+
+    Used when STORAGE_BACKEND=s3 but no STORAGE_URL is configured, so the
+    object store code path runs without a server. Like S3 it rejects
+    multipart parts under 5 MiB (except the last) and lists at most
+    1000 keys per page.
+    """
+
+    MAX_KEYS = 1000
+
+    def __init__(self, endpoint="http://storage.local", secret=b"local-object-store"):
+        self.endpoint = endpoint
+        self.secret = secret
+        self._objects = {}  # (bucket, key) -> (bytes, last_modified datetime, etag)
+        self._uploads = {}  # upload id -> (bucket, key, {part number: bytes})
+        self._lock = threading.Lock()
+
+    def _store(self, bucket, key, data):
+        etag = '"%s"' % hashlib.md5(data).hexdigest()
+        with self._lock:
+            self._objects[(bucket, key)] = (data, datetime.now(timezone.utc), etag)
+        return {"ETag": etag}
+
+    def _get(self, bucket, key):
+        with self._lock:
+            entry = self._objects.get((bucket, key))
+        if entry is None:
+            raise StorageError("NoSuchKey", key)
+        return entry
+
+    def put_object(self, Bucket, Key, Body=b""):
+        data = Body if isinstance(Body, bytes) else Body.read()
+        return self._store(Bucket, Key, data)
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = os.urandom(8).hex()
+        with self._lock:
+            self._uploads[upload_id] = (Bucket, Key, {})
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        with self._lock:
+            upload = self._uploads.get(UploadId)
+            if upload is None:
+                raise StorageError("NoSuchUpload", UploadId)
+            upload[2][PartNumber] = Body if isinstance(Body, bytes) else Body.read()
+        return {"ETag": '"%s"' % hashlib.md5(upload[2][PartNumber]).hexdigest()}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        with self._lock:
+            upload = self._uploads.pop(UploadId, None)
+        if upload is None:
+            raise StorageError("NoSuchUpload", UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        chunks = [upload[2][n] for n in numbers]
+        if any(len(chunk) < MIN_PART_SIZE for chunk in chunks[:-1]):
+            raise StorageError("EntityTooSmall", "parts except the last must be at least 5 MiB")
+        return self._store(Bucket, Key, b"".join(chunks))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        with self._lock:
+            self._uploads.pop(UploadId, None)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        data, modified, etag = self._get(Bucket, Key)
+        return {"Body": io.BytesIO(data), "ContentLength": len(data), "LastModified": modified, "ETag": etag}
+
+    def head_object(self, Bucket, Key):
+        try:
+            data, modified, etag = self._get(Bucket, Key)
+        except StorageError:
+            raise StorageError("404", Key)
+        return {"ContentLength": len(data), "LastModified": modified, "ETag": etag}
+
+    def delete_object(self, Bucket, Key):
+        with self._lock:
+            self._objects.pop((Bucket, Key), None)
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken="", MaxKeys=MAX_KEYS):
+        with self._lock:
+            keys = sorted(
+                key for bucket, key in self._objects
+                if bucket == Bucket and key.startswith(Prefix) and key > ContinuationToken
+            )
+            page = keys[:min(MaxKeys, self.MAX_KEYS)]
+            contents = [
+                {"Key": key, "Size": len(self._objects[(Bucket, key)][0]),
+                 "LastModified": self._objects[(Bucket, key)][1]}
+                for key in page
+            ]
+        result = {"Contents": contents, "IsTruncated": len(keys) > len(page)}
+        if result["IsTruncated"]:
+            result["NextContinuationToken"] = page[-1]
+        return result
+
+    def generate_presigned_url(self, ClientMethod, Params, ExpiresIn=3600):
+        query = {"X-Amz-Expires": ExpiresIn, "X-Amz-Date": int(time.time())}
+        if "ResponseContentDisposition" in Params:
+            query["response-content-disposition"] = Params["ResponseContentDisposition"]
+        path = f"/{Params['Bucket']}/{quote(Params['Key'])}"
+        query["X-Amz-Signature"] = hmac.new(
+            self.secret, f"{ClientMethod}{path}{sorted(query.items())}".encode(), hashlib.sha256
+        ).hexdigest()
+        return f"{self.endpoint}{path}?{urlencode(query)}"
+
+
+def create_storage(backend=STORAGE_BACKEND, url=STORAGE_URL):
+    if backend == "local":
+        return LocalStorage()
+    if backend == "s3":
+        if not url:
+            # nothing can fetch the stand-in's signed URLs, so stream downloads
+            return S3Storage(LocalObjectStore(), STORAGE_BUCKET, STORAGE_PREFIX, presign_ttl=0)
+        if boto3 is None:
+            raise RuntimeError("STORAGE_URL is set but the boto3 package is not installed")
+        client = boto3.client("s3", endpoint_url=url, region_name=STORAGE_REGION)
+        return S3Storage(client, STORAGE_BUCKET, STORAGE_PREFIX)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+storage = create_storage()
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from config import TASK_DB_PATH, TASK_WORKERS, TASK_MAX_ATTEMPTS, TASK_RETRY_DELAY, TASK_STALE_AFTER
+
+# Durable background task queue.
+#
+# Tasks are rows in a local SQLite file, so they survive restarts and are
+# shared by every worker process on the node; BEGIN IMMEDIATE makes the
+# claim of a task atomic across processes. Each process runs TASK_WORKERS
+# threads that execute registered handlers and retry failures with
+# exponential backoff.
+
+_handlers = {}
+_wakeup = threading.Event()
+_started = False
+_start_lock = threading.Lock()
+_local = threading.local()
+
+
+def task(name, max_attempts=TASK_MAX_ATTEMPTS):
+    """Register fn as the handler for tasks called `name`"""
+    def register(fn):
+        _handlers[name] = (fn, max_attempts)
+        return fn
+    return register
+
+
+# -------------------- STORE --------------------
+def _db():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(TASK_DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(TASK_DB_PATH, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS tasks (
+                 id TEXT PRIMARY KEY,
+                 name TEXT NOT NULL,
+                 args TEXT NOT NULL,
+                 owner TEXT,
+                 status TEXT NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+                 attempts INTEGER NOT NULL DEFAULT 0,
+                 max_attempts INTEGER NOT NULL,
+                 run_after REAL NOT NULL,
+                 error TEXT,
+                 created_at REAL NOT NULL,
+                 updated_at REAL NOT NULL
+               )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (status, run_after)")
+        _local.conn = conn
+    return conn
+
+
+def enqueue(name, *args, owner=None):
+    """Persist a task and wake a worker; returns the task id"""
+    if name not in _handlers:
+        raise ValueError(f"Unknown task: {name}")
+    task_id = uuid.uuid4().hex
+    now = time.time()
+    _db().execute(
+        """INSERT INTO tasks (id, name, args, owner, max_attempts, run_after, created_at, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        (task_id, name, json.dumps(args), owner, _handlers[name][1], now, now, now),
+    )
+    _wakeup.set()  # workers of other processes poll the queue every second
+    return task_id
+
+
+def get_task(task_id):
+    row = _db().execute(
+        "SELECT id, name, owner, status, attempts, max_attempts, error, created_at, updated_at FROM tasks WHERE id=?",
+        (task_id,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def _claim():
+    """Atomically take the next runnable task (or one abandoned by a dead worker)"""
+    db = _db()
+    now = time.time()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        row = db.execute(
+            """SELECT * FROM tasks
+               WHERE (status='queued' AND run_after <= ?)
+                  OR (status='running' AND updated_at < ?)
+               ORDER BY run_after LIMIT 1""",
+            (now, now - TASK_STALE_AFTER),
+        ).fetchone()
+        if row:
+            db.execute(
+                "UPDATE tasks SET status='running', attempts=attempts+1, updated_at=? WHERE id=?",
+                (now, row["id"]),
+            )
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    return row
+
+
+def _finish(row, error=None):
+    now = time.time()
+    attempts = row["attempts"] + 1
+    if error is None:
+        status, run_after = "done", row["run_after"]
+    elif attempts < row["max_attempts"]:
+        status, run_after = "queued", now + TASK_RETRY_DELAY * 2 ** (attempts - 1)
+    else:
+        status, run_after = "failed", row["run_after"]
+    _db().execute(
+        "UPDATE tasks SET status=?, run_after=?, error=?, updated_at=? WHERE id=?",
+        (status, run_after, error, now, row["id"]),
+    )
+
+
+# -------------------- WORKERS --------------------
+def run_pending(limit=None):
+    """Run ready tasks in the calling thread; returns how many were run"""
+    count = 0
+    while limit is None or count < limit:
+        row = _claim()
+        if row is None:
+            break
+        fn, _ = _handlers.get(row["name"], (None, None))
+        try:
+            if fn is None:
+                raise LookupError(f"no handler registered for {row['name']}")
+            fn(*json.loads(row["args"]))
+        except Exception as e:
+            print(f"[TASK ERROR] {row['name']} {row['id']}: {e}")
+            _finish(row, error=str(e) or type(e).__name__)
+        else:
+            _finish(row)
+        count += 1
+    return count
+
+
+def _worker():
+    while True:
+        try:
+            if run_pending():
+                continue
+        except Exception as e:
+            print(f"[TASK QUEUE ERROR] {e}")
+        _wakeup.wait(timeout=1.0)
+        _wakeup.clear()
+
+
+def start_workers():
+    """Start this process's worker threads (idempotent); only serving processes call it"""
+    global _started
+    if _started or TASK_WORKERS <= 0:
+        return
+    with _start_lock:
+        if _started:
+            return
+        for n in range(TASK_WORKERS):
+            threading.Thread(target=_worker, name=f"task-worker-{n}", daemon=True).start()
+        _started = True
@@ -0,0 +1,144 @@
+import time
+import posixpath
+from config import db_cursor
+from images import original_name
+from resume_upload import release_resumes
+from storage import storage
+
+# Reconciles the upload folders with the rows that reference them.
+#
+# Files are listed through storage.list (a directory or a bucket listing
+# page at a time) and checked in batches with one indexed IN query per
+# batch, so memory stays bounded by the batch size however many files a
+# folder holds. A file is an orphan
+# when nothing references it (thumbnail variants: when nothing references
+# their original). Files younger than `min_age` are never touched: uploads
+# are written before the row that points at them is committed.
+
+TEMP_PREFIXES = (".upload-", ".thumb-", ".seed-")
+DEFAULT_BATCH = 500
+DEFAULT_MIN_AGE = 3600
+
+# Storage key prefix -> lookup of the names below it that rows reference
+FOLDERS = {
+    "profile_pics": """SELECT profile_pic FROM users WHERE profile_pic IN ({placeholders})
+                       UNION
+                       SELECT profile_pic FROM employers WHERE profile_pic IN ({placeholders})""",
+    "logos": "SELECT logo_filename FROM employers WHERE logo_filename IN ({placeholders})",
+    "resumes": "SELECT DISTINCT resume_path FROM applications WHERE resume_path IN ({placeholders})",
+}
+
+# Keyset scans of the referencing columns, for references to missing files
+REFERENCE_SCANS = {
+    "profile_pics": """(SELECT profile_pic FROM users
+                        WHERE profile_pic > %(last)s ORDER BY profile_pic LIMIT %(limit)s)
+                       UNION
+                       (SELECT profile_pic FROM employers
+                        WHERE profile_pic > %(last)s ORDER BY profile_pic LIMIT %(limit)s)
+                       ORDER BY profile_pic LIMIT %(limit)s""",
+    "logos": """SELECT DISTINCT logo_filename FROM employers
+                WHERE logo_filename > %(last)s ORDER BY logo_filename LIMIT %(limit)s""",
+    "resumes": """SELECT DISTINCT resume_path FROM applications
+                  WHERE resume_path > %(last)s ORDER BY resume_path LIMIT %(limit)s""",
+}
+
+# Employer pictures (admin<id>_*) used to be recorded in users.profile_pic under
+# the employer's id, so one saved before employers.profile_pic existed may have
+# no row pointing at it. Unreferenced ones are reported but never deleted.
+KEEP_UNREFERENCED = {"profile_pics": ("admin",)}
+
+
+def _batches(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _referenced(sql, names):
+    with db_cursor() as cursor:
+        cursor.execute(
+            sql.format(placeholders=", ".join(["%s"] * len(names))),
+            tuple(names) * sql.count("{placeholders}"),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _remove(kind, path):
+    """Delete one orphan; resumes go through release_resumes, which re-checks under lock"""
+    if kind == "resumes" and not posixpath.basename(path).startswith(TEMP_PREFIXES):
+        return release_resumes([path]) > 0
+    return storage.delete(f"{kind}/{path}")
+
+
+def reconcile_folder(kind, apply=False, batch=DEFAULT_BATCH, min_age=DEFAULT_MIN_AGE, report=None):
+    """
+    Find (and with apply=True remove) unreferenced files in one upload folder.
+
+    `report(path, size)` is called for every orphan found.
+
+    Returns:
+        {"scanned", "referenced", "recent", "orphans", "orphan_bytes", "kept", "removed"}
+        – "kept" counts the orphans KEEP_UNREFERENCED protects
+    """
+    sql = FOLDERS[kind]
+    keep = KEEP_UNREFERENCED.get(kind, ())
+    cutoff = time.time() - min_age
+    stats = {
+        "scanned": 0, "referenced": 0, "recent": 0, "orphans": 0, "orphan_bytes": 0, "kept": 0, "removed": 0,
+    }
+
+    for chunk in _batches(storage.list(kind), batch):
+        candidates = []  # (path below kind/, size, referencing name or None for temp files)
+        for obj in chunk:
+            stats["scanned"] += 1
+            if obj.st_mtime > cutoff:
+                stats["recent"] += 1
+                continue
+            path = obj.key[len(kind) + 1:]
+            name = posixpath.basename(path)
+            if name.startswith(TEMP_PREFIXES):
+                candidates.append((path, obj.st_size, None))
+            elif kind == "resumes":
+                candidates.append((path, obj.st_size, path))
+            else:
+                candidates.append((path, obj.st_size, original_name(name) or name))
+
+        names = list({name for _, _, name in candidates if name})
+        referenced = _referenced(sql, names) if names else set()
+        for path, size, name in candidates:
+            if name in referenced:
+                stats["referenced"] += 1
+                continue
+            stats["orphans"] += 1
+            stats["orphan_bytes"] += size
+            if report:
+                report(path, size)
+            if keep and name and name.startswith(keep):
+                stats["kept"] += 1
+            elif apply and _remove(kind, path):
+                stats["removed"] += 1
+    return stats
+
+
+def missing_references(kind, batch=DEFAULT_BATCH):
+    """Referenced file names of `kind` that do not exist in storage"""
+    missing = []
+    last = ""
+    while True:
+        with db_cursor() as cursor:
+            cursor.execute(REFERENCE_SCANS[kind], {"last": last, "limit": batch})
+            names = [row[0] for row in cursor.fetchall()]
+        for name in names:
+            try:
+                if not storage.exists(f"{kind}/{name}"):
+                    missing.append(name)
+            except ValueError:  # not a usable key at all
+                missing.append(name)
+        if len(names) < batch:
+            return missing
+        last = names[-1]